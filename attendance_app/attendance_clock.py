@@ -0,0 +1,103 @@
+from datetime import datetime
+from importlib import import_module
+from sqlalchemy import func, update
+from attendance_app.models import db, Attendance
+from attendance_app.dashboard_cache import invalidate_dashboard_metrics
+from attendance_app.attendance_summary import mark_attendance_days
+
+# Clock in / clock out.
+#
+# Both actions are a single conditional statement against the
+# uq_attendance_employee_date index instead of a read followed by a write, so
+# a double-clicked button or two tabs racing each other can never create a
+# second row for the day or overwrite the first clock-in time. The affected
+# row count tells us whether the action happened.
+
+CLOCKED_IN = 'clocked_in'
+ALREADY_CLOCKED_IN = 'already_clocked_in'
+CLOCKED_OUT = 'clocked_out'
+NOT_CLOCKED_IN = 'not_clocked_in'
+ALREADY_CLOCKED_OUT = 'already_clocked_out'
+
+MESSAGES = {
+    CLOCKED_IN: "Clocked in successfully",
+    ALREADY_CLOCKED_IN: "You have already clocked in today",
+    CLOCKED_OUT: "Clocked out successfully",
+    NOT_CLOCKED_IN: "You need to clock in first",
+    ALREADY_CLOCKED_OUT: "You have already clocked out today",
+}
+
+# Dialects with INSERT ... ON CONFLICT; only the one in use is ever imported
+_INSERTS = {
+    'sqlite': 'sqlalchemy.dialects.sqlite',
+    'postgresql': 'sqlalchemy.dialects.postgresql',
+}
+
+def _insert(dialect_name, table):
+    return import_module(_INSERTS[dialect_name]).insert(table)
+
+attendance = Attendance.__table__
+
+def clock_in_statement(dialect_name, employee_id, today, now, project_id=None):
+    """INSERT ... ON CONFLICT that only sets clock_in on a row that has none"""
+    stmt = _insert(dialect_name, attendance).values(
+        employee_id=employee_id, date=today, clock_in=now, project_id=project_id, break_duration=0
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=['employee_id', 'date'],
+        set_={
+            'clock_in': stmt.excluded.clock_in,
+            'project_id': func.coalesce(attendance.c.project_id, stmt.excluded.project_id),
+        },
+        where=attendance.c.clock_in.is_(None),
+    )
+
+def clock_out_statement(employee_id, today, now, break_duration=0, notes=None):
+    return (
+        update(attendance)
+        .where(
+            attendance.c.employee_id == employee_id,
+            attendance.c.date == today,
+            attendance.c.clock_in.isnot(None),
+            attendance.c.clock_out.is_(None),
+        )
+        .values(clock_out=now, break_duration=break_duration, notes=notes)
+    )
+
+def clock_in(employee_id, project_id=None):
+    now = datetime.utcnow()
+    stmt = clock_in_statement(db.engine.dialect.name, employee_id, now.date(), now, project_id)
+    result = db.session.execute(stmt)
+    if result.rowcount:
+        mark_attendance_days(db.session, [(employee_id, now.date())])
+    db.session.commit()
+    if not result.rowcount:
+        return ALREADY_CLOCKED_IN
+    # Core statement, so the ORM write tracking in dashboard_cache doesn't see it
+    invalidate_dashboard_metrics()
+    return CLOCKED_IN
+
+def clock_out(employee_id, break_duration=0, notes=None):
+    now = datetime.utcnow()
+    result = db.session.execute(clock_out_statement(employee_id, now.date(), now, break_duration, notes))
+    if result.rowcount:
+        mark_attendance_days(db.session, [(employee_id, now.date())])
+    db.session.commit()
+    if result.rowcount:
+        return CLOCKED_OUT
+
+    # Nothing updated: one read to tell the user why
+    clocked_in = db.session.execute(
+        db.select(attendance.c.clock_in).where(attendance.c.employee_id == employee_id, attendance.c.date == now.date())
+    ).scalar()
+    return ALREADY_CLOCKED_OUT if clocked_in else NOT_CLOCKED_IN
+
+def today_status(employee_id):
+    record = Attendance.query.filter_by(employee_id=employee_id, date=datetime.utcnow().date()).first()
+    return {
+        'clocked_in': bool(record and record.clock_in),
+        'clocked_out': bool(record and record.clock_out),
+        'clock_in_time': record.clock_in.isoformat() if record and record.clock_in else None,
+        'clock_out_time': record.clock_out.isoformat() if record and record.clock_out else None,
+        'total_hours': round(record.total_hours, 2) if record else 0,
+    }
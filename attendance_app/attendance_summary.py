@@ -0,0 +1,285 @@
+from datetime import date, datetime, timedelta
+from flask import current_app, has_app_context
+from sqlalchemy import and_, case, delete, event, extract, func, inspect, or_, select
+from sqlalchemy.orm import NO_VALUE, Session, object_session
+from attendance_app.models import db, Employee, Attendance, AttendanceDay, LeaveRequest, CompanyEvent
+
+# Daily attendance summary.
+#
+# attendance_day holds one row per employee per day with the worked and break
+# minutes, the project and late/absent flags, so reports over months or years
+# add up pre-aggregated rows instead of re-reading every punch. A row is
+# recomputed from its Attendance row in the same transaction as the write:
+# the clock in/out statements mark the day themselves (they are Core
+# statements the ORM never sees) and any ORM change to an Attendance row is
+# picked up in after_flush, as is a leave request being approved, denied,
+# moved or deleted, which marks every day it covers. The marked days are
+# rewritten in before_commit, so a rollback drops them together with the punch.
+#
+# Absent rows are only written for closed days (before today): a weekday
+# without attendance, approved leave or an all-day company holiday, counted
+# from the employee's hire date. Refreshing a closed day applies the same rule,
+# so deleting its punch or revoking its leave leaves an absence behind. The
+# migration that adds the table rebuilds the history once; run
+# scripts/backfill_attendance_summary.py daily to close the previous day.
+#
+# Clock times are stored in UTC, so ATTENDANCE_DAY_START is a UTC time too.
+
+ATTENDANCE_DAY_START = '09:00'
+ATTENDANCE_LATE_GRACE_MINUTES = 15
+REBUILD_BATCH_SIZE = 5000
+
+attendance = Attendance.__table__
+attendance_day = AttendanceDay.__table__
+
+def late_after(config=None):
+    """Clock-in time after which a day counts as late"""
+    if config is None:
+        config = current_app.config if has_app_context() else {}
+    start = datetime.strptime(config.get('ATTENDANCE_DAY_START', ATTENDANCE_DAY_START), '%H:%M')
+    grace = config.get('ATTENDANCE_LATE_GRACE_MINUTES', ATTENDANCE_LATE_GRACE_MINUTES)
+    return (start + timedelta(minutes=grace)).time()
+
+def day_values(employee_id, day, clock_in, clock_out, break_duration, project_id, late_time):
+    """The attendance_day row for one Attendance row"""
+    worked = 0
+    breaks = break_duration or 0
+    if clock_in and clock_out:
+        worked = max(int((clock_out - clock_in).total_seconds() // 60) - breaks, 0)
+    return {
+        'employee_id': employee_id, 'date': day, 'project_id': project_id,
+        'worked_minutes': worked, 'break_minutes': breaks if clock_out else 0,
+        'is_late': bool(clock_in and clock_in.time() > late_time),
+        'is_absent': clock_in is None,
+    }
+
+def _attendance_columns():
+    return select(attendance.c.employee_id, attendance.c.date, attendance.c.clock_in, attendance.c.clock_out,
+                  attendance.c.break_duration, attendance.c.project_id)
+
+def _key_filter(table, keys):
+    return or_(*[and_(table.c.employee_id == employee_id, table.c.date == day) for employee_id, day in keys])
+
+def refresh_attendance_days(conn, keys, late_time=None, today=None):
+    """Rewrite the summary rows for these (employee_id, date) pairs from their Attendance rows.
+
+    conn is a Connection or Session; the work happens in its transaction.
+    """
+    keys = sorted(set(keys))
+    late_time = late_time or late_after()
+    today = today or datetime.utcnow().date()
+    for i in range(0, len(keys), 500):
+        chunk = keys[i:i + 500]
+        rows = conn.execute(_attendance_columns().where(_key_filter(attendance, chunk))).all()
+        conn.execute(delete(attendance_day).where(_key_filter(attendance_day, chunk)))
+        values = [day_values(*row, late_time=late_time) for row in rows]
+        present = {(row.employee_id, row.date) for row in rows}
+        values += [_absent_values(*key) for key in
+                   _absent_days(conn, [key for key in chunk if key not in present and key[1] < today])]
+        if values:
+            conn.execute(attendance_day.insert(), values)
+
+def _absent_values(employee_id, day):
+    return {'employee_id': employee_id, 'date': day, 'project_id': None, 'worked_minutes': 0,
+            'break_minutes': 0, 'is_late': False, 'is_absent': True}
+
+def _absent_days(conn, keys):
+    """The closed days among keys, none of them with attendance, that count as absences"""
+    if not keys:
+        return []
+    start, end = min(day for _, day in keys), max(day for _, day in keys)
+    employee_ids = {employee_id for employee_id, _ in keys}
+    hired = {employee_id: hire_date or (created_at.date() if created_at else start)
+             for employee_id, hire_date, created_at in conn.execute(
+                 select(Employee.id, Employee.hire_date, Employee.created_at).where(Employee.id.in_(employee_ids)))}
+    holidays = _holidays(conn, start, end)
+    leave = _leave_days(conn, start, end, employee_ids)
+    return [(employee_id, day) for employee_id, day in keys
+            if employee_id in hired and hired[employee_id] <= day and day.weekday() < 5
+            and day not in holidays and (employee_id, day) not in leave]
+
+def _holidays(conn, start, end):
+    return set(conn.execute(
+        select(CompanyEvent.event_date).where(CompanyEvent.event_type == 'holiday', CompanyEvent.is_all_day.is_(True),
+                                              CompanyEvent.event_date >= start, CompanyEvent.event_date <= end)
+    ).scalars())
+
+def _leave_days(conn, start, end, employee_ids=None):
+    """(employee_id, day) pairs from start to end covered by approved leave"""
+    query = select(LeaveRequest.employee_id, LeaveRequest.start_date, LeaveRequest.end_date).where(
+        LeaveRequest.status == 'approved', LeaveRequest.start_date <= end, LeaveRequest.end_date >= start)
+    if employee_ids is not None:
+        query = query.where(LeaveRequest.employee_id.in_(employee_ids))
+    leave = set()
+    for employee_id, first, last in conn.execute(query):
+        day = max(first, start)
+        while day <= min(last, end):
+            leave.add((employee_id, day))
+            day += timedelta(days=1)
+    return leave
+
+def mark_attendance_days(session, keys):
+    """Queue days whose Attendance row was written with a Core statement"""
+    session.info.setdefault('attendance_days', set()).update(keys)
+
+def _working_days(start, end, holidays):
+    day = start
+    while day <= end:
+        if day.weekday() < 5 and day not in holidays:
+            yield day
+        day += timedelta(days=1)
+
+def rebuild_attendance_days(conn, start, end, late_time=None, today=None, batch_size=REBUILD_BATCH_SIZE):
+    """Recompute every summary row from start to end inclusive, absences included. Returns rows written."""
+    today = today or datetime.utcnow().date()
+    late_time = late_time or late_after()
+    conn.execute(delete(attendance_day).where(attendance_day.c.date >= start, attendance_day.c.date <= end))
+
+    written = 0
+    present = set()
+    batch = []
+    result = conn.execute(_attendance_columns().where(attendance.c.date >= start, attendance.c.date <= end)
+                          .execution_options(yield_per=batch_size))
+    for row in result:
+        present.add((row.employee_id, row.date))
+        batch.append(day_values(*row, late_time=late_time))
+        if len(batch) >= batch_size:
+            conn.execute(attendance_day.insert(), batch)
+            written += len(batch)
+            batch = []
+
+    last_closed = min(end, today - timedelta(days=1))
+    if start <= last_closed:
+        leave = _leave_days(conn, start, last_closed)
+        holidays = _holidays(conn, start, last_closed)
+        employees = [(employee_id, hire_date or (created_at.date() if created_at else start))
+                     for employee_id, hire_date, created_at in conn.execute(
+                         select(Employee.id, Employee.hire_date, Employee.created_at))]
+        for day in _working_days(start, last_closed, holidays):
+            for employee_id, hired in employees:
+                key = (employee_id, day)
+                if hired <= day and key not in present and key not in leave:
+                    batch.append(_absent_values(employee_id, day))
+                    if len(batch) >= batch_size:
+                        conn.execute(attendance_day.insert(), batch)
+                        written += len(batch)
+                        batch = []
+    if batch:
+        conn.execute(attendance_day.insert(), batch)
+        written += len(batch)
+    return written
+
+def present_count(day):
+    """Employees who clocked in on day"""
+    return db.session.execute(
+        select(func.count()).select_from(attendance_day)
+        .where(attendance_day.c.date == day, attendance_day.c.is_absent.is_(False))
+    ).scalar()
+
+def attendance_totals(start, end, employee_id=None, by_month=False):
+    """Summed summary rows for the period, one row per employee or, with by_month, per employee and month"""
+    day = attendance_day.c
+    present = case((day.is_absent.is_(False), 1), else_=0)
+    columns = [
+        day.employee_id,
+        func.sum(present).label('present_days'),
+        func.sum(case((day.is_late.is_(True), 1), else_=0)).label('late_days'),
+        func.sum(case((day.is_absent.is_(True), 1), else_=0)).label('absent_days'),
+        func.sum(day.worked_minutes).label('worked_minutes'),
+        func.sum(day.break_minutes).label('break_minutes'),
+    ]
+    group = [day.employee_id]
+    if by_month:
+        month = extract('month', day.date)
+        columns.insert(1, month.label('month'))
+        group.append(month)
+    query = select(*columns).where(day.date >= start, day.date <= end).group_by(*group).order_by(*group)
+    if employee_id is not None:
+        query = query.where(day.employee_id == employee_id)
+    return db.session.execute(query).mappings().all()
+
+def month_ranges(start, end):
+    """(first, last) day pairs covering start..end, split at month boundaries"""
+    first = start
+    while first <= end:
+        next_month = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        last = min(end, next_month - timedelta(days=1))
+        yield first, last
+        first = last + timedelta(days=1)
+
+def rebuild_attendance_history(conn, today=None):
+    """Rebuild the summary from the first attendance row through today, a month at a time. Returns rows written."""
+    today = today or datetime.utcnow().date()
+    first = conn.execute(select(func.min(attendance.c.date))).scalar()
+    return sum(rebuild_attendance_days(conn, start, end, today=today) for start, end in month_ranges(first or today, today))
+
+def period_bounds(year, month=None):
+    """First and last day of a month, or of the year when month is None"""
+    if month is None:
+        return date(year, 1, 1), date(year, 12, 31)
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return date(year, month, 1), last
+
+def _track_attendance_writes(session, flush_context):
+    keys = {(obj.employee_id, obj.date) for obj in (*session.new, *session.dirty, *session.deleted)
+            if isinstance(obj, Attendance)}
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, LeaveRequest):
+            keys.update(_covered_days(obj))
+    for obj in session.dirty:
+        if isinstance(obj, LeaveRequest) and _leave_changed(obj):
+            keys.update(_covered_days(obj))
+    if keys:
+        mark_attendance_days(session, keys)
+
+def _leave_changed(leave):
+    attrs = inspect(leave).attrs
+    return any(attrs[name].history.has_changes() for name in ('status', 'start_date', 'end_date', 'employee_id'))
+
+def _covered_days(leave):
+    """Every (employee_id, day) the request covers, before and after this flush"""
+    state = inspect(leave)
+    def values(name):
+        history = state.attrs[name].history
+        return [value for value in (*history.added, *history.unchanged, *history.deleted) if value is not None]
+    starts, ends = values('start_date'), values('end_date')
+    if not starts or not ends:
+        return set()
+    first, last = min(starts), max(ends)
+    days = set()
+    for employee_id in values('employee_id'):
+        day = first
+        while day <= last:
+            days.add((employee_id, day))
+            day += timedelta(days=1)
+    return days
+
+def _track_moved_employee(target, value, oldvalue, initiator):
+    # A row moved to another employee or day leaves the old day behind
+    session = object_session(target)
+    if session is not None and oldvalue not in (None, NO_VALUE) and oldvalue != value:
+        mark_attendance_days(session, [(oldvalue, target.date)])
+
+def _track_moved_date(target, value, oldvalue, initiator):
+    session = object_session(target)
+    if session is not None and oldvalue not in (None, NO_VALUE) and oldvalue != value:
+        mark_attendance_days(session, [(target.employee_id, oldvalue)])
+
+def _refresh_before_commit(session):
+    # Flush first: the final flush of commit() runs after this hook
+    session.flush()
+    keys = session.info.pop('attendance_days', None)
+    if keys:
+        refresh_attendance_days(session, {key for key in keys if None not in key})
+
+def _forget_after_rollback(session):
+    session.info.pop('attendance_days', None)
+
+def init_attendance_summary(app):
+    if not event.contains(Session, 'after_flush', _track_attendance_writes):
+        event.listen(Session, 'after_flush', _track_attendance_writes)
+        event.listen(Session, 'before_commit', _refresh_before_commit)
+        event.listen(Session, 'after_rollback', _forget_after_rollback)
+        # active_history loads the old value of an expired attribute before it is replaced
+        event.listen(Attendance.employee_id, 'set', _track_moved_employee, active_history=True)
+        event.listen(Attendance.date, 'set', _track_moved_date, active_history=True)
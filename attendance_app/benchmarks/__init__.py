@@ -0,0 +1,12 @@
+# Benchmarks against a realistically sized database.
+#
+# datagen.py fills a fresh database with synthetic employees and years of
+# attendance, work reports, journal entries, leave, messages and billing.
+# routes.py drives the Flask test client against the hot routes on that
+# database and records throughput and latency baselines to compare runs.
+# logins.py needs no generated data: it measures sign-in throughput for each
+# password hashing cost on a scratch database.
+#
+#   python -m attendance_app.benchmarks.datagen --employees 5000 --years 3 --database sqlite:////tmp/ems_bench.db
+#   DATABASE_URL=sqlite:////tmp/ems_bench.db python -m attendance_app.benchmarks.routes --save baseline.json
+#   python -m attendance_app.benchmarks.logins --settings pbkdf2:600000 scrypt:16384 scrypt:32768
@@ -0,0 +1,290 @@
+import argparse
+import os
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from sqlalchemy import create_engine, func, select
+from werkzeug.security import generate_password_hash
+from attendance_app.models import (db, User, Employee, Project, Attendance, WorkReport, ProjectJournal, LeaveRequest,
+                                   InternalMessage, MessageRecipient, BillingRecord, SchemaMigration)
+from attendance_app.migrations import MIGRATIONS
+from attendance_app.db_profile import SQLITE_PROFILES, install_sqlite_profile
+from attendance_app.attendance_summary import rebuild_attendance_days
+from attendance_app.journal_index import index_journal_entries
+from attendance_app.passwords import hash_method
+
+# Synthetic data generator.
+#
+# Builds a database shaped like a few years of real use: every employee clocks
+# in on most weekdays (except approved leave), files a work report on most of
+# those days and a journal entry on some, asks for leave a few times a year,
+# sends and receives messages, gets monthly billing records, and the admin
+# sends a monthly broadcast. The same seed, scale and end date always produce
+# the same rows.
+#
+# Rows are written with Core executemany inserts in batches, days in the outer
+# loop so ids grow with dates like they do in production. Every user's
+# password is BENCHMARK_PASSWORD (hashed once and shared, hashing 5k passwords
+# would take longer than the rest). The schema is created from the models and
+# all migrations are recorded as applied. The daily attendance summary and
+# the journal object index are rebuilt from the generated rows at the end.
+
+BENCHMARK_PASSWORD = 'benchmark'
+ADMIN_USERNAME = 'admin'
+
+FIRST_NAMES = ['Arun', 'Priya', 'Karthik', 'Divya', 'Vijay', 'Lakshmi', 'Suresh', 'Anitha', 'Ramesh', 'Deepa',
+               'Ganesh', 'Kavya', 'Manoj', 'Meena', 'Prakash', 'Revathi', 'Senthil', 'Swathi', 'Vinoth', 'Yamini']
+LAST_NAMES = ['Kumar', 'Raj', 'Subramanian', 'Natarajan', 'Krishnan', 'Murugan', 'Iyer', 'Pillai', 'Rao', 'Nair']
+DEPARTMENTS = ['Operations', 'Data Entry', 'Quality', 'Indexing', 'Support']
+POSITIONS = ['Associate', 'Senior Associate', 'Team Lead', 'Analyst']
+WORDS = ['invoice', 'records', 'verified', 'batch', 'scanned', 'indexed', 'customer', 'ledger', 'audit', 'forms',
+         'claims', 'reviewed', 'corrected', 'uploaded', 'archive']
+TASK_TYPES = ['Data Entry', 'Verification', 'Indexing', 'Quality Check', 'Rework']
+LEAVE_TYPES = ['sick', 'vacation', 'personal', 'emergency']
+
+def _sentence(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+def _workdays(start, end):
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+class _Writer:
+    """Buffers rows per table and writes them with executemany in batches"""
+
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, table, row):
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for name in [table] if table is not None else list(self.buffers):
+            rows = self.buffers.get(name)
+            if rows:
+                self.conn.execute(name.insert(), rows)
+                self.counts[name.name] = self.counts.get(name.name, 0) + len(rows)
+                rows.clear()
+
+def _projects(writer, rng, count, start):
+    ids = []
+    for i in range(1, count + 1):
+        row = {
+            'id': i, 'name': f'Project {i:03d}', 'description': _sentence(rng, 4, 10),
+            'start_date': start - timedelta(days=rng.randint(0, 365)), 'end_date': None, 'status': 'active',
+            'billing_type': 'hourly', 'hourly_rate': None, 'metric_label': None,
+            'metric_divisor': None, 'metric_multiplier': None, 'updated_at': datetime.combine(start, dt_time()),
+        }
+        if i % 3 == 0:
+            row.update(billing_type='count_based', metric_label='Records Processed',
+                       metric_divisor=100, metric_multiplier=round(rng.uniform(5, 15), 2))
+        else:
+            row['hourly_rate'] = round(rng.uniform(8, 25), 2)
+        if i % 7 == 0:
+            row.update(status='completed', end_date=start + timedelta(days=rng.randint(30, 300)))
+        writer.add(Project.__table__, row)
+        ids.append(i)
+    return ids
+
+def _people(writer, rng, count, start):
+    password = generate_password_hash(BENCHMARK_PASSWORD, hash_method())
+    writer.add(User.__table__, {'id': 1, 'username': ADMIN_USERNAME, 'password': password, 'role': 'admin', 'is_active': True})
+    for i in range(1, count + 1):
+        writer.add(User.__table__, {'id': i + 1, 'username': f'emp{i}', 'password': password,
+                                    'role': 'employee', 'is_active': True})
+        writer.add(Employee.__table__, {
+            'id': i, 'user_id': i + 1,
+            'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'email': f'emp{i}@example.com', 'phone': f'9{rng.randint(100000000, 999999999)}',
+            'department': rng.choice(DEPARTMENTS), 'position': rng.choice(POSITIONS),
+            'hire_date': start - timedelta(days=rng.randint(0, 1500)),
+        })
+
+def _leave(writer, rng, employees, start, end, per_year):
+    """Leave requests; returns the (employee_id, day) pairs covered by approved leave"""
+    on_leave = set()
+    span = (end - start).days
+    total = int(employees * per_year * span / 365)
+    for _ in range(total):
+        employee_id = rng.randint(1, employees)
+        first = start + timedelta(days=rng.randint(0, span))
+        last = min(first + timedelta(days=rng.choice([0, 0, 1, 2, 4])), end)
+        created = datetime.combine(first - timedelta(days=rng.randint(1, 20)), dt_time(10))
+        status = 'pending' if first > end - timedelta(days=14) else rng.choice(['approved'] * 8 + ['denied'])
+        writer.add(LeaveRequest.__table__, {
+            'employee_id': employee_id, 'start_date': first, 'end_date': last, 'reason': _sentence(rng, 3, 8),
+            'leave_type': rng.choice(LEAVE_TYPES), 'status': status, 'created_at': created, 'updated_at': created,
+            'approved_by': 1 if status != 'pending' else None,
+            'approved_at': created + timedelta(days=1) if status != 'pending' else None,
+        })
+        if status == 'approved':
+            day = first
+            while day <= last:
+                on_leave.add((employee_id, day))
+                day += timedelta(days=1)
+    return on_leave
+
+def _daily(writer, rng, employees, projects, start, end, on_leave):
+    """Attendance for each workday, plus the work reports and journal entries filed that day"""
+    home_project = {i: rng.choice(projects) for i in range(1, employees + 1)}
+    for day in _workdays(start, end):
+        for employee_id in range(1, employees + 1):
+            if (employee_id, day) in on_leave or rng.random() < 0.05:
+                continue
+            project_id = home_project[employee_id] if rng.random() < 0.9 else rng.choice(projects)
+            clock_in = datetime.combine(day, dt_time(8)) + timedelta(minutes=rng.randint(0, 90))
+            # Today's rows are still open for most people
+            clock_out = None if day == end and rng.random() < 0.8 else clock_in + timedelta(minutes=rng.randint(420, 570))
+            writer.add(Attendance.__table__, {
+                'employee_id': employee_id, 'date': day, 'clock_in': clock_in, 'clock_out': clock_out,
+                'project_id': project_id, 'break_duration': rng.choice([30, 45, 60]), 'notes': None,
+            })
+            if rng.random() < 0.75:
+                # Reviewed in weekly batches; the last two weeks are still waiting
+                reviewed = (end - day).days > 14
+                writer.add(WorkReport.__table__, {
+                    'employee_id': employee_id, 'project_id': project_id, 'date': day,
+                    'description': _sentence(rng, 4, 25),
+                    'quantity': float(rng.randint(4, 9)) if project_id % 3 else float(rng.randint(200, 2000)),
+                    'created_at': clock_in + timedelta(hours=8),
+                    'approval_status': 'approved' if reviewed else 'pending',
+                    'reviewed_by': 1 if reviewed else None,
+                    'reviewed_at': clock_in + timedelta(days=7) if reviewed else None,
+                })
+            if rng.random() < 0.2:
+                writer.add(ProjectJournal.__table__, {
+                    'date': day, 'employee_id': employee_id, 'project_id': project_id,
+                    'object_ids': ','.join(str(rng.randint(10000, 99999)) for _ in range(rng.randint(1, 8))),
+                    'task_type': rng.choice(TASK_TYPES), 'hours_spent': float(rng.randint(1, 8)),
+                    'status': rng.choice(['completed', 'in_progress', 'on_hold']),
+                    'comments': _sentence(rng, 0, 12) or None, 'created_at': clock_in + timedelta(hours=7),
+                })
+
+def _messages(writer, rng, employees, start, end, per_year):
+    span_seconds = int((end - start).total_seconds()) + 86400
+    recent = datetime.combine(end - timedelta(days=7), dt_time())
+    total = int(employees * per_year * span_seconds / 86400 / 365)
+    for _ in range(total):
+        sent_at = datetime.combine(start, dt_time()) + timedelta(seconds=rng.randint(0, span_seconds - 1))
+        is_read = sent_at < recent or rng.random() < 0.5
+        writer.add(InternalMessage.__table__, {
+            'sender_id': rng.choice([1, rng.randint(2, employees + 1)]), 'recipient_id': rng.randint(2, employees + 1),
+            'subject': _sentence(rng, 2, 6), 'content': _sentence(rng, 8, 40), 'is_broadcast': False,
+            'is_read': is_read, 'sent_at': sent_at, 'read_at': sent_at + timedelta(hours=2) if is_read else None,
+        })
+    writer.flush(InternalMessage.__table__)
+
+    # One broadcast from the admin on the first workday of every month
+    message_id = writer.conn.execute(select(func.coalesce(func.max(InternalMessage.id), 0))).scalar()
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        sent_at = datetime.combine(max(month, start), dt_time(9))
+        message_id += 1
+        writer.add(InternalMessage.__table__, {
+            'id': message_id, 'sender_id': 1, 'recipient_id': None, 'subject': f"Update for {month:%B %Y}",
+            'content': _sentence(rng, 20, 60), 'is_broadcast': True, 'is_read': False, 'sent_at': sent_at,
+        })
+        writer.flush(InternalMessage.__table__)
+        for user_id in range(2, employees + 2):
+            is_read = sent_at < recent or rng.random() < 0.3
+            writer.add(MessageRecipient.__table__, {
+                'message_id': message_id, 'user_id': user_id, 'is_read': is_read,
+                'read_at': sent_at + timedelta(days=1) if is_read else None,
+            })
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def _billing(writer, rng, employees, start, end):
+    month = date(start.year, start.month, 1)
+    while True:
+        following = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        if following > end:
+            break
+        finalized = datetime.combine(following, dt_time(11))
+        for employee_id in range(1, employees + 1):
+            writer.add(BillingRecord.__table__, {
+                'employee_id': employee_id, 'period_start': month, 'period_end': following - timedelta(days=1),
+                'total_amount': round(rng.uniform(800, 4000), 2), 'status': rng.choice(['finalized', 'paid', 'paid']),
+                'notes': None, 'created_at': finalized, 'finalized_at': finalized,
+            })
+        month = following
+
+def generate(engine, employees=200, years=1.0, projects=20, end=None, seed=1, batch_size=5000,
+             leave_per_year=4, messages_per_year=24, log=print):
+    """Fill an empty database; returns {table name: rows written}"""
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=int(years * 365))
+
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+            raise ValueError('The target database already has users; generate into an empty database')
+        conn.execute(SchemaMigration.__table__.insert(), [
+            {'version': version, 'description': description} for version, description, _ in MIGRATIONS
+        ])
+
+        writer = _Writer(conn, batch_size)
+        steps = [
+            ('projects', lambda: _projects(writer, rng, projects, start)),
+            ('users and employees', lambda: _people(writer, rng, employees, start)),
+            ('leave requests', lambda: _leave(writer, rng, employees, start, end, leave_per_year)),
+        ]
+        results = {}
+        for label, step in steps:
+            started = time.perf_counter()
+            results[label] = step()
+            writer.flush()
+            log(f"{label:<40}{time.perf_counter() - started:>8.1f}s")
+
+        for label, step in [
+            ('attendance, work reports and journal', lambda: _daily(writer, rng, employees, results['projects'],
+                                                                     start, end, results['leave requests'])),
+            ('messages', lambda: _messages(writer, rng, employees, start, end, messages_per_year)),
+            ('billing records', lambda: _billing(writer, rng, employees, start, end)),
+        ]:
+            started = time.perf_counter()
+            step()
+            writer.flush()
+            log(f"{label:<40}{time.perf_counter() - started:>8.1f}s")
+
+        started = time.perf_counter()
+        writer.counts['attendance_day'] = rebuild_attendance_days(conn, start, end, today=end, batch_size=batch_size)
+        log(f"{'attendance summary':<40}{time.perf_counter() - started:>8.1f}s")
+        started = time.perf_counter()
+        writer.counts['journal_object'] = index_journal_entries(conn, batch_size=batch_size)
+        log(f"{'journal object index':<40}{time.perf_counter() - started:>8.1f}s")
+    return writer.counts
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill a database with deterministic synthetic data')
+    parser.add_argument('--database', default='sqlite:///' + os.path.abspath('ems_benchmark.db'),
+                        help='SQLAlchemy URL of an empty database (default: ./ems_benchmark.db)')
+    parser.add_argument('--employees', type=int, default=200)
+    parser.add_argument('--years', type=float, default=1.0)
+    parser.add_argument('--projects', type=int, default=20)
+    parser.add_argument('--end', type=date.fromisoformat, default=None, help='last day of data (default: today)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database)
+    if engine.dialect.name == 'sqlite':
+        install_sqlite_profile(engine, SQLITE_PROFILES['production'])
+    started = time.perf_counter()
+    counts = generate(engine, args.employees, args.years, args.projects, args.end, args.seed, args.batch_size)
+    print()
+    for table, count in sorted(counts.items()):
+        print(f"{table:<24}{count:>12,}")
+    print(f"{'total':<24}{sum(counts.values()):>12,} rows in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
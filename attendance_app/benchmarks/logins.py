@@ -0,0 +1,135 @@
+import argparse
+import os
+import tempfile
+import threading
+import time
+from werkzeug.security import generate_password_hash
+
+# Login throughput benchmark.
+#
+# For each password hashing setting ("algorithm:cost", see passwords.py)
+# builds an app on a scratch SQLite database with --users accounts hashed
+# under that setting, then has --concurrency threads post /login until
+# --logins sign-ins have gone through. It reports the time of one hash, the
+# sign-ins per second and the p50/p95 latency, which is the trade-off to
+# weigh when picking PASSWORD_HASH_COST for the shift-start rush. Each
+# setting finishes with a rehash check: accounts hashed under the first
+# setting sign in once and must come out hashed under the current one.
+#
+#   python -m attendance_app.benchmarks.logins --settings pbkdf2:600000 scrypt:16384 scrypt:32768
+
+DEFAULT_SETTINGS = ['pbkdf2:100000', 'pbkdf2:600000', 'scrypt:16384', 'scrypt:32768', 'scrypt:65536']
+PASSWORD = 'benchmark'
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def _build_app(path, algorithm, cost, workers):
+    from attendance_app.factory import create_app
+    config = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'WTF_CSRF_ENABLED': False,
+        'PERF_LOG': False,
+        'PASSWORD_HASH_ALGORITHM': algorithm,
+        'PASSWORD_HASH_COST': cost,
+    }
+    if workers:
+        config['PASSWORD_HASH_WORKERS'] = workers
+    return create_app(config)
+
+def _seed(app, users, method):
+    from attendance_app.models import db, User
+    with app.app_context():
+        db.create_all()
+        password = generate_password_hash(PASSWORD, method)
+        db.session.execute(User.__table__.insert(), [
+            {'username': f'user{i}', 'password': password, 'role': 'employee', 'is_active': True} for i in range(users)
+        ])
+        db.session.commit()
+
+def _sign_in(app, username):
+    response = app.test_client().post('/login', data={'username': username, 'password': PASSWORD})
+    if response.status_code != 302:
+        raise RuntimeError(f"Login as {username} returned {response.status_code}")
+
+def run_setting(setting, first_method, args):
+    from attendance_app.models import db, User
+    from attendance_app.passwords import hash_method, password_hasher
+    algorithm, cost = setting.split(':')
+    method = hash_method(algorithm, int(cost))
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _build_app(os.path.join(tmp, 'logins.db'), algorithm, int(cost), args.workers)
+        _seed(app, args.users, method)
+
+        with app.app_context():
+            started = time.perf_counter()
+            password_hasher().hash(PASSWORD)
+            hash_ms = (time.perf_counter() - started) * 1000
+
+        for i in range(min(args.warmup, args.users)):
+            _sign_in(app, f'user{i}')
+        timings = []
+        lock = threading.Lock()
+        counter = iter(range(args.logins))
+
+        def worker():
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                started = time.perf_counter()
+                _sign_in(app, f'user{i % args.users}')
+                elapsed = time.perf_counter() - started
+                with lock:
+                    timings.append(elapsed)
+
+        threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        # Transparent rehash: an account hashed under the first setting is upgraded on sign-in
+        with app.app_context():
+            db.session.execute(User.__table__.update().where(User.username == 'user0')
+                               .values(password=generate_password_hash(PASSWORD, first_method)))
+            db.session.commit()
+        _sign_in(app, 'user0')
+        with app.app_context():
+            stored = db.session.execute(db.select(User.password).where(User.username == 'user0')).scalar()
+            rehashed = stored.split('$', 1)[0] == method
+            db.engine.dispose()
+
+    ordered = sorted(timings)
+    return {
+        'hash_ms': hash_ms,
+        'rps': len(timings) / wall,
+        'p50_ms': _percentile(ordered, 0.5) * 1000,
+        'p95_ms': _percentile(ordered, 0.95) * 1000,
+        'rehashed': rehashed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure login throughput for each password hashing setting')
+    parser.add_argument('--settings', nargs='+', default=DEFAULT_SETTINGS, help='algorithm:cost pairs')
+    parser.add_argument('--logins', type=int, default=40, help='sign-ins per setting')
+    parser.add_argument('--concurrency', type=int, default=8, help='threads signing in at once')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--workers', type=int, default=None, help='PASSWORD_HASH_WORKERS (default: one per core)')
+    args = parser.parse_args()
+
+    from attendance_app.passwords import hash_method
+    algorithm, cost = args.settings[0].split(':')
+    first_method = hash_method(algorithm, int(cost))
+    print(f"{'setting':<18}{'hash ms':>9}{'logins/s':>10}{'p50 ms':>9}{'p95 ms':>9}  rehash")
+    for setting in args.settings:
+        result = run_setting(setting, first_method, args)
+        print(f"{setting:<18}{result['hash_ms']:>9.1f}{result['rps']:>10.1f}{result['p50_ms']:>9.1f}"
+              f"{result['p95_ms']:>9.1f}  {'ok' if result['rehashed'] else 'FAILED'}")
+
+if __name__ == '__main__':
+    main()
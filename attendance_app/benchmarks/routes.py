@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+# Route benchmarks.
+#
+# Drives the Flask test client against the hot routes on a database built by
+# datagen.py and reports, per scenario, requests/sec and min/mean/p50/p95/max
+# latency. The whole request is timed, including reading streamed CSV bodies.
+# --save writes the results as a JSON baseline; --compare prints each
+# scenario's p50 change against a saved baseline, and with --max-regression
+# exits non-zero when any scenario got slower than that percentage.
+#
+# The app reads DATABASE_URL when it is imported, so set it on the command
+# line (see benchmarks/__init__.py); CSRF and the per-request perf log are
+# turned off for the run. Date-filtered scenarios use the last month of data.
+#
+# The run also enforces the @query_budget declarations (QUERY_BUDGET_STRICT):
+# every budgeted view has a scenario, a view that goes over its budget is
+# reported as OVER BUDGET and the run exits non-zero.
+
+Scenario = namedtuple('Scenario', 'name role method path data')
+
+def scenarios(end):
+    """The benchmarked requests; end is the last day that has attendance"""
+    month = {'start_date': (end - timedelta(days=30)).isoformat(), 'end_date': end.isoformat()}
+    month_query = f"start_date={month['start_date']}&end_date={month['end_date']}"
+    calendar_start = date(end.year, end.month, 1)
+    return [
+        Scenario('dashboard (admin)', 'admin', 'GET', '/dashboard', None),
+        Scenario('dashboard (employee)', 'employee', 'GET', '/dashboard', None),
+        Scenario('attendance (admin)', 'admin', 'GET', '/attendance', None),
+        Scenario('attendance, last month (admin)', 'admin', 'GET', f'/attendance?{month_query}', None),
+        Scenario('attendance (employee)', 'employee', 'GET', '/attendance', None),
+        Scenario('attendance summary, month (admin)', 'admin', 'GET',
+                 f'/attendance/summary?year={end.year}&month={end.month}', None),
+        Scenario('attendance summary, year (admin)', 'admin', 'GET', f'/attendance/summary?year={end.year}', None),
+        Scenario('attendance summary (employee)', 'employee', 'GET', f'/attendance/summary?year={end.year}', None),
+        Scenario('admin work reports', 'admin', 'GET', '/admin/work_reports', None),
+        Scenario('admin work reports, project 1', 'admin', 'GET', f'/admin/work_reports?project_id=1&{month_query}', None),
+        Scenario('work reports (employee)', 'employee', 'GET', '/work_reports', None),
+        Scenario('billing calculate, last month', 'admin', 'POST', '/billing/calculate', month),
+        Scenario('billing records', 'admin', 'GET', '/billing', None),
+        Scenario('employees (admin)', 'admin', 'GET', '/employees', None),
+        Scenario('leave requests (admin)', 'admin', 'GET', '/admin/leave_requests', None),
+        Scenario('training assignments (admin)', 'admin', 'GET', '/training_assignments', None),
+        Scenario('attendance csv, last month', 'admin', 'GET', f'/attendance/export/csv?{month_query}', None),
+        Scenario('work reports csv, last month', 'admin', 'GET', f'/admin/work_reports/export/csv?{month_query}', None),
+        Scenario('billing csv', 'admin', 'GET', '/billing/export/csv', None),
+        Scenario('messages (employee)', 'employee', 'GET', '/messages', None),
+        Scenario('unread count (employee)', 'employee', 'GET', '/api/messages/unread-count', None),
+        Scenario('calendar month (employee)', 'employee', 'GET',
+                 f'/api/calendar/events?start={calendar_start}&end={calendar_start + timedelta(days=42)}', None),
+    ]
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_scenario(client, scenario, iterations, warmup):
+    def request():
+        # Closing the response runs the end-of-stream cleanup, as a WSGI server would
+        with client.open(scenario.path, method=scenario.method, data=scenario.data) as response:
+            body = response.get_data()
+            if response.status_code != 200:
+                raise RuntimeError(f"{scenario.name}: {scenario.method} {scenario.path} returned {response.status_code}")
+        return len(body)
+
+    for _ in range(warmup):
+        request()
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        size = request()
+        timings.append(time.perf_counter() - started)
+    ordered = sorted(timings)
+    return {
+        'iterations': iterations,
+        'rps': iterations / sum(timings),
+        'min_ms': ordered[0] * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'p50_ms': _percentile(ordered, 0.5) * 1000,
+        'p95_ms': _percentile(ordered, 0.95) * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'bytes': size,
+    }
+
+def _login(app, username, password):
+    client = app.test_client()
+    response = client.post('/login', data={'username': username, 'password': password})
+    if response.status_code != 302:
+        raise RuntimeError(f"Could not log in as {username}; was the database built by datagen.py?")
+    return client
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the hot routes against a generated database')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', nargs='+', default=None, help='run the scenarios whose name contains any of these')
+    parser.add_argument('--employee', default='emp1', help='username for the employee scenarios')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare p50 latencies with this saved baseline')
+    parser.add_argument('--max-regression', type=float, default=None,
+                        help='with --compare, exit 1 if any p50 is this many percent slower')
+    args = parser.parse_args()
+
+    if 'DATABASE_URL' not in os.environ:
+        parser.error('set DATABASE_URL to the database built by datagen.py')
+
+    from attendance_app.app import app, db
+    from attendance_app.models import Attendance
+    from attendance_app.benchmarks.datagen import ADMIN_USERNAME, BENCHMARK_PASSWORD
+    from attendance_app.query_counter import QueryBudgetExceeded
+    # Over-budget views raise out of the test client instead of rendering a 500 page
+    app.config.update(WTF_CSRF_ENABLED=False, PERF_LOG=False, QUERY_BUDGET_STRICT=True, PROPAGATE_EXCEPTIONS=True)
+
+    with app.app_context():
+        end = db.session.query(db.func.max(Attendance.date)).scalar()
+    if end is None:
+        sys.exit('The database has no attendance; build it with datagen.py first')
+    clients = {
+        'admin': _login(app, ADMIN_USERNAME, BENCHMARK_PASSWORD),
+        'employee': _login(app, args.employee, BENCHMARK_PASSWORD),
+    }
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    selected = [s for s in scenarios(end) if not args.only or any(part in s.name for part in args.only)]
+    results = {}
+    regressions = []
+    over_budget = []
+    print(f"{'scenario':<36}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'KiB':>8}" + ('   vs baseline' if baseline else ''))
+    for scenario in selected:
+        try:
+            result = results[scenario.name] = run_scenario(clients[scenario.role], scenario, args.iterations, args.warmup)
+        except QueryBudgetExceeded as e:
+            over_budget.append(scenario.name)
+            print(f"{scenario.name:<36}OVER BUDGET: {e}")
+            continue
+        line = (f"{scenario.name:<36}{result['rps']:>9.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+                f"{result['max_ms']:>9.1f}{result['bytes'] / 1024:>8.0f}")
+        previous = baseline.get(scenario.name)
+        if previous:
+            change = (result['p50_ms'] - previous['p50_ms']) / previous['p50_ms'] * 100
+            line += f"   {change:+7.1f}%"
+            if args.max_regression is not None and change > args.max_regression:
+                regressions.append(scenario.name)
+                line += '  REGRESSION'
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'database': app.config['SQLALCHEMY_DATABASE_URI'],
+                'data_end': end.isoformat(),
+                'python': platform.python_version(),
+                'iterations': args.iterations,
+                'results': results,
+            }, f, indent=2)
+        print(f"Saved results to {args.save}")
+    if over_budget:
+        sys.exit(f"{len(over_budget)} scenario(s) went over their query budget: {', '.join(over_budget)}")
+    if regressions:
+        sys.exit(f"{len(regressions)} scenario(s) regressed by more than {args.max_regression}%: {', '.join(regressions)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+from sqlalchemy import func
+from attendance_app.models import db, Employee, Project, WorkReport
+
+# Set-based billing: one grouped aggregate over WorkReport instead of a query per employee.
+
+class BillingRateTable:
+    """Billing rules for a set of projects, built once and applied to whole columns"""
+
+    def __init__(self, rules):
+        self.rules = rules  # {project_id: (divisor, multiplier)}
+
+    @classmethod
+    def from_projects(cls, projects):
+        return cls({project.id: project.billing_rule() for project in projects})
+
+    @classmethod
+    def load(cls, project_ids=None):
+        """Build the table from the database, optionally limited to the given project ids"""
+        query = Project.query
+        if project_ids is not None:
+            if not project_ids:
+                return cls({})
+            query = query.filter(Project.id.in_(set(project_ids)))
+        return cls.from_projects(query.all())
+
+    def evaluate(self, project_ids, quantities):
+        """Return the billing amount for each (project_id, quantity) row.
+
+        ``project_ids`` and ``quantities`` are parallel columns. Rows for
+        projects missing from the table bill 0.
+        """
+        if len(project_ids) != len(quantities):
+            raise ValueError("project_ids and quantities must have the same length")
+
+        no_rule = (1, 0)
+        row_rules = [self.rules.get(project_id, no_rule) for project_id in project_ids]
+        return [quantity / divisor * multiplier
+                for quantity, (divisor, multiplier) in zip(quantities, row_rules)]
+
+def aggregate_work_totals(start_date, end_date):
+    """Return {(employee_id, project_id): total_quantity} for the period in a single query"""
+    rows = db.session.query(
+        WorkReport.employee_id,
+        WorkReport.project_id,
+        func.sum(WorkReport.quantity)
+    ).filter(
+        WorkReport.date >= start_date,
+        WorkReport.date <= end_date
+    ).group_by(
+        WorkReport.employee_id,
+        WorkReport.project_id
+    ).order_by(
+        WorkReport.employee_id,
+        WorkReport.project_id
+    ).all()
+
+    return {(employee_id, project_id): total or 0 for employee_id, project_id, total in rows}
+
+def work_report_amounts(start_date, end_date, rate_table=None):
+    """Evaluate every WorkReport row in the period in one pass.
+
+    Returns parallel lists (report_ids, amounts). Pass a custom
+    ``rate_table`` to run what-if scenarios against alternative rates.
+    """
+    rows = db.session.query(
+        WorkReport.id,
+        WorkReport.project_id,
+        WorkReport.quantity
+    ).filter(
+        WorkReport.date >= start_date,
+        WorkReport.date <= end_date
+    ).order_by(WorkReport.id).all()
+
+    report_ids = [row[0] for row in rows]
+    project_ids = [row[1] for row in rows]
+    quantities = [row[2] for row in rows]
+
+    if rate_table is None:
+        rate_table = BillingRateTable.load(project_ids)
+    return report_ids, rate_table.evaluate(project_ids, quantities)
+
+def calculate_period_billing(start_date, end_date):
+    """Compute per-employee, per-project earnings for the period.
+
+    Returns a list with one entry per employee (in the same shape the billing
+    templates expect): {'employee', 'project_earnings', 'total_earnings'}.
+    """
+    totals = aggregate_work_totals(start_date, end_date)
+
+    keys = list(totals)
+    project_ids = [project_id for _, project_id in keys]
+    quantities = [totals[key] for key in keys]
+
+    projects = {}
+    if project_ids:
+        projects = {p.id: p for p in Project.query.filter(Project.id.in_(set(project_ids))).all()}
+    rate_table = BillingRateTable.from_projects(projects.values())
+    amounts = rate_table.evaluate(project_ids, quantities)
+
+    per_employee = {}
+    for (employee_id, project_id), quantity, amount in zip(keys, quantities, amounts):
+        per_employee.setdefault(employee_id, []).append({
+            'name': projects[project_id].name,
+            'quantity': quantity,
+            'earnings': amount
+        })
+
+    results = []
+    for employee in Employee.query.order_by(Employee.id).all():
+        project_earnings = per_employee.get(employee.id, [])
+        results.append({
+            'employee': employee,
+            'project_earnings': project_earnings,
+            'total_earnings': sum(p['earnings'] for p in project_earnings)
+        })
+    return results
@@ -0,0 +1,116 @@
+import hashlib
+from datetime import date, timedelta
+from flask import abort
+from sqlalchemy import and_, func, or_, select
+from attendance_app.models import db, CompanyEvent, Employee, LeaveRequest, Project
+
+# Calendar feed for /api/calendar/events.
+#
+# FullCalendar asks for one visible range at a time (start inclusive, end
+# exclusive). Each source is a range query on its indexed date columns, and
+# a single aggregate query over the same ranges (row count, max id, max
+# updated_at) gives the ETag and Last-Modified, so an unchanged month is
+# answered with a 304 before any events are loaded or serialized. updated_at
+# is set in Python to the microsecond so two edits in one second still differ.
+
+MAX_RANGE_DAYS = 400
+
+EVENT_COLORS = {
+    'holiday': '#dc3545',
+    'meeting': '#6f42c1',
+}
+DEFAULT_EVENT_COLOR = '#0d6efd'
+LEAVE_COLOR = '#ffc107'
+PROJECT_COLOR = '#198754'
+
+def _parse_date(value):
+    # FullCalendar sends ISO datetimes with an offset; only the date part matters here
+    try:
+        return date.fromisoformat((value or '')[:10])
+    except ValueError:
+        abort(400, description='start and end must be ISO dates')
+
+def parse_range(args):
+    start, end = _parse_date(args.get('start')), _parse_date(args.get('end'))
+    if end <= start or (end - start).days > MAX_RANGE_DAYS:
+        abort(400, description='Invalid calendar range')
+    return start, end
+
+def _company_event_filter(start, end):
+    return and_(CompanyEvent.event_date >= start, CompanyEvent.event_date < end)
+
+def _leave_filter(start, end):
+    return and_(LeaveRequest.start_date < end, LeaveRequest.end_date >= start)
+
+def _project_filter(start, end):
+    return and_(
+        Project.start_date.isnot(None),
+        Project.start_date < end,
+        or_(Project.end_date >= start, and_(Project.end_date.is_(None), Project.start_date >= start)),
+    )
+
+def _fingerprint_columns(model, criteria):
+    aggregate = select(func.count(), func.max(model.id), func.max(model.updated_at)).where(criteria).subquery()
+    return [select(column).scalar_subquery() for column in aggregate.c]
+
+def calendar_validators(start, end):
+    """(etag, last_modified) for everything the feed would return for the range"""
+    row = db.session.execute(select(
+        *_fingerprint_columns(CompanyEvent, _company_event_filter(start, end)),
+        *_fingerprint_columns(LeaveRequest, _leave_filter(start, end)),
+        *_fingerprint_columns(Project, _project_filter(start, end)),
+    )).one()
+    etag = hashlib.sha1(repr(tuple(row)).encode()).hexdigest()[:20]
+    modified = [value for value in row[2::3] if value is not None]
+    return etag, max(modified) if modified else None
+
+def _company_events(start, end):
+    rows = db.session.query(
+        CompanyEvent.title, CompanyEvent.event_date, CompanyEvent.event_time, CompanyEvent.is_all_day,
+        CompanyEvent.event_type, CompanyEvent.description,
+    ).filter(_company_event_filter(start, end))
+    for title, event_date, event_time, is_all_day, event_type, description in rows:
+        start_value = event_date.isoformat()
+        if event_time and not is_all_day:
+            start_value += 'T' + event_time.strftime('%H:%M')
+        color = EVENT_COLORS.get(event_type, DEFAULT_EVENT_COLOR)
+        yield {
+            'title': title,
+            'start': start_value,
+            'allDay': bool(is_all_day),
+            'color': color,
+            'extendedProps': {'type': 'company_event', 'description': description, 'eventType': event_type},
+        }
+
+def _leave_events(start, end):
+    rows = db.session.query(
+        Employee.name, LeaveRequest.leave_type, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.reason,
+    ).join(Employee, LeaveRequest.employee_id == Employee.id).filter(_leave_filter(start, end))
+    for name, leave_type, start_date, end_date, reason in rows:
+        yield {
+            'title': f"{name} - {leave_type.title()} Leave",
+            'start': start_date.isoformat(),
+            'end': (end_date + timedelta(days=1)).isoformat(),
+            'allDay': True,
+            'color': LEAVE_COLOR,
+            'extendedProps': {'type': 'leave_request', 'employee': name, 'reason': reason, 'leaveType': leave_type},
+        }
+
+def _project_events(start, end):
+    rows = db.session.query(
+        Project.name, Project.start_date, Project.end_date, Project.description, Project.status,
+    ).filter(_project_filter(start, end))
+    for name, start_date, end_date, description, status in rows:
+        event = {
+            'title': f"Project: {name}",
+            'start': start_date.isoformat(),
+            'allDay': True,
+            'color': PROJECT_COLOR,
+            'extendedProps': {'type': 'project', 'description': description, 'status': status},
+        }
+        if end_date:
+            event['end'] = (end_date + timedelta(days=1)).isoformat()
+        yield event
+
+def calendar_events(start, end):
+    return [*_company_events(start, end), *_leave_events(start, end), *_project_events(start, end)]
@@ -20,7 +20,10 @@ async function fetchJournalEntry({ employeeId, projectId, date }) {
 async function saveJournalEntry(entry) {
   const res = await fetch('/api/journal-entries', {
     method: 'POST',
-    headers: { 'Content-Type': 'application/json' },
+    headers: {
+      'Content-Type': 'application/json',
+      'X-CSRFToken': document.querySelector('meta[name="csrf-token"]').content
+    },
     body: JSON.stringify(entry)
   });
   if (!res.ok) throw new Error('Failed to save entry');
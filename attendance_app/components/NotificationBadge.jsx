@@ -5,14 +5,36 @@ export default function NotificationBadge() {
   const [showDropdown, setShowDropdown] = useState(false);
 
   useEffect(() => {
-    fetch('/api/notifications')
-      .then(res => res.json())
-      .then(data => setNotifications(data.notifications || []));
-    const interval = setInterval(() => {
+    function loadNotifications() {
       fetch('/api/notifications')
         .then(res => res.json())
         .then(data => setNotifications(data.notifications || []));
-    }, 30000);
+    }
+    loadNotifications();
+    // New messages are pushed over the notification stream when the server has it on
+    const streamMeta = document.querySelector('meta[name="notification-stream"]');
+    if (window.EventSource && streamMeta && streamMeta.content === 'on') {
+      const stream = new EventSource('/api/notifications/stream');
+      stream.addEventListener('notification', event => {
+        const notification = JSON.parse(event.data);
+        setNotifications(n => [...n, { ...notification, read: false }]);
+      });
+      return () => stream.close();
+    }
+    // Otherwise poll the unread count, which is answered with 304 while nothing
+    // changed, and only reload the list when the count moves
+    let lastCount = null;
+    function checkUnreadCount() {
+      fetch('/api/messages/unread-count', { cache: 'no-cache' })
+        .then(res => res.json())
+        .then(data => {
+          if (lastCount !== null && data.count !== lastCount) loadNotifications();
+          lastCount = data.count;
+        })
+        .catch(() => {});
+    }
+    checkUnreadCount();
+    const interval = setInterval(checkUnreadCount, 30000);
     return () => clearInterval(interval);
   }, []);
 
@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from attendance_app.models import db, Employee, Attendance, LeaveRequest, Project
+from attendance_app.attendance_summary import present_count
+
+# Admin dashboard metrics cache.
+#
+# The admin dashboard numbers are computed once and served from the cache until
+# something they depend on changes. Every committed ORM write to Employee,
+# Attendance, LeaveRequest or Project drops the cached entry (see
+# _track_dashboard_writes), and Core statements that bypass the ORM, like the
+# clock-in upsert, call invalidate_dashboard_metrics() themselves. The TTL is
+# only a safety net for writes made outside this process.
+#
+# The backend is anything with get/set/delete. MemoryCache is per process; with
+# several gunicorn workers point DASHBOARD_CACHE at a shared store (e.g. a thin
+# wrapper around a Redis client) so one worker's invalidation reaches the rest.
+
+DASHBOARD_CACHE_TTL = 300
+DASHBOARD_WATCHED_MODELS = (Employee, Attendance, LeaveRequest, Project)
+
+class MemoryCache:
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+def _cache():
+    return current_app.extensions['dashboard_cache']
+
+def _metrics_key(today):
+    # Keyed by date so the "present today" count rolls over at midnight on its own
+    return f'dashboard:admin:{today.isoformat()}'
+
+def _compute_admin_metrics(today):
+    total_employees = Employee.query.count()
+    present_today = present_count(today)
+    recent_leaves = [
+        {'id': id, 'employee_name': name, 'start_date': start_date, 'end_date': end_date, 'reason': reason}
+        for id, name, start_date, end_date, reason in db.session.query(
+            LeaveRequest.id, Employee.name, LeaveRequest.start_date, LeaveRequest.end_date, LeaveRequest.reason
+        ).outerjoin(Employee, LeaveRequest.employee_id == Employee.id)
+         .filter(LeaveRequest.status == 'pending').limit(5).all()
+    ]
+    return {
+        'total_employees': total_employees,
+        'present': present_today,
+        'absent': total_employees - present_today,
+        'recent_leaves': recent_leaves,
+        'active_projects': Project.query.filter_by(status='active').count(),
+    }
+
+def get_admin_dashboard_metrics():
+    today = datetime.utcnow().date()
+    key = _metrics_key(today)
+    metrics = _cache().get(key)
+    if metrics is None:
+        metrics = _compute_admin_metrics(today)
+        _cache().set(key, metrics, current_app.config.get('DASHBOARD_CACHE_TTL', DASHBOARD_CACHE_TTL))
+    return metrics
+
+def invalidate_dashboard_metrics():
+    _cache().delete(_metrics_key(datetime.utcnow().date()))
+
+def _track_dashboard_writes(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, DASHBOARD_WATCHED_MODELS):
+            session.info['dashboard_dirty'] = True
+            return
+
+def _invalidate_after_commit(session):
+    if session.info.pop('dashboard_dirty', False) and has_app_context() \
+            and 'dashboard_cache' in current_app.extensions:
+        invalidate_dashboard_metrics()
+
+def _forget_after_rollback(session):
+    session.info.pop('dashboard_dirty', None)
+
+def init_dashboard_cache(app):
+    app.extensions['dashboard_cache'] = app.config.get('DASHBOARD_CACHE') or MemoryCache()
+    if not event.contains(Session, 'before_flush', _track_dashboard_writes):
+        event.listen(Session, 'before_flush', _track_dashboard_writes)
+        event.listen(Session, 'after_commit', _invalidate_after_commit)
+        event.listen(Session, 'after_rollback', _forget_after_rollback)
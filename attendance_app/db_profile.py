@@ -0,0 +1,62 @@
+import logging
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# SQLite connection profiles.
+#
+# The pragmas below are applied to every new DBAPI connection. Pick a profile
+# with the SQLITE_PROFILE config key and override individual pragmas with
+# SQLITE_PRAGMAS. Pool settings live in SQLALCHEMY_ENGINE_OPTIONS as usual.
+#
+# production:
+#   journal_mode=WAL      readers no longer block the writer and vice versa
+#   synchronous=NORMAL    fsync on checkpoint instead of every commit (safe with WAL)
+#   busy_timeout          wait for the write lock instead of failing with "database is locked"
+#   cache_size            negative value is KiB of page cache per connection
+#   mmap_size             memory-map the database file for reads
+#   temp_store=MEMORY     keep sort/temp tables off disk
+
+SQLITE_PROFILES = {
+    'default': {
+        'busy_timeout': 5000,
+    },
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 15000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+    },
+}
+
+def get_sqlite_pragmas(config):
+    pragmas = dict(SQLITE_PROFILES[config.get('SQLITE_PROFILE', 'default')])
+    pragmas.update(config.get('SQLITE_PRAGMAS') or {})
+    return pragmas
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def install_sqlite_profile(engine, pragmas):
+    """Apply ``pragmas`` to every connection ``engine`` opens from now on"""
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+def init_db_profile(app, db):
+    """Install the configured SQLite profile on the app's engines. Call after db.init_app(app)."""
+    pragmas = get_sqlite_pragmas(app.config)
+    with app.app_context():
+        for engine in db.engines.values():
+            install_sqlite_profile(engine, pragmas)
+    logger.info(f"SQLite profile '{app.config.get('SQLITE_PROFILE', 'default')}' installed")
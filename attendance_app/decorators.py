@@ -0,0 +1,39 @@
+from functools import wraps
+from flask import flash, jsonify, redirect, url_for
+from flask_login import current_user
+
+# Role checks for routes; they go below @login_required.
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or current_user.role != 'admin':
+            flash("Admin access required", 'error')
+            return redirect(url_for('main.dashboard'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def employee_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or current_user.role != 'employee':
+            flash("Employee access required", 'error')
+            return redirect(url_for('main.dashboard'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def employee_api_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_user.role != 'employee' or current_user.employee_id is None:
+            return jsonify({'success': False, 'message': "Employee access required"}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+def admin_api_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_user.role != 'admin':
+            return jsonify({'success': False, 'message': "Admin access required"}), 403
+        return f(*args, **kwargs)
+    return decorated_function
@@ -1,7 +1,10 @@
 # Desktop launcher script
+import os
+import sys
 import webbrowser
 import threading
-from app import app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from attendance_app.app import app
 
 def open_browser():
     webbrowser.open("http://127.0.0.1:5000")
@@ -0,0 +1,144 @@
+import csv
+import io
+from datetime import datetime
+from flask import Response, stream_with_context
+from attendance_app.models import db, Employee, Project, Attendance, WorkReport, BillingRecord
+
+# Streaming CSV exports: rows are read from the database in fixed-size batches
+# and written out in chunks, so an export never holds the full result set in memory.
+# A streamed response is read after the request's session has been torn down, so
+# the export queries run on a session of their own that is closed when the rows
+# run out or the stream is abandoned.
+
+EXPORT_BATCH_SIZE = 1000
+
+WORK_REPORT_EXPORT_HEADER = ['Date', 'Employee', 'Project', 'Quantity', 'Description']
+ATTENDANCE_EXPORT_HEADER = ['Date', 'Employee', 'Project', 'Clock In', 'Clock Out']
+BILLING_EXPORT_HEADER = ['Record ID', 'Employee', 'Period Start', 'Period End', 'Amount', 'Status', 'Finalized At', 'Notes']
+
+def iter_csv(header, rows, chunk_rows=EXPORT_BATCH_SIZE):
+    """Yield CSV text for ``header`` and ``rows``, one chunk per ``chunk_rows`` rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    pending = 0
+    try:
+        for row in rows:
+            writer.writerow(row)
+            pending += 1
+            if pending >= chunk_rows:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+    finally:
+        # Closing an export_rows generator closes its session
+        if hasattr(rows, 'close'):
+            rows.close()
+
+    yield buffer.getvalue()
+
+def csv_response(filename, header, rows):
+    """Stream rows to the client as a CSV attachment"""
+    return Response(
+        stream_with_context(iter_csv(header, rows)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment;filename={filename}"}
+    )
+
+def apply_attendance_filters(query, args):
+    """Apply the start_date/end_date/employee_id/project_id filters from the request args"""
+    start_date_str = args.get('start_date')
+    end_date_str = args.get('end_date')
+    employee_id_str = args.get('employee_id')
+    project_id_str = args.get('project_id')
+
+    if start_date_str:
+        query = query.filter(Attendance.date >= datetime.strptime(start_date_str, '%Y-%m-%d').date())
+    if end_date_str:
+        query = query.filter(Attendance.date <= datetime.strptime(end_date_str, '%Y-%m-%d').date())
+    if employee_id_str:
+        query = query.filter(Attendance.employee_id == int(employee_id_str))
+    if project_id_str:
+        query = query.filter(Attendance.project_id == int(project_id_str))
+    return query
+
+def apply_work_report_filters(query, args):
+    """Apply the start_date/end_date/employee_id/project_id/approval_status filters from the request args"""
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    employee_id = args.get('employee_id')
+    project_id = args.get('project_id')
+
+    if start_date:
+        query = query.filter(WorkReport.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
+    if end_date:
+        query = query.filter(WorkReport.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
+    if employee_id:
+        query = query.filter(WorkReport.employee_id == int(employee_id))
+    if project_id:
+        query = query.filter(WorkReport.project_id == int(project_id))
+    if args.get('approval_status'):
+        query = query.filter(WorkReport.approval_status == args.get('approval_status'))
+    return query
+
+def _stream_rows(query):
+    """Yield the query's rows in EXPORT_BATCH_SIZE batches from a session closed when done"""
+    session = db.session.session_factory()
+    try:
+        yield from query.with_session(session).yield_per(EXPORT_BATCH_SIZE)
+    finally:
+        session.close()
+
+def _format_date(value, fmt='%Y-%m-%d'):
+    return value.strftime(fmt) if value else ''
+
+def work_report_export_rows(query):
+    """Yield CSV rows for a filtered WorkReport query.
+
+    The employee and project names are selected in the same statement, so
+    no relationship is lazy-loaded per row.
+    """
+    rows = _stream_rows(query.join(Employee, WorkReport.employee_id == Employee.id)
+                        .join(Project, WorkReport.project_id == Project.id)
+                        .with_entities(WorkReport.date, Employee.name, Project.name, WorkReport.quantity,
+                                       WorkReport.description))
+
+    for date, employee_name, project_name, quantity, description in rows:
+        yield [_format_date(date), employee_name, project_name, quantity, description]
+
+def attendance_export_rows(query):
+    """Yield CSV rows for a filtered Attendance query"""
+    rows = _stream_rows(query.join(Employee, Attendance.employee_id == Employee.id)
+                        .outerjoin(Project, Attendance.project_id == Project.id)
+                        .with_entities(Attendance.date, Employee.name, Project.name, Attendance.clock_in,
+                                       Attendance.clock_out))
+
+    for date, employee_name, project_name, clock_in, clock_out in rows:
+        yield [
+            _format_date(date),
+            employee_name,
+            project_name or 'N/A',
+            _format_date(clock_in, '%H:%M:%S'),
+            _format_date(clock_out, '%H:%M:%S')
+        ]
+
+def billing_export_rows(query):
+    """Yield CSV rows for a BillingRecord query"""
+    rows = _stream_rows(query.join(Employee, BillingRecord.employee_id == Employee.id)
+                        .with_entities(BillingRecord.id, Employee.name, BillingRecord.period_start,
+                                       BillingRecord.period_end, BillingRecord.total_amount, BillingRecord.status,
+                                       BillingRecord.finalized_at, BillingRecord.notes))
+
+    for record_id, employee_name, period_start, period_end, total_amount, status, finalized_at, notes in rows:
+        yield [
+            f"BR-{record_id}",
+            employee_name,
+            _format_date(period_start),
+            _format_date(period_end),
+            f"{total_amount:.2f}",
+            status,
+            _format_date(finalized_at, '%Y-%m-%d %H:%M'),
+            notes or ''
+        ]
@@ -0,0 +1,77 @@
+import logging
+import os
+from flask import Flask
+from flask_login import LoginManager
+from flask_wtf.csrf import CSRFProtect
+from attendance_app.models import db
+from attendance_app.db_profile import init_db_profile
+from attendance_app.query_counter import init_query_counter
+from attendance_app.dashboard_cache import init_dashboard_cache
+from attendance_app.attendance_summary import init_attendance_summary
+from attendance_app.notifications import init_notifications
+from attendance_app.jobs import init_job_runner
+from attendance_app.images import init_image_pipeline
+from attendance_app.passwords import init_passwords
+from attendance_app.principal import init_principal, load_principal
+from attendance_app.perf import init_perf
+from attendance_app.pagination import page_url
+from attendance_app.views import register_blueprints
+
+# Application factory.
+#
+# create_app() builds a configured app with every extension and blueprint
+# registered. Importing this module does no work beyond defining things: no
+# directories are created and Pillow and fpdf are only imported by the code
+# that uses them (images.py, the PDF export jobs), so a worker boots without
+# paying for either. scripts/check_import_time.py keeps an eye on that.
+
+MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max file size
+
+csrf = CSRFProtect()
+login_manager = LoginManager()
+login_manager.login_view = 'auth.login'
+login_manager.login_message = 'Please log in to access this page.'
+
+@login_manager.user_loader
+def load_user(user_id):
+    return load_principal(int(user_id))
+
+def create_app(config=None):
+    """Create the app; config is a mapping applied over the defaults and ProductionConfig"""
+    app = Flask(__name__)
+    os.makedirs(app.instance_path, exist_ok=True)
+    app.config.from_mapping(
+        SECRET_KEY='a-very-secret-key-for-dev',
+        SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', 'sqlite:///' + os.path.join(app.instance_path, 'attendance.db')),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        WTF_CSRF_ENABLED=True,
+        DEBUG=True,
+        UPLOAD_FOLDER='static/uploads',
+        MAX_CONTENT_LENGTH=MAX_CONTENT_LENGTH,
+    )
+    # Production settings, including the SQLite tuning profile and pool options
+    if os.environ.get('FLASK_ENV') == 'production':
+        from attendance_app.production_config import ProductionConfig
+        app.config.from_object(ProductionConfig)
+    if config:
+        app.config.from_mapping(config)
+
+    logging.basicConfig(level=logging.INFO)
+
+    db.init_app(app)
+    init_db_profile(app, db)
+    csrf.init_app(app)
+    login_manager.init_app(app)
+    init_passwords(app)
+    init_principal(app)
+    init_query_counter(app)
+    init_dashboard_cache(app)
+    init_attendance_summary(app)
+    init_notifications(app)
+    init_job_runner(app)
+    init_image_pipeline(app)
+    init_perf(app)
+    app.add_template_global(page_url)
+
+    register_blueprints(app)
+    return app
@@ -0,0 +1,144 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app, url_for
+from attendance_app.upload_store import store_blob, release_blob
+
+logger = logging.getLogger(__name__)
+
+# Image upload pipeline for profile pictures and company logos.
+#
+# An upload is read into memory once and checked there with verify(), so a
+# bad file is rejected without ever touching the disk. The original goes into
+# the content-addressed store (upload_store.py) and the request returns; the
+# pre-sized renditions (avatar, thumb, full) are made from the same bytes on a
+# small thread pool and saved as <name>-<rendition>.webp (JPEG when Pillow has
+# no WebP support). A re-upload of a stored image reuses its renditions.
+#
+# Only the original filename is stored on the model. image_url() picks the
+# rendition a template asks for once it is on disk and falls back to the
+# original until then, so nothing breaks while the worker is still busy or
+# for uploads made before the pipeline existed.
+#
+# Pillow is imported on first use rather than with the app, since most
+# workers never see an upload.
+
+IMAGE_WORKERS = 2
+
+RENDITIONS = {
+    'avatar': (96, 96),
+    'thumb': (320, 320),
+    'full': (1920, 1080),
+}
+
+@lru_cache(maxsize=None)
+def rendition_format():
+    """(format, extension, save options) for renditions: WebP when Pillow supports it, JPEG otherwise"""
+    from PIL import features
+    if features.check('webp'):
+        return 'WEBP', 'webp', {'quality': 82, 'method': 4}
+    return 'JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}
+
+def rendition_name(filename, rendition):
+    return f"{os.path.splitext(filename)[0]}-{rendition}.{rendition_format()[1]}"
+
+def read_image(file):
+    """The upload's bytes if they hold a valid image; raises ValueError otherwise"""
+    from PIL import Image
+    data = file.read()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.verify()
+    except Exception as e:
+        raise ValueError(f'Invalid image file: {e}')
+    return data
+
+def _prepare(img):
+    from PIL import Image, ImageOps
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+    img = img.convert('RGBA' if has_alpha else 'RGB')
+    if has_alpha and rendition_format()[0] == 'JPEG':
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel('A'))
+        return background
+    return img
+
+def make_renditions(folder, filename, data):
+    """Write every rendition of the image held in data next to the original"""
+    from PIL import Image
+    image_format, _, options = rendition_format()
+    with Image.open(io.BytesIO(data)) as source:
+        source.draft('RGB', RENDITIONS['full'])
+        img = _prepare(source)
+        # Largest first, so each smaller rendition is resampled from the one above
+        for rendition, size in sorted(RENDITIONS.items(), key=lambda item: -item[1][0] * item[1][1]):
+            if img.width > size[0] or img.height > size[1]:
+                img = img.copy()
+                img.thumbnail(size, Image.LANCZOS)
+            path = os.path.join(folder, rendition_name(filename, rendition))
+            img.save(path + '.part', format=image_format, **options)
+            os.replace(path + '.part', path)
+
+class ImageProcessor:
+    def __init__(self, workers=IMAGE_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image')
+        self._ready = set()
+        self._lock = threading.Lock()
+
+    def submit(self, folder, filename, data):
+        return self.executor.submit(self._run, folder, filename, data)
+
+    def _run(self, folder, filename, data):
+        try:
+            make_renditions(folder, filename, data)
+        except Exception as e:
+            logger.error(f"Image renditions failed for {filename}: {e}")
+
+    def has(self, folder, name):
+        # Renditions only ever appear, so a positive answer can be remembered
+        if name in self._ready:
+            return True
+        if os.path.exists(os.path.join(folder, name)):
+            with self._lock:
+                self._ready.add(name)
+            return True
+        return False
+
+    def forget(self, names):
+        with self._lock:
+            self._ready.difference_update(names)
+
+def _rendition_names(filename):
+    return [rendition_name(filename, rendition) for rendition in RENDITIONS]
+
+def save_image(file, folder, ext):
+    """Validate the upload in memory, store the original and queue its renditions. Returns the filename."""
+    data = read_image(file)
+    filename, created = store_blob(folder, data, ext)
+    if created or not all(os.path.exists(os.path.join(folder, name)) for name in _rendition_names(filename)):
+        current_app.extensions['image_processor'].submit(os.path.abspath(folder), filename, data)
+    return filename
+
+def delete_image(folder, filename):
+    """Release one reference; the original and renditions go with the last one"""
+    removed = release_blob(folder, filename, _rendition_names(filename))
+    if removed:
+        current_app.extensions['image_processor'].forget([filename, *_rendition_names(filename)])
+    return removed
+
+def image_url(filename, rendition='full'):
+    """URL of the requested rendition, or of the original until it has been made"""
+    if not filename:
+        return None
+    name = rendition_name(filename, rendition)
+    if current_app.extensions['image_processor'].has(current_app.config['UPLOAD_FOLDER'], name):
+        return url_for('uploads.uploaded_file', filename=name)
+    return url_for('uploads.uploaded_file', filename=filename)
+
+def init_image_pipeline(app):
+    app.extensions['image_processor'] = ImageProcessor(app.config.get('IMAGE_WORKERS', IMAGE_WORKERS))
+    app.add_template_global(image_url)
@@ -1,7 +1,9 @@
 import os
+import sys
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from models import db, User
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from attendance_app.models import db, User
 
 # Create Flask app
 app = Flask(__name__)
@@ -0,0 +1,255 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from attendance_app.models import db, Attendance, WorkReport, BillingRecord, ExportJob
+from attendance_app.exports import (EXPORT_BATCH_SIZE, iter_csv, work_report_export_rows, attendance_export_rows,
+                                    billing_export_rows,
+                                    WORK_REPORT_EXPORT_HEADER, ATTENDANCE_EXPORT_HEADER, BILLING_EXPORT_HEADER,
+                                    apply_attendance_filters, apply_work_report_filters)
+
+logger = logging.getLogger(__name__)
+
+# Background export jobs.
+#
+# Export requests are stored as ExportJob rows and run on a small thread pool
+# inside the web process, so the request that asks for a large PDF or CSV
+# returns straight away. A job is claimed with a conditional UPDATE before it
+# runs, which keeps a job from running twice when several worker processes
+# pick up leftover queued jobs after a restart. Progress is written to the
+# job row as it goes and the finished file is kept under instance/exports
+# until JOB_ARTIFACT_TTL_DAYS have passed.
+#
+# Recovery resubmits queued jobs and marks jobs still running after
+# JOB_TIMEOUT_MINUTES as failed: they were left behind by a worker that died
+# or was restarted, and the status page would otherwise poll them forever.
+# Building the app does no database I/O, so a runner recovers on a pool
+# thread ahead of the first job it is given; run
+# scripts/recover_export_jobs.py after a deploy to recover straight away.
+#
+# CSV handlers read EXPORT_BATCH_SIZE rows at a time by keyset (sort date,
+# id) and write each batch out before reading the next, with the progress
+# total from a COUNT. Every batch is read to the end, so no read cursor is
+# open while progress updates are committed. The PDF handlers load their
+# rows up front, as the whole document is built in memory anyway.
+# pdf_generator (and with it fpdf) is imported by the PDF handlers
+# themselves, so it is only loaded by a process that actually renders a PDF.
+
+JOB_WORKERS = 2
+JOB_ARTIFACT_TTL_DAYS = 7
+JOB_TIMEOUT_MINUTES = 30
+PROGRESS_STEP = 5
+
+EXPORT_JOBS = {}
+
+def export_job(kind, filename, admin_only=True):
+    def decorator(f):
+        EXPORT_JOBS[kind] = {'filename': filename, 'admin_only': admin_only, 'handler': f}
+        return f
+    return decorator
+
+class Progress:
+    """Commit the job's percentage every PROGRESS_STEP points"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.reported = 0
+
+    def __call__(self, done, total):
+        percent = min(99, int(done * 100 / total)) if total else 99
+        if percent - self.reported >= PROGRESS_STEP:
+            self.reported = percent
+            db.session.execute(update(ExportJob).where(ExportJob.id == self.job_id).values(progress=percent))
+            db.session.commit()
+
+def _export_batches(query, model, sort_column, export_rows):
+    """Yield lists of export rows, EXPORT_BATCH_SIZE at a time, newest first"""
+    ordered = query.order_by(sort_column.desc(), model.id.desc())
+    key = tuple_(sort_column, model.id)
+    last = None
+    while True:
+        page = ordered if last is None else ordered.filter(key < tuple_(*last))
+        keys = page.with_entities(sort_column, model.id).limit(EXPORT_BATCH_SIZE).all()
+        if not keys:
+            return
+        yield list(export_rows(ordered.filter(model.id.in_([row_id for _, row_id in keys]))))
+        last = tuple(keys[-1])
+
+def _write_csv(out, header, query, model, sort_column, export_rows, progress):
+    total = query.order_by(None).count()
+    rows = (row for batch in _export_batches(query, model, sort_column, export_rows) for row in batch)
+    for i, chunk in enumerate(iter_csv(header, rows)):
+        out.write(chunk.encode('utf-8'))
+        progress(min((i + 1) * EXPORT_BATCH_SIZE, total), total)
+
+@export_job('attendance_csv', 'attendance.csv', admin_only=False)
+def attendance_csv(params, out, progress):
+    query = apply_attendance_filters(Attendance.query, params)
+    _write_csv(out, ATTENDANCE_EXPORT_HEADER, query, Attendance, Attendance.date, attendance_export_rows, progress)
+
+@export_job('attendance_pdf', 'attendance_report.pdf', admin_only=False)
+def attendance_pdf(params, out, progress):
+    query = apply_attendance_filters(Attendance.query, params).order_by(Attendance.date.desc(), Attendance.id.desc())
+    rows = list(attendance_export_rows(query))
+    db.session.commit()
+    from attendance_app.pdf_generator import generate_attendance_pdf
+    out.write(generate_attendance_pdf(rows, progress))
+
+@export_job('work_reports_csv', 'work_reports.csv')
+def work_reports_csv(params, out, progress):
+    query = apply_work_report_filters(WorkReport.query, params)
+    _write_csv(out, WORK_REPORT_EXPORT_HEADER, query, WorkReport, WorkReport.date, work_report_export_rows, progress)
+
+@export_job('work_reports_pdf', 'work_reports.pdf')
+def work_reports_pdf(params, out, progress):
+    query = apply_work_report_filters(WorkReport.query, params).order_by(WorkReport.date.desc(), WorkReport.id.desc())
+    rows = list(work_report_export_rows(query))
+    db.session.commit()
+    from attendance_app.pdf_generator import generate_work_report_pdf
+    out.write(generate_work_report_pdf(rows, progress))
+
+@export_job('billing_csv', 'billing_records.csv')
+def billing_csv(params, out, progress):
+    _write_csv(out, BILLING_EXPORT_HEADER, BillingRecord.query, BillingRecord, BillingRecord.period_start,
+               billing_export_rows, progress)
+
+@export_job('billing_pdf', 'billing_records.pdf')
+def billing_pdf(params, out, progress):
+    rows = list(billing_export_rows(BillingRecord.query.order_by(BillingRecord.period_start.desc(), BillingRecord.id.desc())))
+    db.session.commit()
+    from attendance_app.pdf_generator import generate_billing_pdf
+    out.write(generate_billing_pdf(rows, progress))
+
+def artifact_dir(app):
+    return os.path.join(app.instance_path, 'exports')
+
+def artifact_path(app, job):
+    return os.path.join(artifact_dir(app), f"{job.id}{os.path.splitext(job.filename)[1]}")
+
+class JobRunner:
+    def __init__(self, app, workers=JOB_WORKERS):
+        self.app = app
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export-job')
+        self._recovered = False
+        self._lock = threading.Lock()
+
+    def submit(self, job_id):
+        with self._lock:
+            first, self._recovered = not self._recovered, True
+        if first:
+            self.executor.submit(self._recover)
+        self.executor.submit(self._run, job_id)
+
+    def recover(self):
+        """Fail jobs left running by a dead worker and resubmit queued ones. Returns (failed, resubmitted)."""
+        cutoff = datetime.utcnow() - timedelta(minutes=self.app.config.get('JOB_TIMEOUT_MINUTES', JOB_TIMEOUT_MINUTES))
+        stale = db.session.execute(
+            update(ExportJob)
+            .where(ExportJob.status == 'running', ExportJob.started_at < cutoff)
+            .values(status='failed', error='The export was interrupted. Please request it again.',
+                    finished_at=datetime.utcnow())
+        )
+        db.session.commit()
+        queued = db.session.execute(db.select(ExportJob.id).filter_by(status='queued')).scalars().all()
+        if stale.rowcount:
+            logger.warning(f"Marked {stale.rowcount} interrupted export job(s) as failed")
+        for job_id in queued:
+            # Submitted directly: a job already running elsewhere loses the claim and is skipped
+            self.executor.submit(self._run, job_id)
+        return stale.rowcount, len(queued)
+
+    def _recover(self):
+        with self.app.app_context():
+            try:
+                self.recover()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                logger.error(f"Export job recovery failed: {e}")
+            finally:
+                db.session.remove()
+
+    def _claim(self, job_id):
+        result = db.session.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.status == 'queued')
+            .values(status='running', started_at=datetime.utcnow())
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _finish(self, job_id, **values):
+        db.session.rollback()
+        db.session.execute(update(ExportJob).where(ExportJob.id == job_id).values(finished_at=datetime.utcnow(), **values))
+        db.session.commit()
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            path = None
+            try:
+                if not self._claim(job_id):
+                    return
+                job = db.session.get(ExportJob, job_id)
+                spec = EXPORT_JOBS[job.kind]
+                path = artifact_path(self.app, job)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + '.part', 'wb') as out:
+                    spec['handler'](json.loads(job.params), out, Progress(job_id))
+                os.replace(path + '.part', path)
+                self._finish(job_id, status='done', progress=100)
+            except Exception as e:
+                logger.error(f"Export job {job_id} failed: {e}")
+                if path and os.path.exists(path + '.part'):
+                    os.remove(path + '.part')
+                self._finish(job_id, status='failed', error=str(e))
+            finally:
+                db.session.remove()
+
+EXPORT_FILTER_FIELDS = ('start_date', 'end_date', 'employee_id', 'project_id')
+
+def export_params(form):
+    """The export filters from a submitted form; raises ValueError on a malformed value"""
+    params = {name: form.get(name) for name in EXPORT_FILTER_FIELDS if form.get(name)}
+    for name in ('start_date', 'end_date'):
+        if name in params:
+            datetime.strptime(params[name], '%Y-%m-%d')
+    for name in ('employee_id', 'project_id'):
+        if name in params:
+            int(params[name])
+    return params
+
+def create_export_job(kind, user_id, params):
+    """Store a queued job and hand it to the runner. Returns the job."""
+    runner = current_app.extensions['job_runner']
+    purge_expired_jobs(current_app)
+
+    job = ExportJob(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        kind=kind,
+        params=json.dumps(params),
+        filename=EXPORT_JOBS[kind]['filename'],
+    )
+    db.session.add(job)
+    db.session.commit()
+    runner.submit(job.id)
+    return job
+
+def purge_expired_jobs(app):
+    cutoff = datetime.utcnow() - timedelta(days=app.config.get('JOB_ARTIFACT_TTL_DAYS', JOB_ARTIFACT_TTL_DAYS))
+    expired = ExportJob.query.filter(ExportJob.created_at < cutoff, ExportJob.status.in_(['done', 'failed'])).all()
+    for job in expired:
+        path = artifact_path(app, job)
+        if os.path.exists(path):
+            os.remove(path)
+        db.session.delete(job)
+    if expired:
+        db.session.commit()
+
+def init_job_runner(app):
+    app.extensions['job_runner'] = JobRunner(app, app.config.get('JOB_WORKERS', JOB_WORKERS))
@@ -0,0 +1,99 @@
+import json
+from sqlalchemy import delete, select
+from attendance_app.models import db, ProjectJournal, JournalObject
+from attendance_app.query_options import journal_lookup_options
+
+# Journal object index.
+#
+# ProjectJournal.object_ids is a comma-separated list ("TASK-101, TASK-102")
+# and status is either one word for all of them or a JSON object with a status
+# per object ({"TASK-101": "finished", "TASK-102": "error"}). Answering "which
+# entries touched TASK-101" or "which objects errored in this project last
+# week" from those columns means a LIKE scan over every entry, so each entry
+# also gets one journal_object row per object with the entry's project and
+# date and that object's status. add_journal_entry writes the rows with the
+# entry (ProjectJournal.objects); index_journal_entries() rebuilds them for
+# entries written with Core statements or before the table existed.
+
+OBJECT_ID_LENGTH = 100
+STATUS_LENGTH = 50
+INDEX_BATCH_SIZE = 5000
+
+journal = ProjectJournal.__table__
+journal_object = JournalObject.__table__
+
+def split_object_ids(object_ids):
+    """The distinct object ids of a comma-separated list, in order"""
+    ids = []
+    for object_id in (object_ids or '').split(','):
+        object_id = object_id.strip()[:OBJECT_ID_LENGTH]
+        if object_id and object_id not in ids:
+            ids.append(object_id)
+    return ids
+
+def normalize_status(status):
+    return str(status).strip().lower()[:STATUS_LENGTH] or 'unknown'
+
+def object_statuses(object_ids, status):
+    """[(object id, status)] for one journal entry"""
+    ids = split_object_ids(object_ids)
+    try:
+        per_object = json.loads(status)
+    except (TypeError, ValueError):
+        per_object = None
+    if isinstance(per_object, str):
+        status = per_object
+    if not isinstance(per_object, dict):
+        return [(object_id, normalize_status(status or '')) for object_id in ids]
+    per_object = {str(key).strip()[:OBJECT_ID_LENGTH]: value for key, value in per_object.items()}
+    # Objects only named in the status mapping count as touched too
+    ids += [object_id for object_id in per_object if object_id and object_id not in ids]
+    return [(object_id, normalize_status(per_object.get(object_id, ''))) for object_id in ids]
+
+def journal_objects(entry):
+    """JournalObject rows for a ProjectJournal entry"""
+    return [JournalObject(object_id=object_id, project_id=entry.project_id, date=entry.date, status=status)
+            for object_id, status in object_statuses(entry.object_ids, entry.status)]
+
+def index_journal_entries(conn, journal_ids=None, batch_size=INDEX_BATCH_SIZE):
+    """Rewrite the index rows of these entries, or of every entry when journal_ids is None. Returns rows written."""
+    query = select(journal.c.id, journal.c.project_id, journal.c.date, journal.c.object_ids, journal.c.status)
+    if journal_ids is None:
+        conn.execute(delete(journal_object))
+    else:
+        journal_ids = list(journal_ids)
+        conn.execute(delete(journal_object).where(journal_object.c.journal_id.in_(journal_ids)))
+        query = query.where(journal.c.id.in_(journal_ids))
+
+    written = 0
+    batch = []
+    for journal_id, project_id, day, object_ids, status in conn.execute(query.execution_options(yield_per=batch_size)):
+        batch.extend({'journal_id': journal_id, 'object_id': object_id, 'project_id': project_id, 'date': day,
+                      'status': object_status} for object_id, object_status in object_statuses(object_ids, status))
+        if len(batch) >= batch_size:
+            conn.execute(journal_object.insert(), batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        conn.execute(journal_object.insert(), batch)
+        written += len(batch)
+    return written
+
+def object_history(object_id, employee_id=None, limit=200):
+    """[(entry, status)] for the journal entries that touched an object, newest first"""
+    query = db.session.query(ProjectJournal, JournalObject.status) \
+        .join(JournalObject, JournalObject.journal_id == ProjectJournal.id) \
+        .filter(JournalObject.object_id == object_id).options(*journal_lookup_options())
+    if employee_id is not None:
+        query = query.filter(ProjectJournal.employee_id == employee_id)
+    return query.order_by(JournalObject.date.desc(), ProjectJournal.id.desc()).limit(limit).all()
+
+def project_objects(project_id, start, end, status='error', employee_id=None, limit=1000):
+    """[(object id, entry)] for objects with this status in a project between start and end inclusive, newest first"""
+    query = db.session.query(JournalObject.object_id, ProjectJournal) \
+        .join(ProjectJournal, ProjectJournal.id == JournalObject.journal_id) \
+        .filter(JournalObject.project_id == project_id, JournalObject.status == normalize_status(status),
+                JournalObject.date >= start, JournalObject.date <= end).options(*journal_lookup_options())
+    if employee_id is not None:
+        query = query.filter(ProjectJournal.employee_id == employee_id)
+    return query.order_by(JournalObject.date.desc(), JournalObject.object_id).limit(limit).all()
@@ -0,0 +1,182 @@
+import json
+from datetime import datetime
+from sqlalchemy import select, tuple_
+from attendance_app.models import db, Employee, Project, ProjectJournal, JournalObject
+from attendance_app.journal_index import object_statuses
+
+# Bulk journal ingestion.
+#
+# /api/journal-entries takes a day's journal in one request (hundreds of
+# entries from a tracker export, or the single entry DailyJournalForm.jsx
+# posts) in the component's JSON shape:
+#
+#   {"date": "2026-10-16", "employeeId": 3, "projectId": 1, "objectIds": ["TASK-101", "TASK-102"],
+#    "taskType": "Indexing", "hoursSpent": 2.5, "comments": "",
+#    "statusPerObject": [{"objectId": "TASK-101", "status": "finished"}, ...]}
+#
+# ("status": "finished" instead of statusPerObject applies to every object).
+# Each row is validated on its own, then the whole batch is checked with one
+# query each for known employees, active projects and existing entries for
+# the same (employee_id, project_id, date), which add_journal_entry refuses
+# too. Valid rows are inserted with one executemany for the entries and one
+# for their journal object index rows (the new ids are read back by those same
+# keys); invalid rows are reported by position and do not stop the rest.
+
+MAX_BULK_ENTRIES = 1000
+JOURNAL_STATUSES = ('finished', 'pending', 'error')
+
+def _object_ids(value):
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        return None
+    ids = []
+    for object_id in value:
+        object_id = str(object_id).strip()
+        if object_id and object_id not in ids:
+            ids.append(object_id)
+    return ids
+
+def _status(data, ids, errors):
+    """The stored status: one word when every object has it, else a JSON object of object id -> status"""
+    per_object = data.get('statusPerObject')
+    if per_object is None:
+        status = data.get('status')
+        if status not in JOURNAL_STATUSES:
+            errors['status'] = f"Must be one of {', '.join(JOURNAL_STATUSES)}"
+        return status
+    if not isinstance(per_object, list):
+        errors['statusPerObject'] = 'Must be a list of {objectId, status}'
+        return None
+    statuses = {}
+    for item in per_object:
+        if not isinstance(item, dict) or str(item.get('objectId', '')).strip() not in ids:
+            errors['statusPerObject'] = 'Every objectId must be one of objectIds'
+            return None
+        if item.get('status') not in JOURNAL_STATUSES:
+            errors['statusPerObject'] = f"Status must be one of {', '.join(JOURNAL_STATUSES)}"
+            return None
+        statuses[str(item['objectId']).strip()] = item['status']
+    # Objects left out are still pending, as the form starts them
+    statuses = {object_id: statuses.get(object_id, 'pending') for object_id in ids}
+    if len(set(statuses.values())) == 1:
+        return next(iter(statuses.values()))
+    return json.dumps(statuses)
+
+def parse_journal_entry(data, employee_id=None):
+    """(row, errors) for one posted entry. employee_id is the poster's own id, None for admins."""
+    if not isinstance(data, dict):
+        return None, {'entry': 'Must be an object'}
+    errors = {}
+    row = {}
+
+    try:
+        row['date'] = datetime.strptime(str(data.get('date')), '%Y-%m-%d').date()
+    except ValueError:
+        errors['date'] = 'Must be YYYY-MM-DD'
+
+    for field, key in (('employeeId', 'employee_id'), ('projectId', 'project_id')):
+        value = data.get(field)
+        try:
+            row[key] = int(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            errors[field] = 'Must be an id'
+    if employee_id is not None:
+        if row.get('employee_id') not in (None, employee_id):
+            errors['employeeId'] = 'You can only add your own journal entries'
+        row['employee_id'] = employee_id
+    elif 'employeeId' not in errors and row.get('employee_id') is None:
+        errors['employeeId'] = 'Required'
+    if 'projectId' not in errors and row.get('project_id') is None:
+        errors['projectId'] = 'Required'
+
+    ids = _object_ids(data.get('objectIds'))
+    if not ids:
+        errors['objectIds'] = 'At least one object id is required'
+    else:
+        row['object_ids'] = ', '.join(ids)
+        if len(row['object_ids']) > ProjectJournal.object_ids.type.length:
+            errors['objectIds'] = 'Too many object ids for one entry'
+        row['status'] = _status(data, ids, errors)
+
+    task_type = str(data.get('taskType') or '').strip()
+    if not 2 <= len(task_type) <= 100:
+        errors['taskType'] = 'Must be 2 to 100 characters'
+    row['task_type'] = task_type
+
+    try:
+        row['hours_spent'] = float(data.get('hoursSpent'))
+        if not 0 <= row['hours_spent'] <= 24:
+            errors['hoursSpent'] = 'Must be between 0 and 24'
+    except (TypeError, ValueError):
+        errors['hoursSpent'] = 'Must be a number'
+
+    comments = data.get('comments') or None
+    if comments is not None and len(str(comments)) > 1000:
+        errors['comments'] = 'At most 1000 characters'
+    row['comments'] = str(comments) if comments is not None else None
+    return row, errors
+
+def ingest_journal_entries(items, employee_id=None):
+    """Validate and insert a batch. Returns (created [(index, id)], errors [{index, errors}]); the caller commits."""
+    parsed = [parse_journal_entry(item, employee_id) for item in items]
+    valid = [(i, row) for i, (row, errors) in enumerate(parsed) if not errors]
+    failed = {i: errors for i, (row, errors) in enumerate(parsed) if errors}
+
+    if valid:
+        employee_ids = {row['employee_id'] for _, row in valid}
+        project_ids = {row['project_id'] for _, row in valid}
+        keys = {(row['employee_id'], row['project_id'], row['date']) for _, row in valid}
+        known_employees = set(db.session.execute(select(Employee.id).where(Employee.id.in_(employee_ids))).scalars())
+        active_projects = set(db.session.execute(
+            select(Project.id).where(Project.id.in_(project_ids), Project.status == 'active')).scalars())
+        existing = set(db.session.execute(
+            select(ProjectJournal.employee_id, ProjectJournal.project_id, ProjectJournal.date)
+            .where(tuple_(ProjectJournal.employee_id, ProjectJournal.project_id, ProjectJournal.date).in_(keys))
+        ).tuples())
+
+        accepted = []
+        seen = set()
+        for i, row in valid:
+            key = (row['employee_id'], row['project_id'], row['date'])
+            if row['employee_id'] not in known_employees:
+                failed[i] = {'employeeId': 'Unknown employee'}
+            elif row['project_id'] not in active_projects:
+                failed[i] = {'projectId': 'Unknown or inactive project'}
+            elif key in existing:
+                failed[i] = {'entry': 'Journal entry for this project and date already exists'}
+            elif key in seen:
+                failed[i] = {'entry': 'Duplicate of an earlier entry in this batch'}
+            else:
+                seen.add(key)
+                accepted.append((i, row))
+        valid = accepted
+
+    created = []
+    if valid:
+        now = datetime.utcnow()
+        db.session.execute(ProjectJournal.__table__.insert(), [dict(row, created_at=now) for _, row in valid])
+        # The keys were just checked to be new and distinct, so they find exactly the inserted rows
+        inserted = {tuple(key): journal_id for journal_id, *key in db.session.execute(
+            select(ProjectJournal.id, ProjectJournal.employee_id, ProjectJournal.project_id, ProjectJournal.date)
+            .where(tuple_(ProjectJournal.employee_id, ProjectJournal.project_id, ProjectJournal.date).in_(seen))
+        )}
+        ids = [inserted[(row['employee_id'], row['project_id'], row['date'])] for _, row in valid]
+        db.session.execute(JournalObject.__table__.insert(), [
+            {'journal_id': journal_id, 'object_id': object_id, 'project_id': row['project_id'], 'date': row['date'],
+             'status': status}
+            for journal_id, (_, row) in zip(ids, valid)
+            for object_id, status in object_statuses(row['object_ids'], row['status'])
+        ])
+        created = [(i, journal_id) for journal_id, (i, _) in zip(ids, valid)]
+    return created, [{'index': i, 'errors': failed[i]} for i in sorted(failed)]
+
+def journal_entry_json(entry):
+    """An entry in the shape DailyJournalForm.jsx reads"""
+    statuses = object_statuses(entry.object_ids, entry.status)
+    return {
+        'id': entry.id, 'date': entry.date.isoformat(), 'employeeId': entry.employee_id,
+        'projectId': entry.project_id, 'objectIds': [object_id for object_id, _ in statuses],
+        'taskType': entry.task_type, 'hoursSpent': entry.hours_spent, 'comments': entry.comments,
+        'statusPerObject': [{'objectId': object_id, 'status': status} for object_id, status in statuses],
+    }
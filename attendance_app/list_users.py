@@ -1,4 +1,8 @@
-from app import app, db, User
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from attendance_app.app import app
+from attendance_app.models import User
 
 with app.app_context():
     users = User.query.all()
@@ -0,0 +1,70 @@
+from datetime import datetime
+from sqlalchemy import false, func, insert, literal, or_, select
+from attendance_app.models import db, Employee, InternalMessage, MessageRecipient
+
+# Internal messages.
+#
+# A direct message is one InternalMessage row carrying its own recipient_id and
+# read state. A broadcast is stored once (recipient_id None, is_broadcast set)
+# and every recipient gets a small MessageRecipient row for delivery and read
+# state, written with a single INSERT ... SELECT.
+
+def send_broadcast(sender_id, subject, content, attachment_filename=None):
+    """Store one broadcast to every employee. The caller commits."""
+    message = InternalMessage(
+        sender_id=sender_id,
+        subject=subject,
+        content=content,
+        is_broadcast=True,
+        attachment_filename=attachment_filename,
+    )
+    db.session.add(message)
+    db.session.flush()
+    db.session.execute(
+        insert(MessageRecipient).from_select(
+            ['message_id', 'user_id', 'is_read'],
+            select(literal(message.id), Employee.user_id, false()).where(Employee.user_id.isnot(None)).distinct(),
+        )
+    )
+    return message
+
+def received_messages_filter(user_id):
+    """WHERE clause for the messages ``user_id`` received, direct or broadcast"""
+    return or_(
+        InternalMessage.recipient_id == user_id,
+        InternalMessage.id.in_(select(MessageRecipient.message_id).where(MessageRecipient.user_id == user_id)),
+    )
+
+def broadcast_read_states(user_id, messages):
+    """{message_id: is_read} for the broadcasts among ``messages``"""
+    ids = [m.id for m in messages if m.is_broadcast]
+    if not ids:
+        return {}
+    rows = db.session.query(MessageRecipient.message_id, MessageRecipient.is_read).filter(
+        MessageRecipient.user_id == user_id, MessageRecipient.message_id.in_(ids)
+    )
+    return dict(rows)
+
+def is_recipient(message, user_id):
+    if message.recipient_id == user_id:
+        return True
+    return message.is_broadcast and db.session.get(MessageRecipient, (message.id, user_id)) is not None
+
+def mark_read(message, user_id):
+    """Mark ``message`` read for ``user_id``. Returns True if anything changed; the caller commits."""
+    if message.is_broadcast:
+        state = db.session.get(MessageRecipient, (message.id, user_id))
+    else:
+        state = message if message.recipient_id == user_id else None
+    if state is None or state.is_read:
+        return False
+    state.is_read = True
+    state.read_at = datetime.utcnow()
+    return True
+
+def unread_count(user_id):
+    direct = select(func.count()).select_from(InternalMessage).where(
+        InternalMessage.recipient_id == user_id, InternalMessage.is_read == false())
+    broadcast = select(func.count()).select_from(MessageRecipient).where(
+        MessageRecipient.user_id == user_id, MessageRecipient.is_read == false())
+    return db.session.execute(select(direct.scalar_subquery() + broadcast.scalar_subquery())).scalar()
@@ -0,0 +1,237 @@
+import logging
+from sqlalchemy import inspect, text
+from attendance_app.models import db, SchemaMigration
+
+logger = logging.getLogger(__name__)
+
+# Schema migrations for existing databases.
+#
+# db.create_all() only creates missing tables and never alters existing ones,
+# so changes to existing tables are applied here in place instead of dropping
+# and recreating the database. Every migration is written to be a no-op on a
+# database that db.create_all() already built from the current models, which
+# keeps `create_all()` followed by `upgrade()` correct for new and old
+# databases alike. Applied versions are recorded in schema_migrations.
+
+MIGRATIONS = []
+
+def migration(version, description):
+    def decorator(f):
+        MIGRATIONS.append((version, description, f))
+        return f
+    return decorator
+
+# Migrations spell out their DDL instead of reading it from the models, so
+# they keep doing the same thing after the models move on.
+
+def _create_index(conn, name, table, columns, unique=False):
+    unique_sql = 'UNIQUE ' if unique else ''
+    conn.execute(text(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+def _drop_index(conn, name):
+    conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+def _add_column(conn, table, column, ddl):
+    if column not in {c['name'] for c in inspect(conn).get_columns(table)}:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+@migration(1, 'Composite indexes for hot filter columns')
+def add_hot_path_indexes(conn):
+    _create_index(conn, 'ix_attendance_employee_date', 'attendance', ['employee_id', 'date'])
+    _create_index(conn, 'ix_work_report_employee_date', 'work_report', ['employee_id', 'date'])
+    _create_index(conn, 'ix_work_report_project_date', 'work_report', ['project_id', 'date'])
+    _create_index(conn, 'ix_leave_request_status_created', 'leave_request', ['status', 'created_at'])
+    _create_index(conn, 'ix_internal_message_recipient_read', 'internal_message', ['recipient_id', 'is_read'])
+    _create_index(conn, 'ix_project_journal_employee_project_date', 'project_journal', ['employee_id', 'project_id', 'date'])
+
+def _merge_duplicate_attendance(conn):
+    """Fold each employee's duplicate rows for a day into the oldest one.
+
+    The kept row gets the earliest clock in, the latest clock out, the summed
+    breaks, every row's notes and the first project set; the others are
+    deleted. Each merged day is logged, so nothing disappears unannounced.
+    """
+    groups = conn.execute(text("""
+        SELECT employee_id, date FROM attendance
+        GROUP BY employee_id, date HAVING COUNT(*) > 1
+    """)).all()
+    for employee_id, day in groups:
+        rows = conn.execute(text("""
+            SELECT id, clock_in, clock_out, project_id, break_duration, notes FROM attendance
+            WHERE employee_id = :employee_id AND date = :date ORDER BY id
+        """), {'employee_id': employee_id, 'date': day}).all()
+        clock_ins = [row.clock_in for row in rows if row.clock_in is not None]
+        clock_outs = [row.clock_out for row in rows if row.clock_out is not None]
+        projects = [row.project_id for row in rows if row.project_id is not None]
+        notes = [row.notes.strip() for row in rows if row.notes and row.notes.strip()]
+        conn.execute(text("""
+            UPDATE attendance SET clock_in = :clock_in, clock_out = :clock_out, project_id = :project_id,
+                break_duration = :break_duration, notes = :notes
+            WHERE id = :id
+        """), {
+            'id': rows[0].id,
+            'clock_in': min(clock_ins) if clock_ins else None,
+            'clock_out': max(clock_outs) if clock_outs else None,
+            'project_id': projects[0] if projects else None,
+            'break_duration': sum(row.break_duration or 0 for row in rows),
+            'notes': '\n'.join(notes) or None,
+        })
+        conn.execute(text("DELETE FROM attendance WHERE employee_id = :employee_id AND date = :date AND id != :id"),
+                     {'employee_id': employee_id, 'date': day, 'id': rows[0].id})
+        logger.warning(f"Merged {len(rows)} attendance rows of employee {employee_id} on {day} "
+                       f"into row {rows[0].id} (removed ids {', '.join(str(row.id) for row in rows[1:])})")
+
+@migration(2, 'One attendance row per employee per day; break and notes columns')
+def unique_attendance_per_day(conn):
+    _add_column(conn, 'attendance', 'break_duration', 'INTEGER DEFAULT 0')
+    _add_column(conn, 'attendance', 'notes', 'TEXT')
+
+    _merge_duplicate_attendance(conn)
+
+    # The unique index also serves every (employee_id, date) lookup the old one did
+    _create_index(conn, 'uq_attendance_employee_date', 'attendance', ['employee_id', 'date'], unique=True)
+    _drop_index(conn, 'ix_attendance_employee_date')
+
+@migration(3, 'Per-recipient state table for broadcast messages')
+def add_message_recipient(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS message_recipient (
+            message_id INTEGER NOT NULL REFERENCES internal_message (id),
+            user_id INTEGER NOT NULL REFERENCES "user" (id),
+            is_read BOOLEAN NOT NULL DEFAULT 0,
+            read_at DATETIME,
+            PRIMARY KEY (message_id, user_id)
+        )
+    """))
+    _create_index(conn, 'ix_message_recipient_user_read', 'message_recipient', ['user_id', 'is_read'])
+
+@migration(4, 'Leave type, calendar range indexes and updated_at for the calendar feed')
+def calendar_feed_columns(conn):
+    _add_column(conn, 'leave_request', 'leave_type', "VARCHAR(50) NOT NULL DEFAULT 'personal'")
+    # SQLite can't add a column with a CURRENT_TIMESTAMP default; start from created_at
+    for table in ('company_event', 'leave_request', 'project'):
+        _add_column(conn, table, 'updated_at', 'DATETIME')
+        conn.execute(text(f"UPDATE {table} SET updated_at = created_at WHERE updated_at IS NULL"))
+    _create_index(conn, 'ix_company_event_date', 'company_event', ['event_date'])
+    _create_index(conn, 'ix_leave_request_dates', 'leave_request', ['start_date', 'end_date'])
+    _create_index(conn, 'ix_project_start_date', 'project', ['start_date'])
+
+@migration(5, 'Background export job table')
+def add_export_job(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS export_job (
+            id VARCHAR(32) NOT NULL PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES "user" (id),
+            kind VARCHAR(50) NOT NULL,
+            params TEXT NOT NULL DEFAULT '{}',
+            status VARCHAR(20) NOT NULL DEFAULT 'queued',
+            progress INTEGER NOT NULL DEFAULT 0,
+            filename VARCHAR(100) NOT NULL,
+            error TEXT,
+            created_at DATETIME,
+            started_at DATETIME,
+            finished_at DATETIME
+        )
+    """))
+    _create_index(conn, 'ix_export_job_user_created', 'export_job', ['user_id', 'created_at'])
+    _create_index(conn, 'ix_export_job_status', 'export_job', ['status'])
+
+@migration(6, 'Reference counts for content-addressed uploads')
+def add_upload_blob(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS upload_blob (
+            filename VARCHAR(100) NOT NULL PRIMARY KEY,
+            refcount INTEGER NOT NULL DEFAULT 0,
+            size INTEGER,
+            created_at DATETIME
+        )
+    """))
+    # Count the references to files uploaded before the store existed
+    references = [('employee', 'profile_picture')]
+    if 'logo' in {c['name'] for c in inspect(conn).get_columns('company')}:
+        references.append(('company', 'logo'))
+    for table, column in references:
+        conn.execute(text(f"""
+            INSERT INTO upload_blob (filename, refcount)
+            SELECT {column}, COUNT(*) FROM {table}
+            WHERE {column} IS NOT NULL AND {column} <> ''
+              AND {column} NOT IN (SELECT filename FROM upload_blob)
+            GROUP BY {column}
+        """))
+
+@migration(7, 'Daily attendance summary table')
+def add_attendance_day(conn):
+    from attendance_app.attendance_summary import rebuild_attendance_history
+    # Kept current by the clock in/out paths from here on
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS attendance_day (
+            employee_id INTEGER NOT NULL REFERENCES employee (id),
+            date DATE NOT NULL,
+            project_id INTEGER REFERENCES project (id),
+            worked_minutes INTEGER NOT NULL DEFAULT 0,
+            break_minutes INTEGER NOT NULL DEFAULT 0,
+            is_late BOOLEAN NOT NULL DEFAULT 0,
+            is_absent BOOLEAN NOT NULL DEFAULT 0,
+            PRIMARY KEY (employee_id, date)
+        )
+    """))
+    _create_index(conn, 'ix_attendance_day_date', 'attendance_day', ['date'])
+    # Summarise the attendance recorded before the table existed
+    rebuild_attendance_history(conn)
+
+@migration(8, 'Journal object index')
+def add_journal_object(conn):
+    from attendance_app.journal_index import index_journal_entries
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS journal_object (
+            journal_id INTEGER NOT NULL REFERENCES project_journal (id) ON DELETE CASCADE,
+            object_id VARCHAR(100) NOT NULL,
+            project_id INTEGER NOT NULL REFERENCES project (id),
+            date DATE NOT NULL,
+            status VARCHAR(50) NOT NULL,
+            PRIMARY KEY (journal_id, object_id)
+        )
+    """))
+    _create_index(conn, 'ix_journal_object_object_date', 'journal_object', ['object_id', 'date'])
+    _create_index(conn, 'ix_journal_object_project_status_date', 'journal_object', ['project_id', 'status', 'date'])
+    # Index the entries written before the table existed
+    index_journal_entries(conn)
+
+@migration(9, 'Work report approval status and review audit table')
+def work_report_approval(conn):
+    _add_column(conn, 'work_report', 'approval_status', "VARCHAR(20) NOT NULL DEFAULT 'pending'")
+    _add_column(conn, 'work_report', 'reviewed_by', 'INTEGER REFERENCES user (id)')
+    _add_column(conn, 'work_report', 'reviewed_at', 'DATETIME')
+    _create_index(conn, 'ix_work_report_approval_date', 'work_report', ['approval_status', 'date'])
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS work_report_review (
+            id INTEGER NOT NULL PRIMARY KEY,
+            action VARCHAR(20) NOT NULL,
+            reviewer_id INTEGER NOT NULL REFERENCES user (id),
+            report_ids TEXT NOT NULL,
+            requested INTEGER NOT NULL,
+            updated INTEGER NOT NULL,
+            created_at DATETIME NOT NULL
+        )
+    """))
+    _create_index(conn, 'ix_work_report_review_created', 'work_report_review', ['created_at'])
+
+@migration(10, 'Principal version on user')
+def add_principal_version(conn):
+    _add_column(conn, 'user', 'principal_version', 'INTEGER NOT NULL DEFAULT 0')
+
+def pending_migrations():
+    applied = {row.version for row in SchemaMigration.query.all()}
+    return [m for m in sorted(MIGRATIONS, key=lambda m: m[0]) if m[0] not in applied]
+
+def upgrade():
+    """Create missing tables, then apply pending migrations in order. Must run in an app context."""
+    db.create_all()
+    applied = []
+    for version, description, apply in pending_migrations():
+        logger.info(f"Applying migration {version}: {description}")
+        with db.engine.begin() as conn:
+            apply(conn)
+            conn.execute(SchemaMigration.__table__.insert().values(version=version, description=description))
+        applied.append(version)
+    return applied
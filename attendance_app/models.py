@@ -1,30 +1,6 @@
-
-from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_login import UserMixin
-
-db = SQLAlchemy()
-
-# ...existing code...
-
-# Project Journal Entry Model (correct placement)
-class ProjectJournal(db.Model):
-    __tablename__ = 'project_journal'
-    id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
-    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
-    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
-    object_ids = db.Column(db.String(255), nullable=True)  # Comma-separated IDs
-    task_type = db.Column(db.String(100), nullable=False)
-    hours_spent = db.Column(db.Float, nullable=False)
-    status = db.Column(db.Text, nullable=False)  # JSON string or text for status per object
-    comments = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
-
-    employee = db.relationship('Employee', backref='project_journals')
-    project = db.relationship('Project', backref='project_journals')
+from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.security import generate_password_hash, check_password_hash
+from attendance_app.passwords import password_hasher
 from flask_login import UserMixin
 
 db = SQLAlchemy()
@@ -36,13 +12,19 @@ class User(UserMixin, db.Model):
     password = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='employee')  # 'admin', 'employee', 'manager', 'trainee'
     is_active = db.Column(db.Boolean, default=True)
+    # Bumped with every write to the user or its employee row (see principal.py)
+    principal_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     employee = db.relationship('Employee', backref='user', uselist=False, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_hasher().hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_hasher().verify(self.password, password)
+
+    def password_needs_rehash(self):
+        # Hashed with an algorithm or cost other than the configured one
+        return password_hasher().needs_rehash(self.password)
 
 # Company information
 class Company(db.Model):
@@ -78,6 +60,9 @@ class Employee(db.Model):
 # Projects
 class Project(db.Model):
     __tablename__ = 'project'
+    __table_args__ = (
+        db.Index('ix_project_start_date', 'start_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(300))
@@ -96,6 +81,7 @@ class Project(db.Model):
     metric_divisor = db.Column(db.Float, nullable=True)
     metric_multiplier = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     report_template_id = db.Column(db.Integer, db.ForeignKey('report_template.id'), nullable=True)
 
     # Attendance linked to project via foreign key
@@ -104,41 +90,92 @@ class Project(db.Model):
     # WorkReports linked to project
     work_reports = db.relationship('WorkReport', backref='project', lazy=True)
 
-    def calculate_billing_amount(self, quantity):
-        """Calculate billing amount based on project's billing type"""
+    def billing_rule(self):
+        """Return (divisor, multiplier) so that amount = quantity / divisor * multiplier.
+
+        Hourly projects use a divisor of 1 and the hourly rate; count-based
+        projects use their metric divisor and multiplier. Anything that bills
+        nothing (no rate, missing divisor/multiplier, unknown type) gets a
+        multiplier of 0.
+        """
         if self.billing_type == 'hourly':
-            return quantity * (self.hourly_rate or 0)
+            return 1, self.hourly_rate or 0
         elif self.billing_type == 'count_based':
             if self.metric_divisor and self.metric_multiplier:
-                return (quantity / self.metric_divisor) * self.metric_multiplier
-            return 0
+                return self.metric_divisor, self.metric_multiplier
+            return 1, 0
         else:
-            return 0
+            return 1, 0
+
+    def calculate_billing_amount(self, quantity):
+        """Calculate billing amount based on project's billing type"""
+        divisor, multiplier = self.billing_rule()
+        return quantity / divisor * multiplier
 
 # Attendance (Clock In/Out)
 class Attendance(db.Model):
     __tablename__ = 'attendance'
+    __table_args__ = (
+        # One attendance row per employee per day; clock in/out upsert against it
+        db.Index('uq_attendance_employee_date', 'employee_id', 'date', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
     clock_in = db.Column(db.DateTime)
     clock_out = db.Column(db.DateTime)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=True)
+    break_duration = db.Column(db.Integer, default=0)  # minutes
+    notes = db.Column(db.Text, nullable=True)
+
+    @property
+    def total_hours(self):
+        """Hours between clock in and clock out, minus the break"""
+        if not self.clock_in or not self.clock_out:
+            return 0
+        worked = (self.clock_out - self.clock_in).total_seconds() / 3600
+        return max(worked - (self.break_duration or 0) / 60, 0)
+
+# Per employee per day attendance totals, kept up to date from Attendance (see
+# attendance_summary.py). Absent rows exist only for closed working days.
+class AttendanceDay(db.Model):
+    __tablename__ = 'attendance_day'
+    __table_args__ = (
+        db.Index('ix_attendance_day_date', 'date'),
+    )
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=True)
+    worked_minutes = db.Column(db.Integer, nullable=False, default=0)  # clock out - clock in - break
+    break_minutes = db.Column(db.Integer, nullable=False, default=0)
+    is_late = db.Column(db.Boolean, nullable=False, default=False)
+    is_absent = db.Column(db.Boolean, nullable=False, default=False)
 
 # Leave management
 class LeaveRequest(db.Model):
+    __table_args__ = (
+        db.Index('ix_leave_request_status_created', 'status', 'created_at'),
+        db.Index('ix_leave_request_dates', 'start_date', 'end_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
     reason = db.Column(db.String(255))
+    leave_type = db.Column(db.String(50), nullable=False, default='personal')  # sick, vacation, personal, emergency
     status = db.Column(db.String(50), default='pending')  # pending, approved, denied
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     approved_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     approved_at = db.Column(db.DateTime, nullable=True)
 
 # Daily Work Report for tracking number of files/records
 class WorkReport(db.Model):
+    __table_args__ = (
+        db.Index('ix_work_report_employee_date', 'employee_id', 'date'),
+        db.Index('ix_work_report_project_date', 'project_id', 'date'),
+        db.Index('ix_work_report_approval_date', 'approval_status', 'date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
@@ -146,6 +183,29 @@ class WorkReport(db.Model):
     description = db.Column(db.Text, nullable=False)
     quantity = db.Column(db.Float, nullable=False) # Represents hours for hourly projects, or the count for count-based projects
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    approval_status = db.Column(db.String(20), nullable=False, default='pending')  # pending, approved, rejected
+    reviewed_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    reviewed_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def is_approved(self):
+        return self.approval_status == 'approved'
+
+# One row per approve/reject batch (see work_report_review.py)
+class WorkReportReview(db.Model):
+    __tablename__ = 'work_report_review'
+    __table_args__ = (
+        db.Index('ix_work_report_review_created', 'created_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    action = db.Column(db.String(20), nullable=False)  # approved, rejected
+    reviewer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    report_ids = db.Column(db.Text, nullable=False)  # JSON list of the ids whose status changed
+    requested = db.Column(db.Integer, nullable=False)
+    updated = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    reviewer = db.relationship('User')
 
 # Report Templates
 class ReportTemplate(db.Model):
@@ -217,6 +277,9 @@ class BillingRecord(db.Model):
     employee = db.relationship('Employee', backref='billing_records')
 
 class InternalMessage(db.Model):
+    __table_args__ = (
+        db.Index('ix_internal_message_recipient_read', 'recipient_id', 'is_read'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     sender_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     recipient_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)  # None for broadcast
@@ -230,8 +293,24 @@ class InternalMessage(db.Model):
     
     sender = db.relationship('User', foreign_keys=[sender_id], backref='sent_messages')
     recipient = db.relationship('User', foreign_keys=[recipient_id], backref='received_messages')
+    recipient_states = db.relationship('MessageRecipient', backref='message', lazy='dynamic', cascade='all, delete-orphan')
+
+# Per-recipient delivery and read state of a broadcast. The broadcast itself is
+# a single InternalMessage with recipient_id None and is_broadcast set.
+class MessageRecipient(db.Model):
+    __tablename__ = 'message_recipient'
+    __table_args__ = (
+        db.Index('ix_message_recipient_user_read', 'user_id', 'is_read'),
+    )
+    message_id = db.Column(db.Integer, db.ForeignKey('internal_message.id'), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    is_read = db.Column(db.Boolean, nullable=False, default=False)
+    read_at = db.Column(db.DateTime, nullable=True)
 
 class CompanyEvent(db.Model):
+    __table_args__ = (
+        db.Index('ix_company_event_date', 'event_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
@@ -241,5 +320,79 @@ class CompanyEvent(db.Model):
     is_all_day = db.Column(db.Boolean, default=False)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     creator = db.relationship('User', backref='created_events')
+
+# Project Journal Entry
+class ProjectJournal(db.Model):
+    __tablename__ = 'project_journal'
+    __table_args__ = (
+        db.Index('ix_project_journal_employee_project_date', 'employee_id', 'project_id', 'date'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    object_ids = db.Column(db.String(255), nullable=True)  # Comma-separated IDs
+    task_type = db.Column(db.String(100), nullable=False)
+    hours_spent = db.Column(db.Float, nullable=False)
+    status = db.Column(db.Text, nullable=False)  # JSON string or text for status per object
+    comments = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+
+    employee = db.relationship('Employee', backref='project_journals')
+    project = db.relationship('Project', backref='project_journals')
+    objects = db.relationship('JournalObject', backref='journal', cascade='all, delete-orphan')
+
+# One row per object named in a journal entry, with that object's status (see
+# journal_index.py), so object history and error lookups use an index
+class JournalObject(db.Model):
+    __tablename__ = 'journal_object'
+    __table_args__ = (
+        db.Index('ix_journal_object_object_date', 'object_id', 'date'),
+        db.Index('ix_journal_object_project_status_date', 'project_id', 'status', 'date'),
+    )
+    journal_id = db.Column(db.Integer, db.ForeignKey('project_journal.id', ondelete='CASCADE'), primary_key=True)
+    object_id = db.Column(db.String(100), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)  # copied from the entry
+    date = db.Column(db.Date, nullable=False)  # copied from the entry
+    status = db.Column(db.String(50), nullable=False)
+
+# Background export job (see jobs.py). The finished file lives under
+# instance/exports and is served from the job's download route.
+class ExportJob(db.Model):
+    __tablename__ = 'export_job'
+    __table_args__ = (
+        db.Index('ix_export_job_user_created', 'user_id', 'created_at'),
+        db.Index('ix_export_job_status', 'status'),
+    )
+    id = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)  # e.g. attendance_pdf, billing_csv
+    params = db.Column(db.Text, nullable=False, default='{}')  # JSON filters
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # percent
+    filename = db.Column(db.String(100), nullable=False)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    user = db.relationship('User', backref='export_jobs')
+
+# Content-addressed upload (see upload_store.py); refcount is the number of
+# model fields currently pointing at the file
+class UploadBlob(db.Model):
+    __tablename__ = 'upload_blob'
+    filename = db.Column(db.String(100), primary_key=True)  # <sha256 prefix>.<ext>
+    refcount = db.Column(db.Integer, nullable=False, default=0)
+    size = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# Applied schema migrations (see migrations.py)
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=db.func.current_timestamp())
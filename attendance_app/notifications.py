@@ -0,0 +1,152 @@
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import defaultdict
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from attendance_app.models import db, InternalMessage, MessageRecipient
+from attendance_app.messaging import unread_count
+
+# Unread-count and new-message notifications.
+#
+# Writes to InternalMessage and MessageRecipient are picked up by a session hook and published to an
+# in-process hub after the transaction commits. The hub fans each event out to
+# the /api/notifications/stream connections of the affected user and bumps the
+# user's version, which is what the ETag of /api/messages/unread-count is built
+# from, so an idle poller gets a 304 without a query.
+#
+# Each open stream holds a connection, and under sync or gthread workers a
+# thread, for up to NOTIFICATION_STREAM_TIMEOUT. So the stream is off unless
+# NOTIFICATION_STREAM is set, which is meant for async workers (gevent or
+# eventlet); without it the stream route answers 204 and pages poll the
+# unread count every 30 seconds.
+#
+# The hub only sees commits made in its own process. Behind several worker
+# processes the ETag also rolls over every NOTIFICATION_RESYNC_SECONDS and open
+# streams re-read the count on the same schedule, which bounds how stale a
+# client can get to that interval.
+
+NOTIFICATION_RESYNC_SECONDS = 60
+NOTIFICATION_KEEPALIVE_SECONDS = 20
+NOTIFICATION_STREAM_TIMEOUT = 300
+NOTIFICATION_QUEUE_SIZE = 100
+
+ALL_USERS = object()
+
+class NotificationHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._versions = defaultdict(int)
+        self._broadcast_version = 0
+        self.generation = uuid.uuid4().hex[:8]
+
+    def subscribe(self, user_id):
+        q = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[user_id].add(q)
+        return q
+
+    def unsubscribe(self, user_id, q):
+        with self._lock:
+            self._subscribers[user_id].discard(q)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def publish(self, user_id, event_name, data=None):
+        """Send an event to one user's streams, or to everyone with ALL_USERS"""
+        with self._lock:
+            if user_id is ALL_USERS:
+                self._broadcast_version += 1
+                targets = [q for qs in self._subscribers.values() for q in qs]
+            else:
+                self._versions[user_id] += 1
+                targets = list(self._subscribers.get(user_id, ()))
+        for q in targets:
+            try:
+                q.put_nowait((event_name, data))
+            except queue.Full:
+                # A stuck client only loses events; the next resync catches it up
+                pass
+
+    def etag(self, user_id):
+        with self._lock:
+            version = self._versions.get(user_id, 0)
+            broadcast_version = self._broadcast_version
+        resync_bucket = int(time.time() // NOTIFICATION_RESYNC_SECONDS)
+        return f'{self.generation}-{user_id}-{resync_bucket}-{broadcast_version}-{version}'
+
+notification_hub = NotificationHub()
+
+def format_sse(event_name, data):
+    return f"event: {event_name}\ndata: {json.dumps(data)}\n\n"
+
+def notification_stream(user_id, timeout=NOTIFICATION_STREAM_TIMEOUT):
+    """SSE generator: unread count on connect, then pushed changes until ``timeout``"""
+    q = notification_hub.subscribe(user_id)
+    try:
+        yield "retry: 5000\n\n"
+        last_count = _read_unread_count(user_id)
+        yield format_sse('unread-count', {'count': last_count})
+
+        started = last_sync = time.monotonic()
+        while time.monotonic() - started < timeout:
+            try:
+                event_name, data = q.get(timeout=NOTIFICATION_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                if time.monotonic() - last_sync < NOTIFICATION_RESYNC_SECONDS:
+                    yield ": keepalive\n\n"
+                    continue
+                event_name, data = 'unread-count', None
+
+            if event_name == 'notification':
+                yield format_sse('notification', data)
+            count = _read_unread_count(user_id)
+            last_sync = time.monotonic()
+            if count != last_count:
+                last_count = count
+                yield format_sse('unread-count', {'count': count})
+    finally:
+        notification_hub.unsubscribe(user_id, q)
+
+def _read_unread_count(user_id):
+    try:
+        return unread_count(user_id)
+    finally:
+        # Give the connection back to the pool while the stream sits idle
+        db.session.close()
+
+def _collect_message_events(session, flush_context):
+    events = session.info.setdefault('notification_events', [])
+    for obj in session.new:
+        if isinstance(obj, InternalMessage):
+            events.append((obj.recipient_id if obj.recipient_id else ALL_USERS, 'notification', {
+                'id': obj.id,
+                'title': obj.subject,
+                'message': (obj.content or '')[:200],
+            }))
+    for obj in session.dirty:
+        if isinstance(obj, InternalMessage) and inspect(obj).attrs.is_read.history.has_changes():
+            events.append((obj.recipient_id if obj.recipient_id else ALL_USERS, 'unread-count', None))
+        elif isinstance(obj, MessageRecipient) and inspect(obj).attrs.is_read.history.has_changes():
+            events.append((obj.user_id, 'unread-count', None))
+    for obj in session.deleted:
+        if isinstance(obj, InternalMessage):
+            events.append((obj.recipient_id if obj.recipient_id else ALL_USERS, 'unread-count', None))
+
+def _publish_after_commit(session):
+    for user_id, event_name, data in session.info.pop('notification_events', ()):
+        notification_hub.publish(user_id, event_name, data)
+
+def _drop_after_rollback(session):
+    session.info.pop('notification_events', None)
+
+def init_notifications(app):
+    app.config.setdefault('NOTIFICATION_STREAM', False)
+    app.extensions['notification_hub'] = notification_hub
+    if not event.contains(Session, 'after_flush', _collect_message_events):
+        event.listen(Session, 'after_flush', _collect_message_events)
+        event.listen(Session, 'after_commit', _publish_after_commit)
+        event.listen(Session, 'after_rollback', _drop_after_rollback)
@@ -0,0 +1,106 @@
+from datetime import date, datetime
+from flask import abort, current_app, request, url_for
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import String, and_, false, or_, type_coerce
+
+# Keyset (cursor) pagination.
+#
+# Pages are ordered by a fixed tuple of columns ending in the primary key, e.g.
+# (Attendance.date, Attendance.id), always descending. The next page is the
+# rows strictly after the last row shown, so the database seeks straight to it
+# through the index instead of scanning and discarding OFFSET rows. Cursors are
+# signed, opaque tokens holding the last row's key values as stored.
+#
+# Key columns may be nullable (LeaveRequest.created_at, InternalMessage.sent_at
+# have defaults but no NOT NULL). NULLs sort after every value, a NULL key is
+# stored in the cursor as null, and the seek clause matches it with IS NULL.
+# Columns declared NOT NULL keep the plain comparison and ORDER BY.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class KeysetPage:
+    def __init__(self, items, next_cursor):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+def _serializer():
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='keyset-cursor')
+
+def _raw(column):
+    # Compare and read key columns as the values actually stored, with no
+    # Python-side type processing. SQLite keeps datetimes as text and rows
+    # written by CURRENT_TIMESTAMP and by Python differ in precision, so
+    # round-tripping through datetime objects would not reproduce the
+    # stored value exactly. type_coerce does not change the SQL, so the
+    # comparison can still use the index.
+    return type_coerce(column, String)
+
+def _nullable(column):
+    return getattr(column.expression, 'nullable', True)
+
+def _dump_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def encode_cursor(values):
+    return _serializer().dumps([_dump_value(v) for v in values])
+
+def decode_cursor(token, columns):
+    """Return the key values stored in ``token``; a malformed or tampered token is a 400"""
+    try:
+        values = _serializer().loads(token)
+    except BadSignature:
+        abort(400, description='Invalid page cursor')
+    if not isinstance(values, list) or len(values) != len(columns) \
+            or not all(v is None or isinstance(v, (str, int, float)) for v in values):
+        abort(400, description='Invalid page cursor')
+    return values
+
+def _equal(column, value):
+    return column.is_(None) if value is None else column == value
+
+def _after(columns, values):
+    """WHERE clause selecting rows that sort after ``values`` in descending key order, NULLs last"""
+    raw_columns = [_raw(column) for column in columns]
+    clauses = []
+    for i, (column, raw, value) in enumerate(zip(columns, raw_columns, values)):
+        if value is None:
+            # Nothing sorts after NULL in this column
+            continue
+        equal_prefix = [_equal(c, v) for c, v in zip(raw_columns[:i], values[:i])]
+        after = or_(raw < value, raw.is_(None)) if _nullable(column) else raw < value
+        clauses.append(and_(*equal_prefix, after))
+    return or_(*clauses) if clauses else false()
+
+def get_page_size(default=DEFAULT_PAGE_SIZE):
+    per_page = request.args.get('per_page', default, type=int)
+    return max(1, min(per_page, MAX_PAGE_SIZE))
+
+def keyset_paginate(query, columns, cursor=None, per_page=DEFAULT_PAGE_SIZE):
+    """Return one KeysetPage of ``query`` ordered by ``columns`` descending.
+
+    ``columns`` must end with a unique column (normally the primary key) so
+    the order is stable. The query must not already carry an ORDER BY.
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns)))
+    query = query.order_by(*[column.desc().nulls_last() if _nullable(column) else column.desc() for column in columns])
+
+    rows = query.add_columns(*[_raw(column) for column in columns]).limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(rows[-1][1:])
+    return KeysetPage([row[0] for row in rows], next_cursor)
+
+def page_url(cursor, param='cursor'):
+    """URL of the current view with the same query args and ``param`` set to ``cursor``"""
+    args = request.args.to_dict()
+    args[param] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
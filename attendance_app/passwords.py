@@ -0,0 +1,64 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+# Password hashing policy.
+#
+# PASSWORD_HASH_ALGORITHM ('scrypt' or 'pbkdf2') and PASSWORD_HASH_COST (the
+# scrypt work factor N, a power of two, or the pbkdf2 iteration count) pick
+# the werkzeug hash method used for new hashes. Hashing and verifying run on a
+# small per-process pool (PASSWORD_HASH_WORKERS threads, one per core by
+# default): hashlib releases the GIL while it works, so the request threads of
+# a worker keep serving other requests while a login waits, and a burst of
+# logins at shift start queues on the pool instead of every thread hashing at
+# once (scrypt at N=32768 also needs 32 MiB per hash in flight).
+#
+# A stored hash records the method it was made with. When that differs from
+# the configured one, login re-hashes the password it has just verified, so
+# raising or lowering the cost needs no migration. benchmarks/logins.py shows
+# what each setting costs in login throughput.
+
+PASSWORD_HASH_ALGORITHM = 'scrypt'
+PASSWORD_HASH_COST = 32768
+PASSWORD_HASH_WORKERS = os.cpu_count() or 1
+
+def hash_method(algorithm=PASSWORD_HASH_ALGORITHM, cost=PASSWORD_HASH_COST):
+    """The werkzeug method string for an algorithm and cost"""
+    if algorithm == 'scrypt':
+        if cost < 2 or cost & (cost - 1):
+            raise ValueError(f"scrypt cost must be a power of two, not {cost}")
+        return f'scrypt:{cost}:8:1'
+    if algorithm == 'pbkdf2':
+        return f'pbkdf2:sha256:{cost}'
+    raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+
+class PasswordHasher:
+    def __init__(self, method=None, workers=PASSWORD_HASH_WORKERS):
+        self.method = method or hash_method()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+
+    def hash(self, password):
+        return self.executor.submit(generate_password_hash, password, self.method).result()
+
+    def verify(self, stored, password):
+        return self.executor.submit(check_password_hash, stored, password).result()
+
+    def needs_rehash(self, stored):
+        return stored.split('$', 1)[0] != self.method
+
+_default_hasher = None
+
+def password_hasher():
+    """The app's hasher, or one with the default policy outside an app"""
+    global _default_hasher
+    if has_app_context() and 'password_hasher' in current_app.extensions:
+        return current_app.extensions['password_hasher']
+    if _default_hasher is None:
+        _default_hasher = PasswordHasher(workers=1)
+    return _default_hasher
+
+def init_passwords(app):
+    method = hash_method(app.config.get('PASSWORD_HASH_ALGORITHM', PASSWORD_HASH_ALGORITHM),
+                         app.config.get('PASSWORD_HASH_COST', PASSWORD_HASH_COST))
+    app.extensions['password_hasher'] = PasswordHasher(method, app.config.get('PASSWORD_HASH_WORKERS', PASSWORD_HASH_WORKERS))
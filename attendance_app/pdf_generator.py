@@ -1,101 +1,159 @@
-from fpdf import FPDF
-from jinja2 import Environment, FileSystemLoader
 import os
+from fpdf import FPDF
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+# PDF reports.
+#
+# Tabular reports take rows that are already plain value tuples (see the
+# *_export_rows builders in exports.py) and are laid out by TableLayout, which
+# writes each row straight into fixed columns, wraps long cells onto extra
+# lines and starts a new page with the header repeated when a row would not
+# fit. Nothing is parsed from HTML, and string widths are cached per layout
+# because the same names, dates and statuses repeat on nearly every row.
+#
+# HTML-templated reports go through generate_html_pdf, which uses one
+# module-level Jinja environment so each template is compiled only once.
+
+PDF_TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), 'templates', 'pdf_templates')
+pdf_template_env = Environment(loader=FileSystemLoader(PDF_TEMPLATE_DIR), autoescape=select_autoescape(['html']))
+
+FONT_FAMILY = 'Helvetica'
+FONT_SIZE = 9
+LINE_HEIGHT = 5
+CELL_PADDING = 1
+PROGRESS_EVERY = 500
+
+ATTENDANCE_COLUMNS = [('Date', 2), ('Employee', 4), ('Project', 4), ('Clock In', 2), ('Clock Out', 2)]
+WORK_REPORT_COLUMNS = [('Date', 2), ('Employee', 3), ('Project', 3), ('Quantity', 1.5), ('Description', 7)]
+BILLING_COLUMNS = [('Record', 1.5), ('Employee', 3), ('Period Start', 2), ('Period End', 2), ('Amount', 1.5),
+                   ('Status', 1.5), ('Finalized At', 2.5), ('Notes', 4)]
 
 class PDF(FPDF):
+    def __init__(self, title='Report', **kwargs):
+        super().__init__(**kwargs)
+        self.report_title = title
+        self.set_auto_page_break(True, margin=15)
+
     def header(self):
-        self.set_font('Arial', 'B', 12)
-        self.cell(0, 10, 'Attendance Report', 0, 1, 'C')
+        self.set_font(FONT_FAMILY, 'B', 12)
+        self.cell(0, 10, self.report_title, border=0, new_x='LMARGIN', new_y='NEXT', align='C')
 
     def footer(self):
         self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-
-    def chapter_title(self, title):
-        self.set_font('Arial', 'B', 12)
-        self.cell(0, 10, title, 0, 1, 'L')
-        self.ln(10)
-
-    def chapter_body(self, data):
-        self.set_font('Arial', '', 12)
-        # A simple table
-        col_width = self.w / 4.5
-        row_height = 10
-        self.set_fill_color(200, 220, 255)
-        
-        headers = ['Date', 'Employee', 'Clock In', 'Clock Out']
-        for header in headers:
-            self.cell(col_width, row_height, header, 1, 0, 'C', 1)
-        self.ln(row_height)
-
-        for row in data:
-            self.cell(col_width, row_height, str(row.date), 1)
-            self.cell(col_width, row_height, row.employee.name, 1)
-            self.cell(col_width, row_height, str(row.clock_in), 1)
-            self.cell(col_width, row_height, str(row.clock_out), 1)
-            self.ln(row_height)
-
-def generate_attendance_pdf(data):
-    # Load the template
-    template_path = os.path.join('templates', 'pdf_templates', 'attendance_template.html')
-    template_dir = os.path.dirname(template_path)
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template(os.path.basename(template_path))
-
-    # Render the template with the data
-    html = template.render(data=data)
-
-    pdf = PDF()
-    pdf.add_page()
-    pdf.chapter_title('Attendance Records')
-    pdf.write_html(html)
-    pdf_bytes = pdf.output(dest='S').encode('latin-1')
-    return pdf_bytes
+        self.set_font(FONT_FAMILY, 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', border=0, align='C')
+
+def _pdf_text(value):
+    # The core fonts are latin-1 only
+    if value is None:
+        return ''
+    return str(value).encode('latin-1', 'replace').decode('latin-1')
+
+class TableLayout:
+    """Writes rows of values into fixed-width columns on ``pdf``"""
+
+    def __init__(self, pdf, columns):
+        self.pdf = pdf
+        self.headers = [header for header, _ in columns]
+        usable = pdf.w - pdf.l_margin - pdf.r_margin
+        total = sum(weight for _, weight in columns)
+        self.widths = [usable * weight / total for _, weight in columns]
+        self._string_widths = {}
 
-def generate_billing_pdf(data):
-    pdf = PDF()
+    def _width(self, text):
+        width = self._string_widths.get(text)
+        if width is None:
+            width = self._string_widths[text] = self.pdf.get_string_width(text)
+        return width
+
+    def _wrap(self, text, width):
+        """Split ``text`` into lines that fit ``width``"""
+        room = width - 2 * CELL_PADDING
+        if self._width(text) <= room:
+            return [text]
+        lines, line = [], ''
+        for word in text.split(' '):
+            candidate = f'{line} {word}' if line else word
+            if self.pdf.get_string_width(candidate) <= room:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A single word wider than the column is broken by characters
+            while self.pdf.get_string_width(word) > room and len(word) > 1:
+                cut = len(word) - 1
+                while cut > 1 and self.pdf.get_string_width(word[:cut]) > room:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+            line = word
+        lines.append(line)
+        return lines
+
+    def write_header(self):
+        pdf = self.pdf
+        pdf.set_font(FONT_FAMILY, 'B', FONT_SIZE)
+        pdf.set_fill_color(200, 220, 255)
+        for header, width in zip(self.headers, self.widths):
+            pdf.cell(width, LINE_HEIGHT + 2, header, border=1, align='C', fill=True)
+        pdf.ln(LINE_HEIGHT + 2)
+        pdf.set_font(FONT_FAMILY, '', FONT_SIZE)
+
+    def write_row(self, values):
+        pdf = self.pdf
+        cells = [self._wrap(_pdf_text(value), width) for value, width in zip(values, self.widths)]
+        height = max(len(lines) for lines in cells) * LINE_HEIGHT
+        if pdf.get_y() + height > pdf.page_break_trigger:
+            pdf.add_page()
+            self.write_header()
+
+        # text() and line() skip cell()'s per-call layout work, which is most of
+        # the cost on a large report. The header's bottom border is the first
+        # row's top edge; every row draws its own sides and bottom edge.
+        x, y = pdf.l_margin, pdf.get_y()
+        baseline = 0.5 * LINE_HEIGHT + 0.3 * pdf.font_size
+        pdf.line(x, y, x, y + height)
+        for lines, width in zip(cells, self.widths):
+            for i, line in enumerate(lines):
+                if line:
+                    pdf.text(x + CELL_PADDING, y + i * LINE_HEIGHT + baseline, line)
+            x += width
+            pdf.line(x, y, x, y + height)
+        pdf.line(pdf.l_margin, y + height, x, y + height)
+        pdf.set_xy(pdf.l_margin, y + height)
+
+def render_table_pdf(title, columns, rows, progress=None, orientation='P'):
+    """PDF bytes for ``rows`` (sequences of values) under ``columns`` [(header, relative width)].
+
+    ``progress(done, total)`` is called every PROGRESS_EVERY rows when given.
+    """
+    pdf = PDF(title, orientation=orientation)
     pdf.add_page()
-    pdf.chapter_title('Billing Records')
-    
-    col_width = pdf.w / 5.5
-    row_height = 10
-    pdf.set_fill_color(200, 220, 255)
-    
-    headers = ['Employee', 'Project', 'Period', 'Amount', 'Status']
-    for header in headers:
-        pdf.cell(col_width, row_height, header, 1, 0, 'C', 1)
-    pdf.ln(row_height)
-
-    for row in data:
-        pdf.cell(col_width, row_height, row.employee.name, 1)
-        pdf.cell(col_width, row_height, row.project.name, 1)
-        pdf.cell(col_width, row_height, f"{row.period_start} to {row.period_end}", 1)
-        pdf.cell(col_width, row_height, f"${row.total_amount:.2f}", 1)
-        pdf.cell(col_width, row_height, row.status, 1)
-        pdf.ln(row_height)
-        
-    return pdf.output(dest='S').encode('latin-1')
-
-def generate_work_report_pdf(data):
-    pdf = PDF()
+    layout = TableLayout(pdf, columns)
+    layout.write_header()
+    total = len(rows)
+    for i, row in enumerate(rows, 1):
+        layout.write_row(row)
+        if progress and i % PROGRESS_EVERY == 0:
+            progress(i, total)
+    return bytes(pdf.output())
+
+def generate_attendance_pdf(rows, progress=None):
+    """Rows as built by exports.attendance_export_rows"""
+    return render_table_pdf('Attendance Report', ATTENDANCE_COLUMNS, rows, progress)
+
+def generate_work_report_pdf(rows, progress=None):
+    """Rows as built by exports.work_report_export_rows"""
+    return render_table_pdf('Work Reports', WORK_REPORT_COLUMNS, rows, progress)
+
+def generate_billing_pdf(rows, progress=None):
+    """Rows as built by exports.billing_export_rows"""
+    return render_table_pdf('Billing Records', BILLING_COLUMNS, rows, progress, orientation='L')
+
+def generate_html_pdf(template_name, title, **context):
+    """Render a template from templates/pdf_templates through fpdf2's HTML support"""
+    html = pdf_template_env.get_template(template_name).render(**context)
+    pdf = PDF(title)
     pdf.add_page()
-    pdf.chapter_title('Work Reports')
-    
-    col_width = pdf.w / 4.5
-    row_height = 10
-    pdf.set_fill_color(200, 220, 255)
-    
-    headers = ['Date', 'Employee', 'Project', 'Description']
-    for header in headers:
-        pdf.cell(col_width, row_height, header, 1, 0, 'C', 1)
-    pdf.ln(row_height)
-
-    for row in data:
-        pdf.cell(col_width, row_height, str(row.date), 1)
-        pdf.cell(col_width, row_height, row.employee.name, 1)
-        pdf.cell(col_width, row_height, row.project.name, 1)
-        pdf.cell(col_width, row_height, row.description, 1)
-        pdf.ln(row_height)
-        
-    return pdf.output(dest='S').encode('latin-1')
+    pdf.write_html(html)
+    return bytes(pdf.output())
@@ -0,0 +1,145 @@
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from flask import before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from attendance_app.query_counter import get_query_count
+
+logger = logging.getLogger('attendance_app.perf')
+
+# Per-request performance instrumentation.
+#
+# Every request records its wall time, the number of SQL statements it ran
+# (from query_counter), the time spent inside those statements and the time
+# spent rendering Jinja templates. The numbers go out three ways:
+#   - a Server-Timing header (app, sql, render), shown in the browser's
+#     network panel (PERF_SERVER_TIMING);
+#   - one JSON log line per request on the attendance_app.perf logger
+#     (PERF_LOG);
+#   - an in-process sample window per endpoint, summarised as p50/p95 on
+#     /admin/perf.
+# The window holds the last PERF_SAMPLES requests of each endpoint and only
+# covers the worker process that serves the page.
+#
+# Streamed responses (CSV downloads, the SSE stream) are timed until the
+# response object is returned, not until the body has been sent.
+
+PERF_SAMPLES = 500
+
+def _sql_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and has_request_context() and 'perf_start' in g:
+        context._perf_sql_started = time.perf_counter()
+
+def _sql_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_perf_sql_started', None)
+    if started is not None and has_request_context():
+        g.perf_sql_time += time.perf_counter() - started
+
+def _render_started(sender, template, context, **extra):
+    if has_request_context() and 'perf_start' in g:
+        # Only the outermost render is timed; templates rendered from inside
+        # another one (macros imported with context, render_template in a filter)
+        # are already covered by it
+        if g.perf_render_depth == 0:
+            g.perf_render_started = time.perf_counter()
+        g.perf_render_depth += 1
+
+def _render_finished(sender, template, context, **extra):
+    if has_request_context() and g.get('perf_render_depth'):
+        g.perf_render_depth -= 1
+        if g.perf_render_depth == 0:
+            g.perf_render_time += time.perf_counter() - g.perf_render_started
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+class PerfStats:
+    """Rolling window of request samples per endpoint"""
+
+    def __init__(self, samples=PERF_SAMPLES):
+        self.samples = samples
+        self._data = defaultdict(lambda: deque(maxlen=self.samples))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, total, sql_count, sql_time, render_time):
+        with self._lock:
+            self._data[endpoint].append((total, sql_count, sql_time, render_time))
+
+    def summary(self):
+        """One dict per endpoint, slowest p95 first; times are in milliseconds"""
+        with self._lock:
+            data = {endpoint: list(samples) for endpoint, samples in self._data.items()}
+        rows = []
+        for endpoint, samples in data.items():
+            totals = sorted(s[0] for s in samples)
+            sql_times = sorted(s[2] for s in samples)
+            render_times = sorted(s[3] for s in samples)
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(samples),
+                'p50': _percentile(totals, 0.5) * 1000,
+                'p95': _percentile(totals, 0.95) * 1000,
+                'max': totals[-1] * 1000,
+                'sql_count': sum(s[1] for s in samples) / len(samples),
+                'sql_p50': _percentile(sql_times, 0.5) * 1000,
+                'sql_p95': _percentile(sql_times, 0.95) * 1000,
+                'render_p50': _percentile(render_times, 0.5) * 1000,
+                'render_p95': _percentile(render_times, 0.95) * 1000,
+            })
+        return sorted(rows, key=lambda row: row['p95'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+def server_timing(total, sql_count, sql_time, render_time):
+    return (f'app;dur={total * 1000:.1f}, '
+            f'sql;dur={sql_time * 1000:.1f};desc="{sql_count} queries", '
+            f'render;dur={render_time * 1000:.1f}')
+
+def init_perf(app):
+    """Time every request handled by ``app`` (see the module comment for the outputs)"""
+    if not app.config.get('PERF_INSTRUMENTATION', True):
+        return
+    stats = app.extensions['perf_stats'] = PerfStats(app.config.get('PERF_SAMPLES', PERF_SAMPLES))
+
+    if not event.contains(Engine, 'before_cursor_execute', _sql_started):
+        event.listen(Engine, 'before_cursor_execute', _sql_started)
+        event.listen(Engine, 'after_cursor_execute', _sql_finished)
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
+
+    @app.before_request
+    def _start_perf():
+        g.perf_start = time.perf_counter()
+        g.perf_sql_time = 0.0
+        g.perf_render_time = 0.0
+        g.perf_render_depth = 0
+
+    @app.after_request
+    def _finish_perf(response):
+        if 'perf_start' not in g or request.endpoint is None:
+            return response
+        total = time.perf_counter() - g.perf_start
+        sql_count = get_query_count()
+        stats.record(request.endpoint, total, sql_count, g.perf_sql_time, g.perf_render_time)
+        if app.config.get('PERF_SERVER_TIMING', True):
+            response.headers['Server-Timing'] = server_timing(total, sql_count, g.perf_sql_time, g.perf_render_time)
+        if app.config.get('PERF_LOG', True):
+            logger.info(json.dumps({
+                'endpoint': request.endpoint,
+                'method': request.method,
+                'status': response.status_code,
+                'ms': round(total * 1000, 1),
+                'sql_count': sql_count,
+                'sql_ms': round(g.perf_sql_time * 1000, 1),
+                'render_ms': round(g.perf_render_time * 1000, 1),
+            }))
+        return response
+
+def perf_summary(app):
+    stats = app.extensions.get('perf_stats')
+    return stats.summary() if stats else []
@@ -0,0 +1,124 @@
+from flask import current_app
+from flask_login import UserMixin
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from attendance_app.models import db, User, Employee
+from attendance_app.dashboard_cache import MemoryCache
+
+# Session principal cache.
+#
+# load_user used to fetch the User row on every authenticated request, and
+# base.html then lazy-loaded current_user.employee for the name and avatar.
+# Now current_user is a Principal built from one User/Employee join and kept
+# in a cache keyed by user id, so rendering a page costs no identity queries.
+# It carries what requests ask about the signed-in user: id, username, role,
+# employee id, display name and avatar filename. Code that needs the Employee
+# row itself still gets it from current_user.employee, loaded on first use.
+#
+# Every ORM write to a User or Employee row (role changes, deactivation,
+# edit_employee, profile updates) bumps user.principal_version in the same
+# transaction, and so does a bulk UPDATE or DELETE of either table run through
+# the session, e.g. session.execute(update(User)...). Each request reads that
+# one column by primary key and only uses the cached principal when its
+# version matches, so a demoted admin or a deactivated user loses access on
+# the next request in every worker process, not just in the one that made the
+# change. That single indexed SELECT per request is the intended price of
+# revocation without a staleness window; statements executed on a bare
+# Connection bypass the session and must bump the version themselves. PRINCIPAL_VERSION is part of the
+# key: bump it when the cached fields change so entries in a shared
+# PRINCIPAL_CACHE from older code are never read.
+
+PRINCIPAL_VERSION = 2
+PRINCIPAL_CACHE_TTL = 300
+
+class Principal(UserMixin):
+    def __init__(self, id, username, role, active, employee_id, display_name, avatar, version):
+        self.id = id
+        self.username = username
+        self.role = role
+        self.active = active
+        self.employee_id = employee_id
+        self.display_name = display_name
+        self.avatar = avatar
+        self.version = version
+
+    @property
+    def is_active(self):
+        return self.active
+
+    @property
+    def employee(self):
+        """The Employee row, loaded on first use (None for users without one)"""
+        if self.employee_id is None:
+            return None
+        if '_employee' not in self.__dict__:
+            self._employee = db.session.get(Employee, self.employee_id)
+        return self._employee
+
+    def to_dict(self):
+        return {key: value for key, value in self.__dict__.items() if not key.startswith('_')}
+
+def _principal_key(user_id):
+    return f'principal:v{PRINCIPAL_VERSION}:{user_id}'
+
+def _cache():
+    return current_app.extensions['principal_cache']
+
+def _query_principal(user_id):
+    row = db.session.execute(
+        select(User.id, User.username, User.role, User.is_active, Employee.id, Employee.name, Employee.profile_picture,
+               User.principal_version)
+        .outerjoin(Employee, Employee.user_id == User.id)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+    id, username, role, active, employee_id, name, avatar, version = row
+    return Principal(id, username, role, active is not False, employee_id, name or username, avatar, version)
+
+def load_principal(user_id):
+    """The principal for a user id, from the cache while it is current; None when the user no longer exists"""
+    version = db.session.execute(select(User.principal_version).where(User.id == user_id)).scalar()
+    if version is None:
+        return None
+    values = _cache().get(_principal_key(user_id))
+    if values is not None and values['version'] == version:
+        return Principal(**values)
+    principal = _query_principal(user_id)
+    if principal is not None:
+        _cache().set(_principal_key(user_id), principal.to_dict(),
+                     current_app.config.get('PRINCIPAL_CACHE_TTL', PRINCIPAL_CACHE_TTL))
+    return principal
+
+def _bump_principal_versions(session, flush_context):
+    user_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, Employee):
+            user_ids.add(obj.user_id)
+    user_ids.discard(None)
+    if user_ids:
+        session.connection().execute(
+            update(User).where(User.id.in_(user_ids)).values(principal_version=User.principal_version + 1))
+
+def _bump_on_bulk_write(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    statement = orm_execute_state.statement
+    table = statement.table.name
+    if table == User.__table__.name and orm_execute_state.is_update:
+        orm_execute_state.statement = statement.values(principal_version=User.principal_version + 1)
+    elif table == Employee.__table__.name:
+        # Bump before the statement runs, while a DELETE's rows still exist
+        affected = select(Employee.user_id)
+        if statement.whereclause is not None:
+            affected = affected.where(statement.whereclause)
+        orm_execute_state.session.connection().execute(
+            update(User).where(User.id.in_(affected)).values(principal_version=User.principal_version + 1))
+
+def init_principal(app):
+    app.extensions['principal_cache'] = app.config.get('PRINCIPAL_CACHE') or MemoryCache()
+    if not event.contains(Session, 'after_flush', _bump_principal_versions):
+        event.listen(Session, 'after_flush', _bump_principal_versions)
+        event.listen(Session, 'do_orm_execute', _bump_on_bulk_write)
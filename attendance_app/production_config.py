@@ -9,4 +9,41 @@ class ProductionConfig:
     TESTING = False
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
+
+    # SQLite tuning (see db_profile.py): WAL, synchronous=NORMAL, busy_timeout, cache/mmap sizes
+    SQLITE_PROFILE = 'production'
+    SQLITE_PRAGMAS = {}
+    # Each gunicorn worker keeps a few connections open and re-validates them before use
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'pool_recycle': 3600,
+        'connect_args': {'timeout': 15},
+    }
+    # Dashboard metrics cache (see dashboard_cache.py). The default in-process cache is
+    # only invalidated in the worker that made the write, so keep the TTL short unless
+    # DASHBOARD_CACHE is set to a shared store.
+    DASHBOARD_CACHE = None
+    DASHBOARD_CACHE_TTL = 30
+    # Signed-in user cache (see principal.py). Entries are checked against the user's
+    # principal_version on every request, so a per-process cache is safe across workers.
+    PRINCIPAL_CACHE = None
+    PRINCIPAL_CACHE_TTL = 300
+    # Uploads are served with immutable caching from /uploads/ (see upload_store.py). Behind
+    # nginx, point UPLOADS_ACCEL_REDIRECT at an internal location aliased to static/uploads so
+    # nginx sends the bytes; USE_X_SENDFILE does the same for Apache/lighttpd.
+    UPLOADS_ACCEL_REDIRECT = os.environ.get('UPLOADS_ACCEL_REDIRECT')
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE') == '1'
+    # Request timing (see perf.py). The Server-Timing header is left off so SQL and render
+    # times are not shown to every client; /admin/perf and the perf log still have them.
+    PERF_SERVER_TIMING = False
+    # Password hashing (see passwords.py). Stored hashes made with other settings are
+    # upgraded on the next login; benchmarks/logins.py shows the cost of each setting.
+    PASSWORD_HASH_ALGORITHM = os.environ.get('PASSWORD_HASH_ALGORITHM', 'scrypt')
+    PASSWORD_HASH_COST = int(os.environ.get('PASSWORD_HASH_COST', 32768))
+    # Server-sent notification stream (see notifications.py). Each open tab holds a
+    # connection for minutes, so only turn it on under gevent/eventlet workers.
+    NOTIFICATION_STREAM = os.environ.get('NOTIFICATION_STREAM') == '1'
     # Add more production settings as needed
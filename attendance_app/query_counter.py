@@ -0,0 +1,50 @@
+import logging
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Per-request SQL statement counter and query budgets for views.
+#
+# Every statement executed while handling a request increments g.query_count.
+# A view decorated with @query_budget(n) checks the count once it has rendered;
+# going over budget raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is set
+# (it defaults to the app's TESTING flag) and logs a warning otherwise.
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and 'query_count' in g:
+        g.query_count += 1
+
+def init_query_counter(app):
+    """Start counting SQL statements for every request handled by ``app``"""
+    if not event.contains(Engine, 'before_cursor_execute', _count_statement):
+        event.listen(Engine, 'before_cursor_execute', _count_statement)
+
+    @app.before_request
+    def _reset_query_count():
+        g.query_count = 0
+
+def get_query_count():
+    """Number of statements executed so far in the current request"""
+    return g.get('query_count', 0)
+
+def query_budget(max_queries):
+    """Fail (in strict mode) or warn when a view runs more than ``max_queries`` statements"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = f(*args, **kwargs)
+            count = get_query_count()
+            if count > max_queries:
+                message = f"{request.endpoint} ran {count} queries (budget {max_queries})"
+                if current_app.config.get('QUERY_BUDGET_STRICT', current_app.testing):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,50 @@
+from sqlalchemy.orm import contains_eager, joinedload
+from attendance_app.models import (Employee, Attendance, LeaveRequest, WorkReport, BillingRecord,
+                                   InternalMessage, TrainingAssignment, ProjectJournal)
+
+# Relationship loading for list views.
+#
+# Each list view declares the relationships its template touches so they are
+# loaded together with the rows instead of one lazy load per row. Views whose
+# query already joins the related table use contains_eager so that join fills
+# the relationship; the others use joinedload.
+
+def attendance_list_options():
+    """attendance.html: record.employee, record.project (query joins Employee, outer-joins Project)"""
+    return [contains_eager(Attendance.employee), contains_eager(Attendance.project)]
+
+def work_report_list_options():
+    """admin_work_reports.html: report.employee, report.project (query joins both)"""
+    return [contains_eager(WorkReport.employee), contains_eager(WorkReport.project)]
+
+def employee_work_report_options():
+    """work_reports.html: report.project (query joins Project)"""
+    return [contains_eager(WorkReport.project)]
+
+def leave_request_list_options():
+    """admin_leave_requests.html: request.employee (query joins Employee)"""
+    return [contains_eager(LeaveRequest.employee)]
+
+def pending_leave_options():
+    """dashboard_admin.html: leave.employee"""
+    return [joinedload(LeaveRequest.employee)]
+
+def message_list_options():
+    """messages.html: message.sender, message.recipient"""
+    return [joinedload(InternalMessage.sender), joinedload(InternalMessage.recipient)]
+
+def billing_record_list_options():
+    """billing_management.html: record.employee"""
+    return [joinedload(BillingRecord.employee)]
+
+def training_assignment_list_options():
+    """training_assignments.html: assignment.employee, assignment.module (query joins both)"""
+    return [contains_eager(TrainingAssignment.employee), contains_eager(TrainingAssignment.module)]
+
+def employee_list_options():
+    """employees.html: emp.user"""
+    return [joinedload(Employee.user)]
+
+def journal_lookup_options():
+    """journal object lookups (journal_index.py): entry.employee, entry.project"""
+    return [joinedload(ProjectJournal.employee), joinedload(ProjectJournal.project)]
@@ -0,0 +1,51 @@
+import sys
+import os
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from attendance_app.app import app, db
+from attendance_app.models import Attendance
+from attendance_app.attendance_summary import month_ranges, rebuild_attendance_days
+
+# Rebuilds the daily attendance summary (attendance_day) from the raw
+# attendance rows, including absences for closed working days. The migration
+# that adds the table fills in history; run this daily (e.g. from cron
+# shortly after midnight UTC) to record the previous day's absences. With no
+# options it rebuilds yesterday and today; --all redoes the whole history.
+# Work is committed one month at a time.
+#
+#   python attendance_app/scripts/backfill_attendance_summary.py --all
+#   python attendance_app/scripts/backfill_attendance_summary.py --start 2024-01-01 --end 2024-12-31
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild the daily attendance summary')
+    parser.add_argument('--start', type=date.fromisoformat, help='first day to rebuild')
+    parser.add_argument('--end', type=date.fromisoformat, help='last day to rebuild (default: today)')
+    parser.add_argument('--all', action='store_true', help='rebuild from the first attendance row')
+    args = parser.parse_args()
+
+    today = datetime.utcnow().date()
+    with app.app_context():
+        end = args.end or today
+        if args.all:
+            start = db.session.query(db.func.min(Attendance.date)).scalar() or today
+        else:
+            start = args.start or today - timedelta(days=1)
+        db.session.remove()
+        if start > end:
+            parser.error('--start is after --end')
+
+        started = time.perf_counter()
+        total = 0
+        for first, last in month_ranges(start, end):
+            with db.engine.begin() as conn:
+                written = rebuild_attendance_days(conn, first, last, today=today)
+            total += written
+            print(f"{first} .. {last}: {written:>9,} rows")
+        print(f"Rebuilt {total:,} summary rows for {start} .. {end} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import sys
+import os
+import argparse
+import random
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from attendance_app.pdf_generator import generate_attendance_pdf, generate_work_report_pdf, generate_html_pdf
+
+# PDF renderer benchmark.
+#
+# Renders attendance and work report PDFs from synthetic rows shaped like the
+# exports.py row builders and prints rows/sec and pages/sec. Work report
+# descriptions vary in length so the column wrapping is exercised. --html-rows
+# also times the HTML template path (write_html) on a smaller row count for
+# comparison.
+#
+#   python attendance_app/scripts/benchmark_pdf.py --rows 10000
+
+HtmlRecord = namedtuple('HtmlRecord', 'date employee clock_in clock_out')
+HtmlEmployee = namedtuple('HtmlEmployee', 'name')
+
+WORDS = ['invoice', 'records', 'verified', 'batch', 'scanned', 'indexed', 'customer', 'ledger', 'audit', 'forms']
+
+def attendance_rows(count, rng):
+    start = date(2025, 1, 1)
+    rows = []
+    for i in range(count):
+        clock_in = datetime(2025, 1, 1, 8, rng.randrange(60))
+        rows.append([
+            (start + timedelta(days=i // 50)).isoformat(),
+            f'Employee {i % 50}',
+            f'Project {i % 7}',
+            clock_in.strftime('%H:%M:%S'),
+            (clock_in + timedelta(hours=8, minutes=rng.randrange(60))).strftime('%H:%M:%S'),
+        ])
+    return rows
+
+def work_report_rows(count, rng):
+    start = date(2025, 1, 1)
+    return [[
+        (start + timedelta(days=i // 50)).isoformat(),
+        f'Employee {i % 50}',
+        f'Project {i % 7}',
+        rng.randrange(1, 500),
+        ' '.join(rng.choice(WORDS) for _ in range(rng.randrange(3, 30))),
+    ] for i in range(count)]
+
+def _pages(pdf_bytes):
+    return pdf_bytes.count(b'/Type /Page\n') or pdf_bytes.count(b'/Type /Page')
+
+def measure(label, render, rows):
+    started = time.perf_counter()
+    pdf_bytes = render(rows)
+    elapsed = time.perf_counter() - started
+    pages = _pages(pdf_bytes)
+    print(f"{label:<22}{len(rows):>8}{pages:>8}{elapsed:>10.2f}{len(rows) / elapsed:>12.0f}{pages / elapsed:>12.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the PDF report renderer')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--html-rows', type=int, default=0, help='also time the HTML template path with this many rows')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'report':<22}{'rows':>8}{'pages':>8}{'seconds':>10}{'rows/sec':>12}{'pages/sec':>12}")
+    measure('attendance (table)', generate_attendance_pdf, attendance_rows(args.rows, rng))
+    measure('work reports (table)', generate_work_report_pdf, work_report_rows(args.rows, rng))
+
+    if args.html_rows:
+        records = [HtmlRecord(d, HtmlEmployee(name), clock_in, clock_out)
+                   for d, name, _, clock_in, clock_out in attendance_rows(args.html_rows, rng)]
+        measure('attendance (html)',
+                lambda data: generate_html_pdf('attendance_template.html', 'Attendance Report', data=data), records)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import sys
+import os
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Import-time budget check.
+#
+# Starts a fresh interpreter a few times, imports attendance_app.app (which
+# builds the app through create_app()) under -X importtime and reports the
+# median wall time of the whole process and of the import itself, plus the
+# modules that cost the most. The import is split into the app's own time
+# (attendance_app modules, create_app() included) and the third-party
+# packages they pull in (Flask, SQLAlchemy and the extensions), which are
+# the same for any version of the app and vary with the machine. It fails
+# when the median own time goes over --budget-ms or when a module that
+# should only load on first use (Pillow, fpdf and the PDF renderer) was
+# imported while the app started.
+#
+#   python attendance_app/scripts/check_import_time.py --runs 5 --budget-ms 250
+
+LAZY_MODULES = ['PIL', 'PIL.Image', 'fpdf', 'attendance_app.pdf_generator']
+
+CHILD = (
+    "import json, sys\n"
+    "import attendance_app.app\n"
+    f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+)
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+APP_PACKAGE = 'attendance_app'
+
+def own_time(lines, root='attendance_app.app'):
+    """Microseconds spent in app modules under root, leaving out the third-party packages they import
+
+    -X importtime prints a module after the modules it imported, one level deeper.
+    """
+    children = {}
+    pending = []
+    for depth, name, self_us in lines:
+        node = (name, self_us)
+        kids = []
+        while pending and pending[-1][0] > depth:
+            kids.append(pending.pop()[1])
+        children[node] = kids
+        pending.append((depth, node))
+
+    def walk(node):
+        name, self_us = node
+        if name != APP_PACKAGE and not name.startswith(APP_PACKAGE + '.'):
+            return 0
+        return self_us + sum(walk(child) for child in children[node])
+
+    return sum(walk(node) for node in children if node[0] == root)
+
+def run_once():
+    """(process seconds, {module: (self us, cumulative us)}, app's own us, eagerly loaded lazy modules)"""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        sys.exit(f"Importing the app failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    lines = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+            lines.append((len(match.group(3)), match.group(4), int(match.group(1))))
+    return elapsed, modules, own_time(lines), json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how long importing the app takes')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=250,
+                        help="fail above this median for the app's own share of the import")
+    parser.add_argument('--top', type=int, default=10, help='how many of the slowest modules to list')
+    args = parser.parse_args()
+
+    run_once()  # warm the bytecode cache and the OS file cache
+    processes, imports, owns, eager = [], [], [], set()
+    slowest = {}
+    for _ in range(args.runs):
+        elapsed, modules, own_us, loaded = run_once()
+        processes.append(elapsed * 1000)
+        imports.append(modules['attendance_app.app'][1] / 1000)
+        owns.append(own_us / 1000)
+        eager.update(loaded)
+        for name, (self_us, _) in modules.items():
+            slowest.setdefault(name, []).append(self_us / 1000)
+
+    process_ms = statistics.median(processes)
+    import_ms = statistics.median(imports)
+    own_ms = statistics.median(owns)
+    print(f"Process start to exit: {process_ms:.0f} ms (median of {args.runs})")
+    print(f"import attendance_app.app: {import_ms:.0f} ms")
+    print(f"  app modules and create_app(): {own_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"  third-party packages: {import_ms - own_ms:.0f} ms")
+    print("Slowest modules by self time:")
+    for name, times in sorted(slowest.items(), key=lambda item: -statistics.median(item[1]))[:args.top]:
+        print(f"  {statistics.median(times):8.1f} ms  {name}")
+
+    failed = False
+    if eager:
+        print(f"Loaded at startup but should be imported on first use: {', '.join(sorted(eager))}")
+        failed = True
+    if own_ms > args.budget_ms:
+        print(f"Import time is over budget by {own_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+if __name__ == '__main__':
+    main()
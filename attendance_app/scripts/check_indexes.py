@@ -0,0 +1,84 @@
+import sys
+import os
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from attendance_app.app import app, db
+from attendance_app.models import Attendance, WorkReport, LeaveRequest, InternalMessage, MessageRecipient, ProjectJournal, CompanyEvent, JournalObject
+
+# Runs EXPLAIN QUERY PLAN on the main query of each hot route and checks that
+# SQLite picks the composite index added for it. Run after migrate_db.py.
+
+def route_queries():
+    """(route, query, expected index) for the hot filter queries, built the same way the routes build them"""
+    today = date.today()
+    return [
+        ('dashboard / clock_in',
+         Attendance.query.filter_by(employee_id=1, date=today),
+         'uq_attendance_employee_date'),
+        ('work_reports',
+         WorkReport.query.filter_by(employee_id=1).order_by(WorkReport.date.desc()),
+         'ix_work_report_employee_date'),
+        ('admin_work_reports_view (project filter)',
+         WorkReport.query.filter(WorkReport.project_id == 1, WorkReport.date >= today, WorkReport.date <= today),
+         'ix_work_report_project_date'),
+        ('admin_work_reports_view (approval status filter)',
+         WorkReport.query.filter(WorkReport.approval_status == 'pending', WorkReport.date >= today),
+         'ix_work_report_approval_date'),
+        ('admin_leave_requests (status filter)',
+         LeaveRequest.query.filter(LeaveRequest.status == 'pending').order_by(LeaveRequest.created_at.desc(), LeaveRequest.id.desc()),
+         'ix_leave_request_status_created'),
+        ('unread_messages_count',
+         InternalMessage.query.filter_by(recipient_id=1, is_read=False),
+         'ix_internal_message_recipient_read'),
+        ('unread_messages_count (broadcasts)',
+         MessageRecipient.query.filter_by(user_id=1, is_read=False),
+         'ix_message_recipient_user_read'),
+        ('api_calendar_events (company events)',
+         CompanyEvent.query.filter(CompanyEvent.event_date >= today, CompanyEvent.event_date < today),
+         'ix_company_event_date'),
+        ('api_calendar_events (leave)',
+         LeaveRequest.query.filter(LeaveRequest.start_date < today, LeaveRequest.end_date >= today),
+         'ix_leave_request_dates'),
+        ('add_journal_entry (duplicate check)',
+         ProjectJournal.query.filter_by(employee_id=1, project_id=1, date=today),
+         'ix_project_journal_employee_project_date'),
+        ('api_journal_object_history',
+         JournalObject.query.filter_by(object_id='TASK-101').order_by(JournalObject.date.desc()),
+         'ix_journal_object_object_date'),
+        ('api_journal_project_objects (errors last week)',
+         JournalObject.query.filter(JournalObject.project_id == 1, JournalObject.status == 'error',
+                                    JournalObject.date >= today, JournalObject.date <= today),
+         'ix_journal_object_project_status_date'),
+    ]
+
+def _driver_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def query_plan(query):
+    compiled = query.statement.compile(dialect=db.engine.dialect)
+    params = tuple(_driver_value(compiled.params[name]) for name in compiled.positiontup)
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), params).fetchall()
+    return [row[-1] for row in rows]
+
+def check_indexes():
+    """Return a list of (route, expected index, plan) for every query that does not use its index"""
+    failures = []
+    for route, query, index_name in route_queries():
+        plan = query_plan(query)
+        if not any(f'INDEX {index_name}' in detail for detail in plan):
+            failures.append((route, index_name, plan))
+    return failures
+
+if __name__ == '__main__':
+    with app.app_context():
+        failures = check_indexes()
+    for route, index_name, plan in failures:
+        print(f"FAIL {route}: expected {index_name}, plan was: {'; '.join(plan)}")
+    if failures:
+        sys.exit(1)
+    print("All hot route queries use their indexes.")
@@ -1,10 +1,10 @@
 import sys
 import os
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from flask import Flask
-from models import db
+from attendance_app.models import db
 
 
 # Use instance_relative_config and robust config as in app.py
@@ -0,0 +1,129 @@
+import sys
+import os
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+from attendance_app.models import db, Employee, Attendance
+from attendance_app.db_profile import SQLITE_PROFILES, install_sqlite_profile
+from attendance_app.attendance_clock import clock_in_statement
+
+# Clock-in burst load test.
+#
+# Simulates the shift-start rush: several worker processes (like gunicorn -w N)
+# clock in their share of employees against one SQLite file while also running
+# the dashboard's "present today" read. Each profile from db_profile.py is run
+# against a fresh database and the write throughput, latency and "database is
+# locked" failures are printed side by side.
+#
+# --mode read-write replays the old select-then-insert clock-in, --mode upsert
+# the single INSERT ... ON CONFLICT statement the app uses now.
+#
+#   python attendance_app/scripts/load_test_clock_in.py --workers 4 --employees 2000 --mode upsert
+
+attendance = Attendance.__table__
+
+def _engine(path, profile):
+    engine = create_engine(f'sqlite:///{path}')
+    install_sqlite_profile(engine, SQLITE_PROFILES[profile])
+    return engine
+
+def _setup_database(path, profile, employees):
+    engine = _engine(path, profile)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(Employee.__table__.insert(), [
+            {'id': i, 'name': f'Employee {i}', 'email': f'employee{i}@example.com', 'user_id': i}
+            for i in range(1, employees + 1)
+        ])
+    engine.dispose()
+
+def _clock_in(conn, employee_id, today):
+    # Read-then-write the clock_in route used to perform
+    existing = conn.execute(
+        select(attendance.c.id).where(attendance.c.employee_id == employee_id, attendance.c.date == today)
+    ).first()
+    if existing is None:
+        conn.execute(attendance.insert().values(employee_id=employee_id, date=today, clock_in=datetime.utcnow()))
+
+def _clock_in_upsert(conn, employee_id, today):
+    conn.execute(clock_in_statement('sqlite', employee_id, today, datetime.utcnow()))
+
+CLOCK_IN_MODES = {
+    'read-write': _clock_in,
+    'upsert': _clock_in_upsert,
+}
+
+def _worker(path, profile, mode, employee_ids, results):
+    engine = _engine(path, profile)
+    today = datetime.utcnow().date()
+    latencies = []
+    errors = 0
+    for employee_id in employee_ids:
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                CLOCK_IN_MODES[mode](conn, employee_id, today)
+            with engine.connect() as conn:
+                conn.execute(select(func.count(func.distinct(attendance.c.employee_id))).where(attendance.c.date == today)).scalar()
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+    engine.dispose()
+    results.put((latencies, errors))
+
+def run_profile(profile, workers, employees, mode='read-write'):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'load_test.db')
+        _setup_database(path, profile, employees)
+
+        results = multiprocessing.Queue()
+        ids = list(range(1, employees + 1))
+        processes = [
+            multiprocessing.Process(target=_worker, args=(path, profile, mode, ids[i::workers], results))
+            for i in range(workers)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker_latencies, _ in collected for latency in worker_latencies)
+    errors = sum(worker_errors for _, worker_errors in collected)
+    return {
+        'profile': profile,
+        'clock_ins': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / elapsed if elapsed else 0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Clock-in burst load test for the SQLite profiles')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--profiles', nargs='+', default=list(SQLITE_PROFILES))
+    parser.add_argument('--mode', choices=list(CLOCK_IN_MODES), default='read-write')
+    args = parser.parse_args()
+
+    print(f"{args.employees} clock-ins across {args.workers} worker processes ({args.mode})")
+    print(f"{'profile':<12}{'ok':>8}{'locked':>8}{'per sec':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for profile in args.profiles:
+        result = run_profile(profile, args.workers, args.employees, args.mode)
+        print(f"{result['profile']:<12}{result['clock_ins']:>8}{result['errors']:>8}"
+              f"{result['throughput']:>10.1f}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from attendance_app.app import app
+from attendance_app.migrations import upgrade
+
+# Brings an existing database up to the current schema without dropping any data.
+with app.app_context():
+    applied = upgrade()
+    if applied:
+        print(f"Applied migrations: {', '.join(str(v) for v in applied)}")
+    else:
+        print("Database schema is up to date.")
@@ -0,0 +1,18 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from attendance_app.app import app
+from attendance_app.models import db
+
+# Recovers background export jobs after a deploy or a crash: jobs left running
+# longer than JOB_TIMEOUT_MINUTES are marked failed, and queued jobs are run
+# here to completion. Web processes also recover before the first export
+# they run, so this only saves waiting for that.
+with app.app_context():
+    runner = app.extensions['job_runner']
+    failed, resubmitted = runner.recover()
+    db.session.remove()
+runner.executor.shutdown(wait=True)
+print(f"Marked {failed} interrupted job(s) as failed, ran {resubmitted} queued job(s).")
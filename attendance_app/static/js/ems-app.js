@@ -79,15 +79,28 @@ function updateClock() {
 
 // Message system initialization
 function initializeMessages() {
-    // Check for unread messages
+    if (!document.getElementById('unread-count')) {
+        return;
+    }
+
+    // Pushed updates from the server, when the deployment can hold open streams
+    // (NOTIFICATION_STREAM); the browser reconnects the stream on its own
+    const streamMeta = document.querySelector('meta[name="notification-stream"]');
+    if (window.EventSource && streamMeta && streamMeta.content === 'on') {
+        const stream = new EventSource('/api/notifications/stream');
+        stream.addEventListener('unread-count', function(event) {
+            updateUnreadMessageBadge(JSON.parse(event.data).count);
+        });
+        return;
+    }
+
+    // Default: conditional polling, answered with 304 while nothing changed
     checkUnreadMessages();
-    
-    // Set up periodic check for new messages
     setInterval(checkUnreadMessages, 30000); // Check every 30 seconds
 }
 
 function checkUnreadMessages() {
-    fetch('/api/messages/unread-count')
+    fetch('/api/messages/unread-count', { cache: 'no-cache' })
         .then(response => response.json())
         .then(data => {
             updateUnreadMessageBadge(data.count);
@@ -100,12 +113,9 @@ function checkUnreadMessages() {
 function updateUnreadMessageBadge(count) {
     const badge = document.getElementById('unread-count');
     if (badge) {
-        if (count > 0) {
-            badge.textContent = count;
-            badge.style.display = 'inline';
-        } else {
-            badge.style.display = 'none';
-        }
+        // base.html renders the badge with d-none, which beats an inline display style
+        badge.textContent = count;
+        badge.classList.toggle('d-none', !(count > 0));
     }
     unreadMessageCount = count;
 }
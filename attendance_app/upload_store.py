@@ -0,0 +1,95 @@
+import hashlib
+import mimetypes
+import os
+import uuid
+from datetime import datetime
+from importlib import import_module
+from flask import abort, current_app, send_from_directory
+from sqlalchemy import delete, update
+from werkzeug.security import safe_join
+from attendance_app.models import db, UploadBlob
+
+# Content-addressed upload store.
+#
+# Uploaded files are named after a hash of their bytes, so the same picture
+# uploaded twice is stored once and a URL under /uploads/ always returns the
+# same content, which lets it be cached by browsers for a year as immutable.
+# upload_blob keeps a reference count per file: store_blob() adds one,
+# release_blob() takes one away, and only the release that brings it to zero
+# removes the file and anything derived from it. The counts are written on
+# their own connection, so rolling back the caller's transaction neither loses
+# nor repeats them; routes that fail after an upload release it themselves.
+#
+# Serving can be handed off to the front-end server: Flask's USE_X_SENDFILE
+# for X-Sendfile, or UPLOADS_ACCEL_REDIRECT set to an nginx internal location
+# (e.g. '/_uploads/') for X-Accel-Redirect.
+
+HASH_LENGTH = 32
+UPLOAD_MAX_AGE = 365 * 24 * 3600
+
+# Dialects with INSERT ... ON CONFLICT; only the one in use is ever imported
+_INSERTS = {
+    'sqlite': 'sqlalchemy.dialects.sqlite',
+    'postgresql': 'sqlalchemy.dialects.postgresql',
+}
+
+def _insert(dialect_name, table):
+    return import_module(_INSERTS[dialect_name]).insert(table)
+
+blob = UploadBlob.__table__
+
+def blob_name(data, ext):
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{digest}.{ext}" if ext else digest
+
+def add_reference_statement(dialect_name, filename, size):
+    stmt = _insert(dialect_name, blob).values(filename=filename, refcount=1, size=size, created_at=datetime.utcnow())
+    return stmt.on_conflict_do_update(index_elements=['filename'], set_={'refcount': blob.c.refcount + 1})
+
+def store_blob(folder, data, ext):
+    """Count a reference to data and write it unless already stored. Returns (filename, created)."""
+    filename = blob_name(data, ext)
+    with db.engine.begin() as conn:
+        conn.execute(add_reference_statement(conn.dialect.name, filename, len(data)))
+    path = os.path.join(folder, filename)
+    if os.path.exists(path):
+        return filename, False
+    os.makedirs(folder, exist_ok=True)
+    part = f"{path}.{uuid.uuid4().hex}.part"
+    with open(part, 'wb') as out:
+        out.write(data)
+    os.replace(part, path)
+    return filename, True
+
+def release_blob(folder, filename, derived=()):
+    """Drop one reference; remove the file and derived files when none are left. Returns True if removed."""
+    with db.engine.begin() as conn:
+        counted = conn.execute(
+            update(blob).where(blob.c.filename == filename).values(refcount=blob.c.refcount - 1)
+        ).rowcount
+        released = conn.execute(delete(blob).where(blob.c.filename == filename, blob.c.refcount <= 0)).rowcount
+    # A file with no row predates the store and nothing else counts on it
+    if counted and not released:
+        return False
+    removed = False
+    for name in (filename, *derived):
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            os.remove(path)
+            removed = True
+    return removed
+
+def send_upload(folder, filename):
+    """Response for an uploaded file with a far-future immutable Cache-Control"""
+    folder = os.path.abspath(folder)
+    accel = current_app.config.get('UPLOADS_ACCEL_REDIRECT')
+    if accel:
+        path = safe_join(folder, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel.rstrip('/') + '/' + filename
+    else:
+        response = send_from_directory(folder, filename, max_age=UPLOAD_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={UPLOAD_MAX_AGE}, immutable'
+    return response
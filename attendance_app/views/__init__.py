@@ -0,0 +1,11 @@
+# Route blueprints, one module per area of the app.
+#
+# Endpoints are named '<blueprint>.<view>' (e.g. url_for('attendance.clock_in')).
+# URLs are unchanged from when every route lived in app.py.
+
+def register_blueprints(app):
+    from attendance_app.views import (auth, main, uploads, admin, projects, training, calendar, messages,
+                                      work_reports, attendance, exports, leave, journal, billing)
+    for module in (auth, main, uploads, admin, projects, training, calendar, messages,
+                   work_reports, attendance, exports, leave, journal, billing):
+        app.register_blueprint(module.bp)
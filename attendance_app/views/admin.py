@@ -0,0 +1,215 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from flask_login import login_required
+from attendance_app.models import db, User, Employee, Company
+from attendance_app.forms import CompanyForm, EmployeeForm, EditEmployeeForm, AdminResetPasswordForm
+from attendance_app.decorators import admin_required
+from attendance_app import query_options
+from attendance_app.perf import perf_summary
+from attendance_app.query_counter import query_budget
+from attendance_app.views.uploads import handle_file_upload, delete_old_file
+
+logger = logging.getLogger(__name__)
+
+# Company settings, employee management and the route performance page.
+
+bp = Blueprint('admin', __name__)
+
+@bp.route('/company', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def company():
+    company = Company.query.first()
+    form = CompanyForm(obj=company)
+
+    if request.method == 'POST':
+        form = CompanyForm(request.form, obj=company)
+        try:
+            if form.validate_on_submit():
+                logo_filename = None
+                if 'logo' in request.files and request.files['logo'].filename != '':
+                    success, message, filename = handle_file_upload('logo')
+                    if success:
+                        logo_filename = filename
+                    else:
+                        flash(message, 'error')
+                        return render_template('company.html', company=form)
+
+                old_logo = company.logo if company and logo_filename else None
+                if company:
+                    form.populate_obj(company)
+                    if logo_filename:
+                        company.logo = logo_filename
+                    company.updated_at = datetime.utcnow()
+                else:
+                    company = Company(
+                        name=form.name.data,
+                        address=form.address.data,
+                        email=form.email.data,
+                        phone=form.phone.data,
+                        website=form.website.data,
+                        logo=logo_filename
+                    )
+                    db.session.add(company)
+
+                db.session.commit()
+                # The replaced logo is only released once the new one is saved
+                delete_old_file(old_logo)
+                flash("Company details updated successfully", 'success')
+                return redirect(url_for('admin.company'))
+
+            else:
+                flash("Please correct the errors below.", 'error')
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Company update error: {e}")
+            if 'logo_filename' in locals() and logo_filename:
+                delete_old_file(logo_filename)
+            flash(f"Error updating company details: {str(e)}", 'error')
+
+    return render_template('company.html', company=company, form=form)
+
+# Employee list with search/filter
+@bp.route('/employees')
+@login_required
+@admin_required
+@query_budget(8)
+def employees():
+    search_query = request.args.get('search', '').strip()
+    page = request.args.get('page', 1, type=int)
+    per_page = 20
+    query = Employee.query.options(*query_options.employee_list_options())
+    if search_query:
+        query = query.filter(
+            (Employee.name.ilike(f'%{search_query}%')) |
+            (Employee.email.ilike(f'%{search_query}%')) |
+            (Employee.user.has(User.username.ilike(f'%{search_query}%')))
+        )
+    pagination = query.order_by(Employee.name).paginate(page=page, per_page=per_page, error_out=False)
+    return render_template('employees.html', employees=pagination.items, pagination=pagination, search_query=search_query)
+
+@bp.route('/employee/edit/<int:employee_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_employee(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    user = employee.user
+    form = EditEmployeeForm(obj=employee)
+    if form.validate_on_submit():
+        employee.name = form.name.data
+        employee.email = form.email.data
+        employee.phone = form.phone.data
+        employee.department = form.department.data
+        employee.position = form.position.data
+        user.role = form.role.data
+        db.session.commit()
+        flash('Employee updated successfully', 'success')
+        return redirect(url_for('admin.employees'))
+    return render_template('edit_employee.html', form=form, employee=employee)
+
+# Delete employee
+@bp.route('/employee/delete/<int:employee_id>', methods=['POST'])
+@login_required
+@admin_required
+def delete_employee(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    user = employee.user
+    profile_picture = employee.profile_picture
+    db.session.delete(employee)
+    db.session.delete(user)
+    db.session.commit()
+    delete_old_file(profile_picture)
+    flash('Employee deleted successfully', 'success')
+    return redirect(url_for('admin.employees'))
+
+# Admin reset password for user
+@bp.route('/employee/reset_password/<int:user_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def reset_password(user_id):
+    user = User.query.get_or_404(user_id)
+    form = AdminResetPasswordForm()
+    if form.validate_on_submit():
+        user.set_password(form.password.data)
+        db.session.commit()
+        flash('Password reset successfully', 'success')
+        return redirect(url_for('admin.employees'))
+    return render_template('reset_password.html', form=form, user=user)
+
+@bp.route('/employee/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_employee():
+    form = EmployeeForm()
+    
+    if form.validate_on_submit():
+        try:
+            # Check if username already exists
+            if User.query.filter_by(username=form.username.data).first():
+                flash("Username already exists", 'error')
+                return render_template('add_employee.html', form=form)
+            
+            # Check if email already exists
+            if Employee.query.filter_by(email=form.email.data).first():
+                flash("Email already exists", 'error')
+                return render_template('add_employee.html', form=form)
+            
+            # Handle profile picture upload
+            profile_picture = None
+            if form.profile_picture.data:
+                success, message, filename = handle_file_upload('profile_picture')
+                if success:
+                    profile_picture = filename
+                else:
+                    flash(message, 'error')
+                    return render_template('add_employee.html', form=form)
+            
+            # Create user account
+            user = User(username=form.username.data, role=form.role.data)
+            user.set_password(form.password.data)
+            db.session.add(user)
+            db.session.flush()  # Get the user ID
+            
+            # Create employee record
+            employee = Employee(
+                name=form.name.data,
+                email=form.email.data,
+                phone=form.phone.data,
+                department=form.department.data,
+                position=form.position.data,
+                hire_date=form.hire_date.data or datetime.utcnow().date(),
+                profile_picture=profile_picture,
+                user_id=user.id,
+                skills=form.skills.data,
+                qualifications=form.qualifications.data,
+                professional_development=form.professional_development.data
+            )
+            
+            db.session.add(employee)
+            db.session.commit()
+            flash("Employee added successfully", 'success')
+            return redirect(url_for('admin.employees'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Add employee error: {e}")
+            if 'profile_picture' in locals() and profile_picture:
+                delete_old_file(profile_picture)
+            flash(f"Error adding employee: {str(e)}", 'error')
+    
+    return render_template('add_employee.html', form=form)
+
+@bp.route('/admin/perf', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def admin_perf():
+    stats = current_app.extensions.get('perf_stats')
+    if request.method == 'POST':
+        if stats:
+            stats.reset()
+        flash("Performance samples cleared", 'success')
+        return redirect(url_for('admin.admin_perf'))
+    return render_template('admin/perf.html', routes=perf_summary(current_app), enabled=stats is not None,
+                           samples=stats.samples if stats else 0)
@@ -0,0 +1,173 @@
+import logging
+from datetime import MAXYEAR, MINYEAR, datetime
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, Project, Attendance
+from attendance_app.decorators import employee_required, employee_api_required
+from attendance_app import attendance_clock, query_options
+from attendance_app.attendance_summary import attendance_totals, period_bounds
+from attendance_app.exports import csv_response, attendance_export_rows, ATTENDANCE_EXPORT_HEADER, apply_attendance_filters
+from attendance_app.pagination import keyset_paginate, get_page_size
+from attendance_app.query_counter import query_budget
+
+logger = logging.getLogger(__name__)
+
+# Clock in / clock out (form and JSON API), the attendance list and CSV, and
+# the monthly/yearly summary read from attendance_day.
+
+bp = Blueprint('attendance', __name__)
+
+@bp.route('/attendance/clock_in', methods=['POST'])
+@login_required
+@employee_required
+def clock_in():
+    try:
+        project_id = request.form.get('project_id')
+        result = attendance_clock.clock_in(current_user.employee_id, int(project_id) if project_id else None)
+        flash(attendance_clock.MESSAGES[result], 'success' if result == attendance_clock.CLOCKED_IN else 'warning')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Clock in error: {e}")
+        flash(f"Error clocking in: {str(e)}", 'error')
+    
+    return redirect(url_for('main.dashboard'))
+
+@bp.route('/attendance/clock_out', methods=['POST'])
+@login_required
+@employee_required
+def clock_out():
+    try:
+        break_duration = int(request.form.get('break_duration', 0) or 0)
+        notes = request.form.get('notes', '').strip()
+        result = attendance_clock.clock_out(current_user.employee_id, break_duration, notes)
+        flash(attendance_clock.MESSAGES[result], 'success' if result == attendance_clock.CLOCKED_OUT else 'warning')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Clock out error: {e}")
+        flash(f"Error clocking out: {str(e)}", 'error')
+    
+    return redirect(url_for('main.dashboard'))
+
+@bp.route('/api/attendance/clock-in', methods=['POST'])
+@login_required
+@employee_api_required
+def api_clock_in():
+    data = request.get_json(silent=True) or {}
+    try:
+        project_id = int(data['project_id']) if data.get('project_id') else None
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': "Invalid project"}), 400
+    try:
+        result = attendance_clock.clock_in(current_user.employee_id, project_id)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Clock in error: {e}")
+        return jsonify({'success': False, 'message': "Error clocking in"}), 500
+    return jsonify({'success': result == attendance_clock.CLOCKED_IN, 'status': result,
+                    'message': attendance_clock.MESSAGES[result]})
+
+@bp.route('/api/attendance/clock-out', methods=['POST'])
+@login_required
+@employee_api_required
+def api_clock_out():
+    data = request.get_json(silent=True) or {}
+    try:
+        break_duration = int(data.get('break_duration') or 0)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': "Invalid break duration"}), 400
+    notes = (data.get('notes') or '').strip()
+    try:
+        result = attendance_clock.clock_out(current_user.employee_id, break_duration, notes)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Clock out error: {e}")
+        return jsonify({'success': False, 'message': "Error clocking out"}), 500
+    return jsonify({'success': result == attendance_clock.CLOCKED_OUT, 'status': result,
+                    'message': attendance_clock.MESSAGES[result]})
+
+@bp.route('/api/attendance/today')
+@login_required
+@employee_api_required
+def api_attendance_today():
+    return jsonify(attendance_clock.today_status(current_user.employee_id))
+
+@bp.route('/attendance')
+@login_required
+@query_budget(8)
+def view_attendance():
+    start_date_str = request.args.get('start_date')
+    end_date_str = request.args.get('end_date')
+    employee_id_str = request.args.get('employee_id')
+    project_id_str = request.args.get('project_id')
+
+    query = db.session.query(Attendance).join(Employee).outerjoin(Project) \
+        .options(*query_options.attendance_list_options())
+    query = apply_attendance_filters(query, request.args)
+
+    page = keyset_paginate(query, (Attendance.date, Attendance.id),
+                           cursor=request.args.get('cursor'), per_page=get_page_size())
+    
+    employees = Employee.query.order_by(Employee.name).all()
+    projects = Project.query.order_by(Project.name).all()
+    
+    return render_template('attendance.html',
+                         attendances=page.items,
+                         page=page,
+                         employees=employees,
+                         projects=projects,
+                         filters={
+                             'start_date': start_date_str,
+                             'end_date': end_date_str,
+                             'employee_id': employee_id_str,
+                             'project_id': project_id_str
+                         })
+
+@bp.route('/attendance/export/csv')
+@login_required
+def export_attendance_csv():
+    filters = request.args.to_dict()
+    if current_user.role != 'admin':
+        # Employees only export their own attendance
+        if current_user.employee_id is None:
+            flash("Employee profile not found", 'error')
+            return redirect(url_for('main.dashboard'))
+        filters['employee_id'] = str(current_user.employee_id)
+    query = apply_attendance_filters(Attendance.query, filters)
+    query = query.order_by(Attendance.date.desc(), Attendance.id.desc())
+    return csv_response('attendance.csv', ATTENDANCE_EXPORT_HEADER, attendance_export_rows(query))
+
+@bp.route('/attendance/summary')
+@login_required
+@query_budget(6)
+def attendance_summary():
+    today = datetime.utcnow().date()
+    year = request.args.get('year', type=int) or today.year
+    if not MINYEAR <= year < MAXYEAR:
+        year = today.year
+    month = request.args.get('month', type=int)
+    if month is not None and not 1 <= month <= 12:
+        month = None
+
+    if current_user.role == 'admin':
+        employee_id = request.args.get('employee_id', type=int)
+        employees = Employee.query.order_by(Employee.name).all()
+    else:
+        if current_user.employee_id is None:
+            flash("Employee profile not found", 'error')
+            return redirect(url_for('main.dashboard'))
+        employee_id = current_user.employee_id
+        employees = [current_user.employee]
+
+    # One employee over a year is broken down by month; otherwise one row per employee
+    by_month = employee_id is not None and month is None
+    start, end = period_bounds(year, month)
+    rows = attendance_totals(start, end, employee_id, by_month)
+    names = {employee.id: employee.name for employee in employees}
+    if not by_month:
+        rows = sorted(rows, key=lambda row: names.get(row['employee_id'], ''))
+    totals = {key: sum(row[key] or 0 for row in rows)
+              for key in ('present_days', 'late_days', 'absent_days', 'worked_minutes', 'break_minutes')}
+
+    return render_template('attendance_summary.html', rows=rows, totals=totals, names=names, by_month=by_month,
+                           employees=employees, years=range(today.year, today.year - 5, -1),
+                           filters={'year': year, 'month': month, 'employee_id': employee_id})
@@ -0,0 +1,80 @@
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required, login_user, logout_user
+from attendance_app.models import db, User, Employee
+from attendance_app.forms import LoginForm, SignupForm, ChangePasswordForm
+
+# Sign-in, sign-up and password changes.
+
+bp = Blueprint('auth', __name__)
+
+@bp.route('/signup', methods=['GET', 'POST'])
+def signup():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    form = SignupForm()
+    if form.validate_on_submit():
+        existing_user = User.query.filter_by(username=form.username.data).first()
+        if existing_user:
+            flash('Username already exists. Please choose another.', 'error')
+        else:
+            user = User(username=form.username.data, role=form.role.data, is_active=True)
+            user.set_password(form.password.data)
+            db.session.add(user)
+            db.session.commit()
+            # Optionally create Employee profile if role is employee
+            if form.role.data == 'employee':
+                employee = Employee(user_id=user.id, name=form.username.data)
+                db.session.add(employee)
+                db.session.commit()
+            flash('Account created successfully! Please log in.', 'success')
+            return redirect(url_for('auth.login'))
+    return render_template('signup.html', form=form)
+
+@bp.route('/')
+def index():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    return render_template('index.html')
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if current_user.is_authenticated:
+        return redirect(url_for('main.dashboard'))
+    
+    form = LoginForm()
+    if form.validate_on_submit():
+        user = User.query.filter_by(username=form.username.data, is_active=True).first()
+        if user and user.check_password(form.password.data):
+            if user.password_needs_rehash():
+                user.set_password(form.password.data)
+                db.session.commit()
+            login_user(user)
+            next_page = request.args.get('next')
+            flash('Login successful!', 'success')
+            return redirect(next_page or url_for('main.dashboard'))
+        else:
+            flash('Invalid username or password.', 'error')
+            
+    return render_template('login.html', form=form)
+
+@bp.route('/logout')
+def logout():
+    logout_user()
+    flash('You have been logged out', 'info')
+    return redirect(url_for('auth.login'))
+
+# User change own password
+@bp.route('/change_password', methods=['GET', 'POST'])
+@login_required
+def change_password():
+    form = ChangePasswordForm()
+    user = User.query.get(current_user.id)
+    if form.validate_on_submit():
+        if not user.check_password(form.current_password.data):
+            flash('Current password is incorrect.', 'error')
+        else:
+            user.set_password(form.new_password.data)
+            db.session.commit()
+            flash('Password changed successfully.', 'success')
+            return redirect(url_for('main.profile'))
+    return render_template('change_password.html', form=form)
@@ -0,0 +1,129 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, BillingRecord, InternalMessage
+from attendance_app.forms import BillingCalculatorForm, ManualBillingRecordForm
+from attendance_app.decorators import admin_required, employee_required
+from attendance_app import query_options
+from attendance_app.billing_engine import calculate_period_billing
+from attendance_app.exports import csv_response, billing_export_rows, BILLING_EXPORT_HEADER
+from attendance_app.query_counter import query_budget
+
+logger = logging.getLogger(__name__)
+
+# Billing calculation, finalised billing records and manual entries.
+
+bp = Blueprint('billing', __name__)
+
+@bp.route('/my_billing')
+@login_required
+@employee_required
+def my_billing():
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if not employee:
+        flash("Employee profile not found", 'error')
+        return redirect(url_for('main.dashboard'))
+    
+    billing_records = BillingRecord.query.filter_by(employee_id=employee.id).order_by(BillingRecord.period_start.desc()).all()
+    return render_template('my_billing.html', billing_records=billing_records)
+
+@bp.route('/billing/calculate', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def calculate_billing():
+    form = BillingCalculatorForm()
+    if form.validate_on_submit():
+        start_date = form.start_date.data
+        end_date = form.end_date.data
+        
+        results = calculate_period_billing(start_date, end_date)
+            
+        return render_template('billing/calculate_results.html', results=results, start_date=start_date, end_date=end_date)
+        
+    return render_template('billing/calculate.html', form=form)
+
+@bp.route('/billing/finalize', methods=['POST'])
+@login_required
+@admin_required
+def finalize_billing():
+    start_date_str = request.form.get('start_date')
+    end_date_str = request.form.get('end_date')
+    
+    start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+    end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+    
+    results = calculate_period_billing(start_date, end_date)
+    
+    for result in results:
+        employee = result['employee']
+        total_earnings = result['total_earnings']
+            
+        if total_earnings > 0:
+            billing_record = BillingRecord(
+                employee_id=employee.id,
+                period_start=start_date,
+                period_end=end_date,
+                total_amount=total_earnings,
+                status='finalized',
+                finalized_at=datetime.utcnow()
+            )
+            db.session.add(billing_record)
+            
+            message = InternalMessage(
+                sender_id=current_user.id,
+                recipient_id=employee.user_id,
+                subject='Billing Finalized',
+                content=f'Your billing for the period {start_date_str} to {end_date_str} has been finalized. Your total earnings are ${total_earnings:.2f}.'
+            )
+            db.session.add(message)
+            
+    db.session.commit()
+    
+    flash('Billing finalized and employees notified.', 'success')
+    return redirect(url_for('billing.billing_management'))
+
+@bp.route('/billing')
+@login_required
+@admin_required
+@query_budget(6)
+def billing_management():
+    billing_records = BillingRecord.query.options(*query_options.billing_record_list_options()) \
+        .order_by(BillingRecord.created_at.desc()).all()
+    return render_template('billing_management.html', billing_records=billing_records)
+
+@bp.route('/billing/export/csv')
+@login_required
+@admin_required
+def export_billing_records():
+    query = BillingRecord.query.order_by(BillingRecord.period_start.desc(), BillingRecord.id.desc())
+    return csv_response('billing_records.csv', BILLING_EXPORT_HEADER, billing_export_rows(query))
+
+@bp.route('/billing/manual', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def manual_billing():
+    form = ManualBillingRecordForm()
+    form.employee_id.choices = [(e.id, e.name) for e in Employee.query.all()]
+    
+    if form.validate_on_submit():
+        try:
+            billing_record = BillingRecord(
+                employee_id=form.employee_id.data,
+                period_start=form.period_start.data,
+                period_end=form.period_end.data,
+                total_amount=form.total_amount.data,
+                notes=form.notes.data,
+                status='finalized',
+                finalized_at=datetime.utcnow()
+            )
+            db.session.add(billing_record)
+            db.session.commit()
+            flash('Manual billing record created successfully.', 'success')
+            return redirect(url_for('billing.billing_management'))
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Manual billing error: {e}")
+            flash(f"Error creating manual billing record: {str(e)}", 'error')
+            
+    return render_template('billing/manual.html', form=form)
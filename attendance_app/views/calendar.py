@@ -0,0 +1,66 @@
+import logging
+from flask import Blueprint, Response, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, CompanyEvent
+from attendance_app.forms import CalendarEventForm
+from attendance_app.decorators import admin_required
+from attendance_app import calendar_feed
+
+logger = logging.getLogger(__name__)
+
+# Company calendar page and its event feed.
+
+bp = Blueprint('calendar', __name__)
+
+@bp.route('/calendar')
+@login_required
+def calendar():
+    # Events are fetched per visible range from /api/calendar/events
+    return render_template('calendar.html')
+
+@bp.route('/api/calendar/events')
+@login_required
+def api_calendar_events():
+    start, end = calendar_feed.parse_range(request.args)
+    etag, last_modified = calendar_feed.calendar_validators(start, end)
+    if request.if_none_match.contains(etag) or (
+            not request.if_none_match and last_modified and request.if_modified_since
+            and last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)):
+        response = Response(status=304)
+    else:
+        response = jsonify(calendar_feed.calendar_events(start, end))
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@bp.route('/calendar/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_calendar_event():
+    form = CalendarEventForm()
+    
+    if form.validate_on_submit():
+        try:
+            event = CompanyEvent(
+                title=form.title.data,
+                description=form.description.data,
+                event_date=form.event_date.data,
+                event_time=form.event_time.data if not form.is_all_day.data else None,
+                event_type=form.event_type.data,
+                is_all_day=form.is_all_day.data,
+                created_by=current_user.id
+            )
+            
+            db.session.add(event)
+            db.session.commit()
+            flash("Event added successfully", 'success')
+            return redirect(url_for('calendar.calendar'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Add calendar event error: {e}")
+            flash(f"Error adding event: {str(e)}", 'error')
+    
+    return render_template('add_calendar_event.html', form=form)
@@ -0,0 +1,79 @@
+import logging
+import os
+from flask import Blueprint, abort, current_app, flash, jsonify, redirect, render_template, request, send_file, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, ExportJob
+from attendance_app.jobs import EXPORT_JOBS, create_export_job, export_params, artifact_path
+
+logger = logging.getLogger(__name__)
+
+# Background exports: queueing, status polling and download.
+
+bp = Blueprint('exports', __name__)
+
+@bp.route('/exports')
+@login_required
+def export_jobs():
+    jobs = ExportJob.query.filter_by(user_id=current_user.id) \
+        .order_by(ExportJob.created_at.desc()).limit(20).all()
+    return render_template('export_jobs.html', jobs=jobs)
+
+@bp.route('/exports/<kind>', methods=['POST'])
+@login_required
+def create_export(kind):
+    spec = EXPORT_JOBS.get(kind)
+    if spec is None:
+        abort(404)
+    if spec['admin_only'] and current_user.role != 'admin':
+        flash("Admin access required", 'error')
+        return redirect(url_for('main.dashboard'))
+
+    try:
+        params = export_params(request.form)
+    except ValueError:
+        flash("Invalid export filters", 'error')
+        return redirect(request.referrer or url_for('main.dashboard'))
+    if current_user.role != 'admin':
+        # Employees can only export their own rows, whatever the form says
+        if current_user.employee_id is None:
+            flash("Employee profile not found", 'error')
+            return redirect(url_for('main.dashboard'))
+        params['employee_id'] = str(current_user.employee_id)
+
+    try:
+        create_export_job(kind, current_user.id, params)
+        flash("Export started. It will be ready to download below shortly.", 'info')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Create export error: {e}")
+        flash(f"Error starting export: {str(e)}", 'error')
+    return redirect(url_for('exports.export_jobs'))
+
+def _get_own_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.user_id != current_user.id:
+        abort(404)
+    return job
+
+@bp.route('/api/exports/<job_id>')
+@login_required
+def export_job_status(job_id):
+    job = _get_own_export_job(job_id)
+    return jsonify({
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'download_url': url_for('exports.download_export', job_id=job.id) if job.status == 'done' else None,
+    })
+
+@bp.route('/exports/<job_id>/download')
+@login_required
+def download_export(job_id):
+    job = _get_own_export_job(job_id)
+    path = artifact_path(current_app, job)
+    if job.status != 'done' or not os.path.exists(path):
+        flash("This export is not available", 'warning')
+        return redirect(url_for('exports.export_jobs'))
+    return send_file(path, as_attachment=True, download_name=job.filename)
@@ -0,0 +1,180 @@
+import logging
+from datetime import datetime, timedelta
+from flask import Blueprint, abort, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, Project, ProjectJournal
+from attendance_app.forms import ProjectJournalForm
+from attendance_app.pagination import keyset_paginate, get_page_size
+from attendance_app.journal_index import journal_objects, normalize_status, object_history, project_objects
+from attendance_app.journal_ingest import MAX_BULK_ENTRIES, ingest_journal_entries, journal_entry_json
+
+logger = logging.getLogger(__name__)
+
+# Project journal entries, the bulk JSON API (journal_ingest.py) and lookups
+# by object id over the journal object index (journal_index.py). Admins see
+# and write every entry, employees their own.
+
+bp = Blueprint('journal', __name__)
+
+@bp.route('/project_journal')
+@login_required
+def project_journal():
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if not employee:
+        flash("Employee profile not found", 'error')
+        return redirect(url_for('main.dashboard'))
+    
+    # Get journal entries for current employee
+    logger.info("Accessing ProjectJournal model")
+    page = keyset_paginate(ProjectJournal.query.filter_by(employee_id=employee.id),
+                           (ProjectJournal.date, ProjectJournal.id),
+                           cursor=request.args.get('cursor'), per_page=get_page_size())
+    projects = Project.query.filter_by(status='active').all()
+    
+    return render_template('project_journal.html', journal_entries=page.items, page=page, projects=projects)
+
+@bp.route('/project_journal/add', methods=['GET', 'POST'])
+@login_required
+def add_journal_entry():
+    form = ProjectJournalForm()
+    
+    # Populate project choices
+    projects = Project.query.filter_by(status='active').all()
+    form.project_id.choices = [(p.id, p.name) for p in projects]
+    
+    if form.validate_on_submit():
+        try:
+            employee = Employee.query.filter_by(user_id=current_user.id).first()
+            if not employee:
+                flash("Employee profile not found", 'error')
+                return redirect(url_for('main.dashboard'))
+            
+            # Check for duplicate entry (same date + project)
+            existing = ProjectJournal.query.filter_by(
+                employee_id=employee.id,
+                project_id=form.project_id.data,
+                date=form.date.data
+            ).first()
+            
+            if existing:
+                flash("Journal entry for this project and date already exists", 'error')
+                return render_template('add_journal_entry.html', form=form)
+            
+            journal_entry = ProjectJournal(
+                employee_id=employee.id,
+                project_id=form.project_id.data,
+                date=form.date.data,
+                object_ids=form.object_ids.data,
+                task_type=form.task_type.data,
+                hours_spent=form.hours_spent.data,
+                status=form.status.data,
+                comments=form.comments.data
+            )
+            journal_entry.objects = journal_objects(journal_entry)
+            
+            db.session.add(journal_entry)
+            db.session.commit()
+            
+            # Send error alert if status is error (disabled, function not defined)
+            # if form.status.data == 'error':
+            #     logger.info("About to call send_error_alert")
+            #     send_error_alert(journal_entry)
+            
+            flash("Journal entry added successfully", 'success')
+            return redirect(url_for('journal.project_journal'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Add journal entry error: {e}")
+            flash(f"Error adding journal entry: {str(e)}", 'error')
+    
+    return render_template('add_journal_entry.html', form=form)
+
+def _lookup_scope():
+    """The employee id lookups are limited to, None for admins"""
+    if current_user.role == 'admin':
+        return None
+    if current_user.employee_id is None:
+        abort(403)
+    return current_user.employee_id
+
+def _journal_entry_json(entry, status):
+    return {
+        'id': entry.id, 'date': entry.date.isoformat(), 'status': status,
+        'project_id': entry.project_id, 'project': entry.project.name if entry.project else None,
+        'employee_id': entry.employee_id, 'employee': entry.employee.name if entry.employee else None,
+        'task_type': entry.task_type, 'hours_spent': entry.hours_spent, 'comments': entry.comments,
+    }
+
+@bp.route('/api/journal/objects/<path:object_id>')
+@login_required
+def api_journal_object_history(object_id):
+    entries = object_history(object_id.strip(), _lookup_scope())
+    return jsonify({'object_id': object_id.strip(),
+                    'entries': [_journal_entry_json(entry, status) for entry, status in entries]})
+
+@bp.route('/api/journal/projects/<int:project_id>/objects')
+@login_required
+def api_journal_project_objects(project_id):
+    # Defaults to errors over the last 7 days: ?status=error&start=YYYY-MM-DD&end=YYYY-MM-DD
+    try:
+        end = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if request.args.get('end') \
+            else datetime.utcnow().date()
+        start = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if request.args.get('start') \
+            else end - timedelta(days=6)
+    except ValueError:
+        abort(400, description='Dates must be YYYY-MM-DD')
+    status = normalize_status(request.args.get('status', 'error'))
+    rows = project_objects(project_id, start, end, status, _lookup_scope())
+    return jsonify({
+        'project_id': project_id, 'status': status, 'start': start.isoformat(), 'end': end.isoformat(),
+        'objects': [dict(_journal_entry_json(entry, status), object_id=object_id) for object_id, entry in rows],
+    })
+
+@bp.route('/api/journal-entries')
+@login_required
+def api_journal_entries():
+    employee_id = _lookup_scope()
+    query = ProjectJournal.query
+    if employee_id is None:
+        employee_id = request.args.get('employee_id', type=int)
+    if employee_id is not None:
+        query = query.filter(ProjectJournal.employee_id == employee_id)
+    if request.args.get('project_id', type=int) is not None:
+        query = query.filter(ProjectJournal.project_id == request.args.get('project_id', type=int))
+    if request.args.get('date'):
+        try:
+            query = query.filter(ProjectJournal.date == datetime.strptime(request.args['date'], '%Y-%m-%d').date())
+        except ValueError:
+            abort(400, description='Dates must be YYYY-MM-DD')
+    entries = query.order_by(ProjectJournal.date.desc(), ProjectJournal.id.desc()).limit(MAX_BULK_ENTRIES).all()
+    return jsonify([journal_entry_json(entry) for entry in entries])
+
+@bp.route('/api/journal-entries', methods=['POST'])
+@login_required
+def api_add_journal_entries():
+    # One entry object, a list of them, or {"entries": [...]}
+    data = request.get_json(silent=True)
+    if isinstance(data, dict) and 'entries' in data:
+        data = data['entries']
+    items = data if isinstance(data, list) else [data]
+    if data is None or not items:
+        return jsonify({'success': False, 'message': "Expected a JSON entry or list of entries"}), 400
+    if len(items) > MAX_BULK_ENTRIES:
+        return jsonify({'success': False, 'message': f"At most {MAX_BULK_ENTRIES} entries per request"}), 413
+
+    try:
+        created, errors = ingest_journal_entries(items, _lookup_scope())
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Bulk journal ingest error: {e}")
+        return jsonify({'success': False, 'message': "Error adding journal entries"}), 500
+    body = {
+        'success': not errors, 'created': len(created), 'failed': len(errors),
+        'entries': [{'index': i, 'id': journal_id} for i, journal_id in created],
+        'errors': errors,
+    }
+    if not created:
+        return jsonify(body), 400
+    return jsonify(body), 201 if not errors else 200
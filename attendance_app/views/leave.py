@@ -0,0 +1,109 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, LeaveRequest
+from attendance_app.forms import LeaveRequestForm
+from attendance_app.decorators import admin_required, employee_required
+from attendance_app import query_options
+from attendance_app.pagination import keyset_paginate, get_page_size
+from attendance_app.query_counter import query_budget
+
+logger = logging.getLogger(__name__)
+
+# Leave requests and their approval.
+
+bp = Blueprint('leave', __name__)
+
+@bp.route('/leave_requests', methods=['GET', 'POST'])
+@login_required
+@employee_required
+def leave_requests():
+    form = LeaveRequestForm()
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    
+    if not employee:
+        flash("Employee profile not found", 'error')
+        return redirect(url_for('main.dashboard'))
+    
+    if form.validate_on_submit():
+        try:
+            if form.start_date.data > form.end_date.data:
+                flash("Start date cannot be after end date", 'error')
+                return render_template('leave_requests.html', form=form, leave_requests=employee.leave_requests)
+            
+            leave_request = LeaveRequest(
+                employee_id=employee.id,
+                start_date=form.start_date.data,
+                end_date=form.end_date.data,
+                leave_type=form.leave_type.data,
+                reason=form.reason.data
+            )
+            
+            db.session.add(leave_request)
+            db.session.commit()
+            flash("Leave request submitted successfully", 'success')
+            return redirect(url_for('leave.leave_requests'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Leave request error: {e}")
+            flash(f"Error submitting leave request: {str(e)}", 'error')
+    
+    # Get current employee's leave requests
+    leave_requests = LeaveRequest.query.filter_by(employee_id=employee.id).order_by(LeaveRequest.created_at.desc()).all()
+    
+    return render_template('leave_requests.html', form=form, leave_requests=leave_requests)
+
+@bp.route('/admin/leave_requests')
+@login_required
+@admin_required
+@query_budget(6)
+def admin_leave_requests():
+    status_filter = request.args.get('status', 'all')
+    query = LeaveRequest.query.join(Employee).options(*query_options.leave_request_list_options())
+
+    if status_filter != 'all':
+        query = query.filter(LeaveRequest.status == status_filter)
+
+    page = keyset_paginate(query, (LeaveRequest.created_at, LeaveRequest.id),
+                           cursor=request.args.get('cursor'), per_page=get_page_size())
+    
+    return render_template('admin_leave_requests.html',
+                         leave_requests=page.items,
+                         page=page,
+                         status_filter=status_filter)
+
+@bp.route('/admin/leave_requests/<int:request_id>/approve')
+@login_required
+@admin_required
+def approve_leave_request(request_id):
+    try:
+        leave_request = LeaveRequest.query.get_or_404(request_id)
+        leave_request.status = 'approved'
+        leave_request.approved_by = current_user.id
+        leave_request.approved_at = datetime.utcnow()
+        db.session.commit()
+        flash(f"Leave request for {leave_request.employee.name} approved", 'success')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Approve leave error: {e}")
+        flash("Error approving leave request", 'error')
+    return redirect(url_for('leave.admin_leave_requests'))
+
+@bp.route('/admin/leave_requests/<int:request_id>/deny')
+@login_required
+@admin_required
+def deny_leave_request(request_id):
+    try:
+        leave_request = LeaveRequest.query.get_or_404(request_id)
+        leave_request.status = 'denied'
+        leave_request.approved_by = current_user.id
+        leave_request.approved_at = datetime.utcnow()
+        db.session.commit()
+        flash(f"Leave request for {leave_request.employee.name} denied", 'success')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Deny leave error: {e}")
+        flash("Error denying leave request", 'error')
+    return redirect(url_for('leave.admin_leave_requests'))
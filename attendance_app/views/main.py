@@ -0,0 +1,99 @@
+import logging
+from datetime import datetime
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, Attendance, LeaveRequest, WorkReport
+from attendance_app.dashboard_cache import get_admin_dashboard_metrics
+from attendance_app.views.uploads import handle_file_upload, delete_old_file
+
+logger = logging.getLogger(__name__)
+
+# Dashboard and the signed-in user's own profile.
+
+bp = Blueprint('main', __name__)
+
+@bp.route('/dashboard')
+@login_required
+def dashboard():
+    if current_user.is_authenticated:
+        today = datetime.utcnow().date()
+    
+        if current_user.role == 'admin':
+            metrics = get_admin_dashboard_metrics()
+            return render_template('dashboard_admin.html', 
+                                 present=metrics['present'], 
+                                 absent=metrics['absent'],
+                                 total_employees=metrics['total_employees'],
+                                 recent_leaves=metrics['recent_leaves'],
+                                 active_projects=metrics['active_projects'])
+        else:
+            employee = current_user.employee
+            if not employee:
+                flash('Employee profile not found', 'error')
+                return redirect(url_for('auth.logout'))
+            
+            today_attendance = Attendance.query.filter_by(
+                employee_id=employee.id, 
+                date=today
+            ).first()
+        
+            recent_reports = WorkReport.query.filter_by(
+                employee_id=employee.id
+            ).order_by(WorkReport.date.desc()).limit(5).all()
+        
+            pending_leaves = LeaveRequest.query.filter_by(
+                employee_id=employee.id,
+            status='pending'
+        ).count()
+        
+            return render_template('dashboard_employee.html',
+                                 today_attendance=today_attendance,
+                                 recent_reports=recent_reports,
+                                 pending_leaves=pending_leaves)
+    else:
+        return redirect(url_for('auth.login'))
+
+@bp.route('/profile', methods=['GET', 'POST'])
+@login_required
+def profile():
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    
+    if request.method == 'POST':
+        new_picture = None
+        try:
+            if employee:
+                employee.name = request.form.get('name', '').strip()
+                employee.email = request.form.get('email', '').strip()
+                employee.phone = request.form.get('phone', '').strip()
+                employee.department = request.form.get('department', '').strip()
+                employee.position = request.form.get('position', '').strip()
+                employee.skills = request.form.get('skills', '').strip()
+                employee.qualifications = request.form.get('qualifications', '').strip()
+                employee.professional_development = request.form.get('professional_development', '').strip()
+                
+                # Handle profile picture upload
+                if 'profile_picture' in request.files and request.files['profile_picture'].filename != '':
+                    success, message, filename = handle_file_upload('profile_picture')
+                    if success:
+                        new_picture = filename
+                    else:
+                        flash(message, 'error')
+                        return render_template('profile.html', employee=employee)
+
+                old_picture = employee.profile_picture if new_picture else None
+                if new_picture:
+                    employee.profile_picture = new_picture
+                db.session.commit()
+                # The replaced picture is only released once the new one is saved
+                delete_old_file(old_picture)
+                flash("Profile updated successfully", 'success')
+            else:
+                flash("Employee profile not found", 'error')
+                
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Profile update error: {e}")
+            delete_old_file(new_picture)
+            flash(f"Error updating profile: {str(e)}", 'error')
+    
+    return render_template('profile.html', employee=employee)
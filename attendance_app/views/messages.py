@@ -0,0 +1,112 @@
+import logging
+from flask import Blueprint, Response, current_app, flash, jsonify, redirect, render_template, request, stream_with_context, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, User, Employee, InternalMessage
+from attendance_app.forms import MessageForm
+from attendance_app import messaging, query_options
+from attendance_app.notifications import notification_hub, notification_stream
+from attendance_app.pagination import keyset_paginate, get_page_size
+from attendance_app.query_counter import query_budget
+
+logger = logging.getLogger(__name__)
+
+# Internal messages, the unread count and the notification stream.
+
+bp = Blueprint('messages', __name__)
+
+@bp.route('/messages')
+@login_required
+@query_budget(8)
+def messages():
+    per_page = get_page_size()
+    sent_page = keyset_paginate(
+        InternalMessage.query.options(*query_options.message_list_options()).filter_by(sender_id=current_user.id),
+        (InternalMessage.sent_at, InternalMessage.id),
+        cursor=request.args.get('sent_cursor'), per_page=per_page)
+    received_page = keyset_paginate(
+        InternalMessage.query.options(*query_options.message_list_options()).filter(messaging.received_messages_filter(current_user.id)),
+        (InternalMessage.sent_at, InternalMessage.id),
+        cursor=request.args.get('received_cursor'), per_page=per_page)
+    return render_template('messages.html',
+                         sent_messages=sent_page.items,
+                         received_messages=received_page.items,
+                         broadcast_read=messaging.broadcast_read_states(current_user.id, received_page.items),
+                         sent_page=sent_page,
+                         received_page=received_page)
+
+@bp.route('/message/<int:message_id>')
+@login_required
+def view_message(message_id):
+    message = InternalMessage.query.get_or_404(message_id)
+    if message.sender_id != current_user.id and not messaging.is_recipient(message, current_user.id):
+        flash("You don't have permission to view this message.", "error")
+        return redirect(url_for('messages.messages'))
+    
+    if messaging.mark_read(message, current_user.id):
+        db.session.commit()
+        
+    return render_template('view_message.html', message=message)
+
+@bp.route('/messages/send', methods=['GET', 'POST'])
+@login_required
+def send_message():
+    form = MessageForm()
+    
+    # Populate recipient choices
+    if current_user.role == 'admin':
+        employees = Employee.query.all()
+        form.recipient_id.choices = [(0, 'Select Recipient')] + [(e.user_id, e.name) for e in employees]
+    else:
+        # Employees can only send to admin
+        admin_users = User.query.filter_by(role='admin').all()
+        form.recipient_id.choices = [(u.id, f'Admin ({u.username})') for u in admin_users]
+    
+    if form.validate_on_submit():
+        try:
+            if form.is_broadcast.data and current_user.role == 'admin':
+                # Send to all employees: one message, one state row per recipient
+                messaging.send_broadcast(current_user.id, form.subject.data, form.content.data)
+            else:
+                # Send to specific recipient
+                message = InternalMessage(
+                    sender_id=current_user.id,
+                    recipient_id=form.recipient_id.data,
+                    subject=form.subject.data,
+                    content=form.content.data
+                )
+                db.session.add(message)
+            
+            db.session.commit()
+            flash("Message sent successfully", 'success')
+            return redirect(url_for('messages.messages'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Send message error: {e}")
+            flash(f"Error sending message: {str(e)}", 'error')
+    
+    return render_template('send_message.html', form=form)
+
+@bp.route('/api/messages/unread-count')
+@login_required
+def unread_messages_count():
+    # Conditional polling fallback for clients without the event stream
+    etag = notification_hub.etag(current_user.id)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify({'count': messaging.unread_count(current_user.id)})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@bp.route('/api/notifications/stream')
+@login_required
+def notifications_stream():
+    if not current_app.config['NOTIFICATION_STREAM']:
+        # 204 tells EventSource not to reconnect; the page polls unread-count instead
+        return Response(status=204)
+    response = Response(stream_with_context(notification_stream(current_user.id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,188 @@
+import logging
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import login_required
+from attendance_app.models import db, Project, ReportTemplate, ReportField
+from attendance_app.forms import ProjectForm
+from attendance_app.decorators import admin_required
+
+logger = logging.getLogger(__name__)
+
+# Projects and the report templates attached to them.
+
+bp = Blueprint('projects', __name__)
+
+@bp.route('/projects')
+@login_required
+@admin_required
+def projects():
+    search_query = request.args.get('search', '')
+    if search_query:
+        all_projects = Project.query.filter(Project.name.ilike(f'%{search_query}%')).all()
+    else:
+        all_projects = Project.query.all()
+    return render_template('projects.html', projects=all_projects)
+
+@bp.route('/project/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_project():
+    form = ProjectForm()
+    
+    if form.validate_on_submit():
+        try:
+            project = Project(
+                name=form.name.data,
+                description=form.description.data,
+                start_date=form.start_date.data,
+                end_date=form.end_date.data,
+                status=form.status.data,
+                billing_type=form.billing_type.data
+            )
+
+            if form.billing_type.data == 'hourly':
+                project.hourly_rate = form.hourly_rate.data
+            else:
+                project.metric_label = form.metric_label.data
+                project.metric_divisor = form.metric_divisor.data
+                project.metric_multiplier = form.metric_multiplier.data
+            
+            db.session.add(project)
+            db.session.commit()
+            flash("Project added successfully", 'success')
+            return redirect(url_for('projects.projects'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Add project error: {e}")
+            flash(f"Error adding project: {str(e)}", 'error')
+            
+    return render_template('add_project.html', form=form)
+
+@bp.route('/project/edit/<int:project_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_project(project_id):
+    project = Project.query.get_or_404(project_id)
+    form = ProjectForm(obj=project)
+
+    if form.validate_on_submit():
+        try:
+            project.name = form.name.data
+            project.description = form.description.data
+            project.start_date = form.start_date.data
+            project.end_date = form.end_date.data
+            project.status = form.status.data
+            project.billing_type = form.billing_type.data
+
+            if form.billing_type.data == 'hourly':
+                project.hourly_rate = form.hourly_rate.data
+                project.metric_label = None
+                project.metric_divisor = None
+                project.metric_multiplier = None
+            else:
+                project.hourly_rate = None
+                project.metric_label = form.metric_label.data
+                project.metric_divisor = form.metric_divisor.data
+                project.metric_multiplier = form.metric_multiplier.data
+            
+            db.session.commit()
+            flash("Project updated successfully", 'success')
+            return redirect(url_for('projects.projects'))
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Edit project error: {e}")
+            flash(f"Error updating project: {str(e)}", 'error')
+
+    return render_template('edit_project.html', form=form, project=project)
+
+@bp.route('/project/delete/<int:project_id>')
+@login_required
+@admin_required
+def delete_project(project_id):
+    try:
+        project = Project.query.get_or_404(project_id)
+        db.session.delete(project)
+        db.session.commit()
+        flash("Project deleted successfully", 'success')
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Delete project error: {e}")
+        flash(f"Error deleting project: {str(e)}", 'error')
+        
+    return redirect(url_for('projects.projects'))
+
+@bp.route('/report_templates')
+@login_required
+@admin_required
+def report_templates():
+    templates = ReportTemplate.query.all()
+    return render_template('report_templates.html', templates=templates)
+
+@bp.route('/report_template/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_report_template():
+    if request.method == 'POST':
+        try:
+            template = ReportTemplate(
+                name=request.form.get('name'),
+                description=request.form.get('description')
+            )
+            db.session.add(template)
+            db.session.commit()
+            flash('Report template created successfully.', 'success')
+            return redirect(url_for('projects.edit_report_template', template_id=template.id))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Error creating template: {e}', 'error')
+    return render_template('edit_report_template.html', template=None)
+
+@bp.route('/report_template/edit/<int:template_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_report_template(template_id):
+    template = ReportTemplate.query.get_or_404(template_id)
+    if request.method == 'POST':
+        try:
+            template.name = request.form.get('name')
+            template.description = request.form.get('description')
+            
+            # Clear existing fields
+            for field in template.fields:
+                db.session.delete(field)
+
+            # Add new fields
+            labels = request.form.getlist('field_label[]')
+            types = request.form.getlist('field_type[]')
+            requireds = request.form.getlist('field_required[]')
+            
+            for i in range(len(labels)):
+                if labels[i]:
+                    field = ReportField(
+                        template_id=template.id,
+                        label=labels[i],
+                        field_type=types[i],
+                        is_required='required' in requireds[i].lower()
+                    )
+                    db.session.add(field)
+            
+            db.session.commit()
+            flash('Report template updated successfully.', 'success')
+            return redirect(url_for('projects.report_templates'))
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Error updating template: {e}', 'error')
+            
+    return render_template('edit_report_template.html', template=template)
+
+@bp.route('/api/projects')
+@login_required
+def api_projects():
+    projects = Project.query.filter_by(status='active').all()
+    projects_data = [{
+        'id': p.id,
+        'name': p.name,
+        'billing_type': p.billing_type,
+        'metric_label': p.metric_label
+    } for p in projects]
+    return jsonify(projects_data)
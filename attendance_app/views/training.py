@@ -0,0 +1,91 @@
+from flask import Blueprint, flash, redirect, render_template, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, TrainingModule, TrainingAssignment
+from attendance_app.forms import TrainingModuleForm
+from attendance_app.decorators import admin_required, employee_required
+from attendance_app import query_options
+from attendance_app.query_counter import query_budget
+
+# Training modules and their assignments.
+
+bp = Blueprint('training', __name__)
+
+@bp.route('/training_modules')
+@login_required
+def training_modules():
+    if current_user.role == 'admin':
+        modules = TrainingModule.query.order_by(TrainingModule.created_at.desc()).all()
+    else:
+        # Employees: show only active modules for their audience
+        employee = Employee.query.filter_by(user_id=current_user.id).first()
+        # For now, show all active modules (can filter by audience if needed)
+        modules = TrainingModule.query.filter_by(is_active=True).order_by(TrainingModule.created_at.desc()).all()
+    return render_template('training_modules.html', modules=modules)
+
+# --- Admin: Add Training Module ---
+@bp.route('/training_modules/add', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def add_training_module():
+    form = TrainingModuleForm()
+    if form.validate_on_submit():
+        module = TrainingModule(
+            title=form.title.data,
+            content=form.description.data,
+            target_audience=form.category.data,
+            is_active=True,
+            created_by=current_user.id
+        )
+        db.session.add(module)
+        db.session.commit()
+        flash('Training module added.', 'success')
+        return redirect(url_for('training.training_modules'))
+    return render_template('add_training_module.html', form=form)
+
+# --- Admin: Edit Training Module ---
+@bp.route('/training_modules/edit/<int:module_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def edit_training_module(module_id):
+    module = TrainingModule.query.get_or_404(module_id)
+    form = TrainingModuleForm(obj=module)
+    if form.validate_on_submit():
+        module.title = form.title.data
+        module.content = form.description.data
+        module.target_audience = form.category.data
+        db.session.commit()
+        flash('Training module updated.', 'success')
+        return redirect(url_for('training.training_modules'))
+    return render_template('edit_training_module.html', form=form, module=module)
+
+# --- Admin: Delete Training Module ---
+@bp.route('/training_modules/delete/<int:module_id>', methods=['POST'])
+@login_required
+@admin_required
+def delete_training_module(module_id):
+    module = TrainingModule.query.get_or_404(module_id)
+    db.session.delete(module)
+    db.session.commit()
+    flash('Training module deleted.', 'success')
+    return redirect(url_for('training.training_modules'))
+
+@bp.route('/training_assignments')
+@login_required
+@admin_required
+@query_budget(6)
+def training_assignments():
+    assignments = TrainingAssignment.query.join(Employee).join(TrainingModule) \
+        .options(*query_options.training_assignment_list_options()).all()
+    return render_template('training_assignments.html', assignments=assignments)
+
+@bp.route('/my_training')
+@login_required
+@employee_required
+def my_training():
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if not employee:
+        flash("Employee profile not found", 'error')
+        return redirect(url_for('main.dashboard'))
+    
+    training_assignments = TrainingAssignment.query.filter_by(employee_id=employee.id).join(TrainingModule).all()
+    return render_template('my_training.html', training_assignments=training_assignments)
@@ -0,0 +1,70 @@
+import logging
+from flask import Blueprint, current_app, request
+from werkzeug.utils import secure_filename
+from attendance_app.images import save_image, delete_image
+from attendance_app.upload_store import send_upload
+
+logger = logging.getLogger(__name__)
+
+# Uploaded files: the /uploads/ route and the helpers the forms use to
+# store and release profile pictures and logos (see images.py).
+
+ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+bp = Blueprint('uploads', __name__)
+
+def allowed_file(filename):
+    """Check if file extension is allowed"""
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+def upload_extension(original_filename):
+    """Extension kept on the stored file; the name itself comes from the content hash"""
+    if not original_filename or '.' not in original_filename:
+        return None
+    return original_filename.rsplit('.', 1)[1].lower()
+
+def handle_file_upload(file_key='file'):
+    """Complete file upload handler. Renditions are made in the background (see images.py)."""
+    try:
+        if file_key not in request.files:
+            return False, 'No file selected', None
+        
+        file = request.files[file_key]
+        
+        if file.filename == '':
+            return False, 'No file selected', None
+        
+        if not allowed_file(file.filename):
+            return False, f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}', None
+        
+        ext = upload_extension(secure_filename(file.filename))
+        
+        if not ext:
+            return False, 'Invalid filename', None
+        
+        try:
+            filename = save_image(file, current_app.config['UPLOAD_FOLDER'], ext)
+        except ValueError as e:
+            logger.error(f"Image validation failed: {e}")
+            return False, 'Invalid image file', None
+        
+        return True, 'File uploaded successfully', filename
+        
+    except Exception as e:
+        logger.error(f"File upload error: {e}")
+        return False, f'Upload failed: {str(e)}', None
+
+def delete_old_file(filename):
+    """Release an upload; the file and its renditions go when nothing else uses them"""
+    if filename:
+        try:
+            return delete_image(current_app.config['UPLOAD_FOLDER'], filename)
+        except Exception as e:
+            logger.error(f"File deletion error: {e}")
+            return False
+    return False
+
+@bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    return send_upload(current_app.config['UPLOAD_FOLDER'], filename)
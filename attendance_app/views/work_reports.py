@@ -0,0 +1,210 @@
+import logging
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user, login_required
+from attendance_app.models import db, Employee, Project, WorkReport
+from attendance_app.forms import WorkReportForm
+from attendance_app.decorators import admin_required, admin_api_required, employee_required
+from attendance_app import query_options
+from attendance_app.exports import csv_response, work_report_export_rows, WORK_REPORT_EXPORT_HEADER, apply_work_report_filters
+from attendance_app.pagination import keyset_paginate, get_page_size
+from attendance_app.query_counter import query_budget
+from attendance_app.work_report_review import MAX_REVIEW_BATCH, review_work_reports
+
+logger = logging.getLogger(__name__)
+
+# Work reports: employees manage their own, admins see, edit and approve or
+# reject everyone's (one report or a batch, see work_report_review.py).
+
+bp = Blueprint('work_reports', __name__)
+
+# Employee view and edit their own work reports
+@bp.route('/work_reports')
+@login_required
+@employee_required
+@query_budget(6)
+def work_reports():
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if not employee:
+        flash("Employee profile not found", 'error')
+        return redirect(url_for('main.dashboard'))
+    reports = WorkReport.query.filter_by(employee_id=employee.id).join(Project) \
+        .options(*query_options.employee_work_report_options()).order_by(WorkReport.date.desc()).all()
+    return render_template('work_reports.html', work_reports=reports)
+
+@bp.route('/work_reports/add', methods=['GET', 'POST'])
+@login_required
+@employee_required
+def add_work_report():
+    form = WorkReportForm()
+    
+    # Populate project choices
+    projects = Project.query.filter_by(status='active').all()
+    form.project_id.choices = [(p.id, p.name) for p in projects]
+    
+    if form.validate_on_submit():
+        try:
+            employee = Employee.query.filter_by(user_id=current_user.id).first()
+            if not employee:
+                flash("Employee profile not found", 'error')
+                return redirect(url_for('main.dashboard'))
+            
+            work_report = WorkReport(
+                employee_id=employee.id,
+                project_id=form.project_id.data,
+                date=form.date.data,
+                description=form.description.data,
+                quantity=form.quantity.data
+            )
+            
+            db.session.add(work_report)
+            db.session.commit()
+            flash("Work report submitted successfully", 'success')
+            return redirect(url_for('work_reports.work_reports'))
+            
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Add work report error: {e}")
+            flash(f"Error submitting work report: {str(e)}", 'error')
+    
+    return render_template('add_work_report.html', form=form, projects=projects)
+
+@bp.route('/work_report/edit/<int:report_id>', methods=['GET', 'POST'])
+@login_required
+@employee_required
+def edit_work_report(report_id):
+    report = WorkReport.query.get_or_404(report_id)
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if report.employee_id != employee.id:
+        flash('You do not have permission to edit this report.', 'error')
+        return redirect(url_for('work_reports.work_reports'))
+    form = WorkReportForm(obj=report)
+    # Populate project choices
+    form.project_id.choices = [(p.id, p.name) for p in Project.query.all()]
+    if form.validate_on_submit():
+        report.project_id = form.project_id.data
+        report.date = form.date.data
+        report.description = form.description.data
+        report.quantity = form.quantity.data
+        # A changed report goes back to the review queue
+        report.approval_status = 'pending'
+        report.reviewed_by = None
+        report.reviewed_at = None
+        db.session.commit()
+        flash('Work report updated successfully.', 'success')
+        return redirect(url_for('work_reports.work_reports'))
+    return render_template('edit_work_report.html', form=form, report=report)
+
+@bp.route('/work_report/delete/<int:report_id>', methods=['POST'])
+@login_required
+@employee_required
+def delete_work_report(report_id):
+    report = WorkReport.query.get_or_404(report_id)
+    employee = Employee.query.filter_by(user_id=current_user.id).first()
+    if report.employee_id != employee.id:
+        flash('You do not have permission to delete this report.', 'error')
+        return redirect(url_for('work_reports.work_reports'))
+    db.session.delete(report)
+    db.session.commit()
+    flash('Work report deleted successfully.', 'success')
+    return redirect(url_for('work_reports.work_reports'))
+
+@bp.route('/admin/work_reports')
+@login_required
+@admin_required
+@query_budget(8)
+def admin_work_reports_view():
+    query = WorkReport.query.join(Employee).join(Project).options(*query_options.work_report_list_options())
+    query = apply_work_report_filters(query, request.args)
+    
+    page = keyset_paginate(query, (WorkReport.date, WorkReport.id),
+                           cursor=request.args.get('cursor'), per_page=get_page_size())
+    employees = Employee.query.all()
+    projects = Project.query.all()
+    
+    return render_template('admin_work_reports.html', 
+                         work_reports=page.items,
+                         page=page,
+                         employees=employees,
+                         projects=projects)
+
+@bp.route('/admin/work_report/edit/<int:report_id>', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def admin_edit_work_report(report_id):
+    report = WorkReport.query.get_or_404(report_id)
+    form = WorkReportForm(obj=report)
+    form.project_id.choices = [(p.id, p.name) for p in Project.query.all()]
+    if form.validate_on_submit():
+        report.project_id = form.project_id.data
+        report.date = form.date.data
+        report.description = form.description.data
+        report.quantity = form.quantity.data
+        db.session.commit()
+        flash('Work report updated successfully.', 'success')
+    return redirect(url_for('work_reports.admin_work_reports_view'))
+    return render_template('edit_work_report.html', form=form, report=report, admin=True)
+
+@bp.route('/admin/work_report/delete/<int:report_id>', methods=['POST'])
+@login_required
+@admin_required
+def admin_delete_work_report(report_id):
+    report = WorkReport.query.get_or_404(report_id)
+    db.session.delete(report)
+    db.session.commit()
+    flash('Work report deleted successfully.', 'success')
+    return redirect(url_for('work_reports.admin_work_reports_view'))
+
+@bp.route('/admin/work_reports/export/csv')
+@login_required
+@admin_required
+def export_work_reports_csv():
+    query = apply_work_report_filters(WorkReport.query, request.args)
+    query = query.order_by(WorkReport.date.desc(), WorkReport.id.desc())
+    return csv_response('work_reports.csv', WORK_REPORT_EXPORT_HEADER, work_report_export_rows(query))
+
+def _review(report_ids, action):
+    try:
+        summary = review_work_reports(report_ids, action, current_user.id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Work report review error: {e}")
+        return jsonify({'success': False, 'message': "Error reviewing work reports"}), 500
+    return jsonify(dict(summary, success=True))
+
+def _bulk_review(action):
+    data = request.get_json(silent=True) or {}
+    report_ids = data.get('report_ids')
+    if not isinstance(report_ids, list) or not report_ids:
+        return jsonify({'success': False, 'message': "report_ids must be a non-empty list"}), 400
+    try:
+        report_ids = [int(report_id) for report_id in report_ids]
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': "report_ids must be ids"}), 400
+    if len(report_ids) > MAX_REVIEW_BATCH:
+        return jsonify({'success': False, 'message': f"At most {MAX_REVIEW_BATCH} reports per request"}), 413
+    return _review(report_ids, action)
+
+@bp.route('/api/work-reports/bulk-approve', methods=['POST'])
+@login_required
+@admin_api_required
+def api_bulk_approve_work_reports():
+    return _bulk_review('approve')
+
+@bp.route('/api/work-reports/bulk-reject', methods=['POST'])
+@login_required
+@admin_api_required
+def api_bulk_reject_work_reports():
+    return _bulk_review('reject')
+
+@bp.route('/api/work-reports/<int:report_id>/approve', methods=['POST'])
+@login_required
+@admin_api_required
+def api_approve_work_report(report_id):
+    return _review([report_id], 'approve')
+
+@bp.route('/api/work-reports/<int:report_id>/reject', methods=['POST'])
+@login_required
+@admin_api_required
+def api_reject_work_report(report_id):
+    return _review([report_id], 'reject')
@@ -0,0 +1,47 @@
+import json
+from datetime import datetime
+from sqlalchemy import select, update
+from attendance_app.models import db, WorkReport, WorkReportReview
+
+# Work report approval.
+#
+# Reviewing a week of reports for a team means approving or rejecting
+# hundreds at a time, so a review is one set-based UPDATE ... WHERE id IN
+# (...) over the ids the admin picked rather than a load and save per report.
+# Reports already in the requested state are left alone (their reviewer and
+# time stay as they were). Every batch writes one work_report_review row with
+# the ids it changed, which is the audit trail. Where the database supports
+# UPDATE ... RETURNING (SQLite 3.35+, PostgreSQL) the changed ids come back
+# from the update itself; elsewhere they are selected first.
+
+REVIEW_ACTIONS = {'approve': 'approved', 'reject': 'rejected'}
+MAX_REVIEW_BATCH = 5000
+
+def review_work_reports(report_ids, action, reviewer_id):
+    """Set the approval status of these reports. Returns a summary; the caller commits."""
+    status = REVIEW_ACTIONS[action]
+    requested = sorted(set(report_ids))
+    pending = (WorkReport.id.in_(requested), WorkReport.approval_status != status)
+    statement = update(WorkReport).where(*pending) \
+        .values(approval_status=status, reviewed_by=reviewer_id, reviewed_at=datetime.utcnow()) \
+        .execution_options(synchronize_session=False)
+
+    if db.engine.dialect.update_returning:
+        changed = db.session.execute(statement.returning(WorkReport.id)).scalars().all()
+    else:
+        changed = db.session.execute(select(WorkReport.id).where(*pending)).scalars().all()
+        if changed:
+            db.session.execute(statement.where(WorkReport.id.in_(changed)))
+
+    review = WorkReportReview(action=status, reviewer_id=reviewer_id, report_ids=json.dumps(sorted(changed)),
+                              requested=len(requested), updated=len(changed))
+    db.session.add(review)
+    db.session.flush()
+    return {
+        'status': status,
+        'requested': len(requested),
+        'updated': len(changed),
+        # Already in this state, or no such report
+        'unchanged': len(requested) - len(changed),
+        'review_id': review.id,
+    }